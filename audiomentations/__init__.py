@@ -1,55 +1,142 @@
-from .augmentations.add_background_noise import AddBackgroundNoise
-from .augmentations.add_gaussian_noise import AddGaussianNoise
-from .augmentations.add_gaussian_snr import AddGaussianSNR
-from .augmentations.add_short_noises import AddShortNoises
-from .augmentations.air_absorption import AirAbsorption
-from .augmentations.apply_impulse_response import ApplyImpulseResponse
-from .augmentations.apply_mp3_codec import ApplyMP3Codec
-from .augmentations.apply_ulaw_codec import ApplyULawCodec
-from .augmentations.apply_vorbis_codec import ApplyVorbisCodec
-from .augmentations.band_limit_with_two_phase_resample import BandLimitWithTwoPhaseResample
-from .augmentations.band_pass_filter import BandPassFilter
-from .augmentations.band_stop_filter import BandStopFilter
-from .augmentations.clip import Clip
-from .augmentations.clipping_distortion import ClippingDistortion
-from .augmentations.compressor import Compressor
-from .augmentations.destroy_levels import DestroyLevels
-from .augmentations.gain import Gain
-from .augmentations.gain_transition import GainTransition
-from .augmentations.high_pass_filter import HighPassFilter
-from .augmentations.high_shelf_filter import HighShelfFilter
-from .augmentations.lambda_transform import Lambda
-from .augmentations.limiter import Limiter
-from .augmentations.loudness_normalization import LoudnessNormalization
-from .augmentations.low_pass_filter import LowPassFilter
-from .augmentations.low_shelf_filter import LowShelfFilter
-from .augmentations.mp3_compression import Mp3Compression
-from .augmentations.noise_gate import NoiseGate
-from .augmentations.normalize import Normalize
-from .augmentations.overdrive import Overdrive
-from .augmentations.padding import Padding
-from .augmentations.peaking_filter import PeakingFilter
-from .augmentations.phaser import Phaser
-from .augmentations.pitch_shift import PitchShift
-from .augmentations.polarity_inversion import PolarityInversion
-from .augmentations.resample import Resample
-from .augmentations.reverse import Reverse
-from .augmentations.room_simulator import RoomSimulator
-from .augmentations.seven_band_parametric_eq import SevenBandParametricEQ
-from .augmentations.shift import Shift
-from .augmentations.simple_compressor import SimpleCompressor
-from .augmentations.short_delay import ShortDelay
-from .augmentations.simple_expansor import SimpleExpansor
-from .augmentations.tanh_distortion import TanhDistortion
-from .augmentations.time_mask import TimeMask
-from .augmentations.time_stretch import TimeStretch
-from .augmentations.tremolo import Tremolo
-from .augmentations.trim import Trim
-from .augmentations.add_dc_component import AddDCComponent
-from .augmentations.add_phase_randomization import AddRandomizedPhaseShiftNoise
-from .augmentations.two_pole_all_pass_filter import TwoPoleAllPassFilter
-from .core.composition import Compose, SpecCompose, OneOf, SomeOf
-from .spec_augmentations.spec_channel_shuffle import SpecChannelShuffle
-from .spec_augmentations.spec_frequency_mask import SpecFrequencyMask
+"""
+The transforms are imported lazily, i.e. the module that defines a transform only gets
+imported the first time the transform is accessed. This keeps `import audiomentations`
+fast and avoids pulling in heavy dependencies like torch, librosa and pyroomacoustics
+when they are not needed.
+"""
+import importlib
+from typing import TYPE_CHECKING
 
 __version__ = "0.27.0"
+
+# Maps the name of each public class to the (relative) module that defines it
+_LAZY_IMPORTS = {
+    "AddBackgroundNoise": ".augmentations.add_background_noise",
+    "AddGaussianNoise": ".augmentations.add_gaussian_noise",
+    "AddGaussianSNR": ".augmentations.add_gaussian_snr",
+    "AddShortNoises": ".augmentations.add_short_noises",
+    "AirAbsorption": ".augmentations.air_absorption",
+    "ApplyImpulseResponse": ".augmentations.apply_impulse_response",
+    "ApplyMP3Codec": ".augmentations.apply_mp3_codec",
+    "ApplyULawCodec": ".augmentations.apply_ulaw_codec",
+    "ApplyVorbisCodec": ".augmentations.apply_vorbis_codec",
+    "BandLimitWithTwoPhaseResample": ".augmentations.band_limit_with_two_phase_resample",
+    "BandPassFilter": ".augmentations.band_pass_filter",
+    "BandStopFilter": ".augmentations.band_stop_filter",
+    "Clip": ".augmentations.clip",
+    "ClippingDistortion": ".augmentations.clipping_distortion",
+    "Compressor": ".augmentations.compressor",
+    "DestroyLevels": ".augmentations.destroy_levels",
+    "Gain": ".augmentations.gain",
+    "GainTransition": ".augmentations.gain_transition",
+    "HighPassFilter": ".augmentations.high_pass_filter",
+    "HighShelfFilter": ".augmentations.high_shelf_filter",
+    "Lambda": ".augmentations.lambda_transform",
+    "Limiter": ".augmentations.limiter",
+    "LoudnessNormalization": ".augmentations.loudness_normalization",
+    "LowPassFilter": ".augmentations.low_pass_filter",
+    "LowShelfFilter": ".augmentations.low_shelf_filter",
+    "Mp3Compression": ".augmentations.mp3_compression",
+    "NoiseGate": ".augmentations.noise_gate",
+    "Normalize": ".augmentations.normalize",
+    "Overdrive": ".augmentations.overdrive",
+    "Padding": ".augmentations.padding",
+    "PeakingFilter": ".augmentations.peaking_filter",
+    "Phaser": ".augmentations.phaser",
+    "PitchShift": ".augmentations.pitch_shift",
+    "PolarityInversion": ".augmentations.polarity_inversion",
+    "Resample": ".augmentations.resample",
+    "Reverse": ".augmentations.reverse",
+    "RoomSimulator": ".augmentations.room_simulator",
+    "SevenBandParametricEQ": ".augmentations.seven_band_parametric_eq",
+    "Shift": ".augmentations.shift",
+    "SimpleCompressor": ".augmentations.simple_compressor",
+    "ShortDelay": ".augmentations.short_delay",
+    "SimpleExpansor": ".augmentations.simple_expansor",
+    "TanhDistortion": ".augmentations.tanh_distortion",
+    "TimeMask": ".augmentations.time_mask",
+    "TimeStretch": ".augmentations.time_stretch",
+    "Tremolo": ".augmentations.tremolo",
+    "Trim": ".augmentations.trim",
+    "AddDCComponent": ".augmentations.add_dc_component",
+    "AddRandomizedPhaseShiftNoise": ".augmentations.add_phase_randomization",
+    "TwoPoleAllPassFilter": ".augmentations.two_pole_all_pass_filter",
+    "Compose": ".core.composition",
+    "SpecCompose": ".core.composition",
+    "OneOf": ".core.composition",
+    "SomeOf": ".core.composition",
+    "SpecChannelShuffle": ".spec_augmentations.spec_channel_shuffle",
+    "SpecFrequencyMask": ".spec_augmentations.spec_frequency_mask",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        # Cache the class in the package namespace, so __getattr__ is not called again
+        globals()[name] = value
+        return value
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .augmentations.add_background_noise import AddBackgroundNoise
+    from .augmentations.add_gaussian_noise import AddGaussianNoise
+    from .augmentations.add_gaussian_snr import AddGaussianSNR
+    from .augmentations.add_short_noises import AddShortNoises
+    from .augmentations.air_absorption import AirAbsorption
+    from .augmentations.apply_impulse_response import ApplyImpulseResponse
+    from .augmentations.apply_mp3_codec import ApplyMP3Codec
+    from .augmentations.apply_ulaw_codec import ApplyULawCodec
+    from .augmentations.apply_vorbis_codec import ApplyVorbisCodec
+    from .augmentations.band_limit_with_two_phase_resample import BandLimitWithTwoPhaseResample
+    from .augmentations.band_pass_filter import BandPassFilter
+    from .augmentations.band_stop_filter import BandStopFilter
+    from .augmentations.clip import Clip
+    from .augmentations.clipping_distortion import ClippingDistortion
+    from .augmentations.compressor import Compressor
+    from .augmentations.destroy_levels import DestroyLevels
+    from .augmentations.gain import Gain
+    from .augmentations.gain_transition import GainTransition
+    from .augmentations.high_pass_filter import HighPassFilter
+    from .augmentations.high_shelf_filter import HighShelfFilter
+    from .augmentations.lambda_transform import Lambda
+    from .augmentations.limiter import Limiter
+    from .augmentations.loudness_normalization import LoudnessNormalization
+    from .augmentations.low_pass_filter import LowPassFilter
+    from .augmentations.low_shelf_filter import LowShelfFilter
+    from .augmentations.mp3_compression import Mp3Compression
+    from .augmentations.noise_gate import NoiseGate
+    from .augmentations.normalize import Normalize
+    from .augmentations.overdrive import Overdrive
+    from .augmentations.padding import Padding
+    from .augmentations.peaking_filter import PeakingFilter
+    from .augmentations.phaser import Phaser
+    from .augmentations.pitch_shift import PitchShift
+    from .augmentations.polarity_inversion import PolarityInversion
+    from .augmentations.resample import Resample
+    from .augmentations.reverse import Reverse
+    from .augmentations.room_simulator import RoomSimulator
+    from .augmentations.seven_band_parametric_eq import SevenBandParametricEQ
+    from .augmentations.shift import Shift
+    from .augmentations.simple_compressor import SimpleCompressor
+    from .augmentations.short_delay import ShortDelay
+    from .augmentations.simple_expansor import SimpleExpansor
+    from .augmentations.tanh_distortion import TanhDistortion
+    from .augmentations.time_mask import TimeMask
+    from .augmentations.time_stretch import TimeStretch
+    from .augmentations.tremolo import Tremolo
+    from .augmentations.trim import Trim
+    from .augmentations.add_dc_component import AddDCComponent
+    from .augmentations.add_phase_randomization import AddRandomizedPhaseShiftNoise
+    from .augmentations.two_pole_all_pass_filter import TwoPoleAllPassFilter
+    from .core.composition import Compose, SpecCompose, OneOf, SomeOf
+    from .spec_augmentations.spec_channel_shuffle import SpecChannelShuffle
+    from .spec_augmentations.spec_frequency_mask import SpecFrequencyMask
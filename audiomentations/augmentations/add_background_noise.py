@@ -1,4 +1,3 @@
-import functools
 import random
 import warnings
 from pathlib import Path
@@ -6,13 +5,22 @@ from typing import Optional, List, Callable, Union
 
 import numpy as np
 
-from audiomentations.core.audio_loading_utils import load_sound_file
+from audiomentations.core.audio_cache import AudioCache
+from audiomentations.core.audio_loading_utils import (
+    get_num_frames,
+    load_sound_file,
+    seeks_accurately,
+)
+from audiomentations.core.corpus_manifest import (
+    CorpusManifest,
+    resolve_sound_file_paths,
+)
+from audiomentations.core.noise_bank import NoiseBank
 from audiomentations.core.transforms_interface import BaseWaveformTransform
 from audiomentations.core.utils import (
     calculate_desired_noise_rms,
     calculate_rms,
     convert_decibels_to_amplitude_ratio,
-    find_audio_files_in_paths,
 )
 
 
@@ -30,9 +38,16 @@ class AddBackgroundNoise(BaseWaveformTransform):
     * https://github.com/microsoft/DNS-Challenge/
     """
 
+    # When the cache does not have the noise file, and the file is at least this many times
+    # longer than the input, only the part of the file that gets mixed in is loaded. This
+    # only happens if the format of the file allows sample-accurate seeks, or if the decoded
+    # file would not fit in the cache. Otherwise, reading the part would decode the file
+    # from its start on every call, so the whole file is decoded once and cached instead.
+    PARTIAL_LOAD_MIN_LENGTH_RATIO = 4
+
     def __init__(
         self,
-        sounds_path: Union[List[Path], List[str], Path, str],
+        sounds_path: Optional[Union[List[Path], List[str], Path, str]] = None,
         min_snr_in_db: float = 3.0,
         max_snr_in_db: float = 30.0,
         noise_rms: str = "relative",
@@ -40,7 +55,10 @@ class AddBackgroundNoise(BaseWaveformTransform):
         max_absolute_rms_in_db: float = -15.0,
         noise_transform: Optional[Callable[[np.ndarray, int], np.ndarray]] = None,
         p: float = 0.5,
-        lru_cache_size: int = 2,
+        lru_cache_size: Optional[int] = None,
+        manifest: Optional[Union[CorpusManifest, Path, str]] = None,
+        noise_bank: Optional[Union[NoiseBank, Path, str]] = None,
+        cache: Optional[AudioCache] = None,
     ):
         """
         :param sounds_path: A path or list of paths to audio file(s) and/or folder(s) with
@@ -62,11 +80,34 @@ class AddBackgroundNoise(BaseWaveformTransform):
             gets applied to the noise before it gets mixed in. The callable is expected
             to input audio waveform (numpy array) and sample rate (int).
         :param p: The probability of applying this transform
-        :param lru_cache_size: Maximum size of the LRU cache for storing noise files in memory
+        :param lru_cache_size: The maximum number of noise files in the private cache of the
+            transform, in addition to its byte budget. None means no limit. Noise files that
+            are much longer than the input are not cached; only the part of such a file that
+            gets mixed in is read from disk.
+        :param manifest: A CorpusManifest of the noise files, or the path to its .npz
+            file (see CorpusManifest.build). If given, the lengths of the files are taken
+            from it instead of from the files. If sounds_path is None, the files of the
+            manifest are used, so no directories get walked.
+        :param noise_bank: A NoiseBank, or the path to its folder (see NoiseBank.build).
+            If given, the noises are read from the memory-mapped bank instead of the files
+            (which don't need to exist then), and sounds_path and manifest must be None.
+            The bank must have the sample rate of the input.
+        :param cache: An AudioCache that the decoded noise files are stored in. One cache
+            can be shared by several transforms, and with AudioCache(shared=True) by all
+            processes on the machine (including DataLoader workers). Defaults to a private
+            AudioCache with a budget of 256 MiB.
         """
         super().__init__(p)
-        self.sound_file_paths = find_audio_files_in_paths(sounds_path)
-        self.sound_file_paths = [str(p) for p in self.sound_file_paths]
+        if isinstance(noise_bank, (Path, str)):
+            noise_bank = NoiseBank(noise_bank)
+        self.noise_bank = noise_bank
+        if noise_bank is not None:
+            assert sounds_path is None and manifest is None
+            self.sound_file_paths, self.manifest = noise_bank.file_paths, None
+        else:
+            self.sound_file_paths, self.manifest = resolve_sound_file_paths(
+                sounds_path, manifest
+            )
 
         assert min_absolute_rms_in_db <= max_absolute_rms_in_db <= 0
         assert min_snr_in_db <= max_snr_in_db
@@ -77,14 +118,71 @@ class AddBackgroundNoise(BaseWaveformTransform):
         self.min_absolute_rms_in_db = min_absolute_rms_in_db
         self.max_absolute_rms_in_db = max_absolute_rms_in_db
         self.max_snr_in_db = max_snr_in_db
-        self._load_sound = functools.lru_cache(maxsize=lru_cache_size)(
-            AddBackgroundNoise._load_sound
-        )
+        if cache is None:
+            cache = AudioCache(max_entries=lru_cache_size)
+        self.sound_cache = cache
         self.noise_transform = noise_transform
 
-    @staticmethod
-    def _load_sound(file_path, sample_rate):
-        return load_sound_file(file_path, sample_rate)
+    def _check_noise_bank_sample_rate(self, sample_rate):
+        if sample_rate != self.noise_bank.sample_rate:
+            raise ValueError(
+                "The noise bank has a sample rate of {} Hz, but the input has {} Hz".format(
+                    self.noise_bank.sample_rate, sample_rate
+                )
+            )
+
+    def _load_sound(self, file_path, sample_rate):
+        return self.sound_cache.load(file_path, sample_rate), sample_rate
+
+    def _get_num_frames_without_decoding(self, file_path, sample_rate):
+        num_frames = None
+        if self.manifest is not None:
+            num_frames = self.manifest.get_num_frames(file_path, sample_rate)
+        if num_frames is None:
+            num_frames = get_num_frames(file_path, sample_rate)
+        return num_frames
+
+    def _get_num_noise_samples(self, file_path, sample_rate):
+        if self.noise_bank is not None:
+            self._check_noise_bank_sample_rate(sample_rate)
+            return self.noise_bank.get_num_frames(file_path)
+        if not self.sound_cache.contains(file_path, sample_rate):
+            num_noise_samples = self._get_num_frames_without_decoding(
+                file_path, sample_rate
+            )
+            if num_noise_samples is not None:
+                return num_noise_samples
+        noise_sound, _ = self._load_sound(file_path, sample_rate)
+        return len(noise_sound)
+
+    def _load_noise_part(self, file_path, sample_rate, start_index, end_index):
+        if self.noise_bank is not None:
+            self._check_noise_bank_sample_rate(sample_rate)
+            return self.noise_bank.get_samples(file_path, start_index, end_index)
+        if not self.sound_cache.contains(file_path, sample_rate):
+            num_noise_samples = self._get_num_frames_without_decoding(
+                file_path, sample_rate
+            )
+            if (
+                num_noise_samples is not None
+                and num_noise_samples
+                >= self.PARTIAL_LOAD_MIN_LENGTH_RATIO * (end_index - start_index)
+                and (
+                    seeks_accurately(file_path)
+                    or num_noise_samples * np.dtype(self.sound_cache.dtype).itemsize
+                    > self.sound_cache.max_bytes
+                )
+            ):
+                noise_sound, _ = load_sound_file(
+                    file_path,
+                    sample_rate,
+                    offset=start_index,
+                    num_frames=end_index - start_index,
+                )
+                return noise_sound
+        return self.sound_cache.load(
+            file_path, sample_rate, start_index=start_index, end_index=end_index
+        )
 
     def randomize_parameters(self, samples, sample_rate):
         super().randomize_parameters(samples, sample_rate)
@@ -98,11 +196,9 @@ class AddBackgroundNoise(BaseWaveformTransform):
             self.parameters["noise_file_path"] = random.choice(self.sound_file_paths)
 
             num_samples = len(samples)
-            noise_sound, _ = self._load_sound(
+            num_noise_samples = self._get_num_noise_samples(
                 self.parameters["noise_file_path"], sample_rate
             )
-
-            num_noise_samples = len(noise_sound)
             min_noise_offset = 0
             max_noise_offset = max(0, num_noise_samples - num_samples - 1)
             self.parameters["noise_start_index"] = random.randint(
@@ -113,12 +209,12 @@ class AddBackgroundNoise(BaseWaveformTransform):
             )
 
     def apply(self, samples, sample_rate):
-        noise_sound, _ = self._load_sound(
-            self.parameters["noise_file_path"], sample_rate
+        noise_sound = self._load_noise_part(
+            self.parameters["noise_file_path"],
+            sample_rate,
+            self.parameters["noise_start_index"],
+            self.parameters["noise_end_index"],
         )
-        noise_sound = noise_sound[
-            self.parameters["noise_start_index"] : self.parameters["noise_end_index"]
-        ]
 
         if self.noise_transform:
             noise_sound = self.noise_transform(noise_sound, sample_rate)
@@ -162,10 +258,10 @@ class AddBackgroundNoise(BaseWaveformTransform):
 
     def __getstate__(self):
         state = self.__dict__.copy()
-        warnings.warn(
-            "Warning: the LRU cache of AddBackgroundNoise gets discarded when pickling it."
-            " E.g. this means the cache will not be used when using AddBackgroundNoise together"
-            " with multiprocessing on Windows"
-        )
-        del state["_load_sound"]
+        if not self.sound_cache.shared:
+            warnings.warn(
+                "Warning: the LRU cache of AddBackgroundNoise gets discarded when pickling it."
+                " E.g. this means the cache will not be used when using AddBackgroundNoise together"
+                " with multiprocessing on Windows"
+            )
         return state
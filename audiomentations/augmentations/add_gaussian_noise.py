@@ -9,6 +9,7 @@ class AddGaussianNoise(BaseWaveformTransform):
     """Add gaussian noise to the samples"""
 
     supports_multichannel = True
+    supports_vectorized_batch = True
 
     def __init__(self, min_amplitude=0.001, max_amplitude=0.015, p=0.5):
         """
@@ -35,3 +36,21 @@ class AddGaussianNoise(BaseWaveformTransform):
         noise = np.random.normal(0, samples.max() / 3, *samples.shape).astype(np.float32)
         samples = samples + self.parameters["amplitude"] * noise
         return samples
+
+    def apply_vectorized_batch(self, samples, sample_rate):
+        should_apply = self.get_batch_should_apply_mask()
+        applied_samples = samples[should_apply]
+        num_applied = applied_samples.shape[0]
+        amplitudes = self.get_batch_parameter(
+            "amplitude", fill_value=0.0, ndim=samples.ndim
+        )[should_apply]
+        noise_std = (
+            applied_samples.reshape(num_applied, -1)
+            .max(axis=1)
+            .reshape(amplitudes.shape)
+            / 3
+        )
+        noise = np.random.standard_normal(applied_samples.shape).astype(np.float32)
+        processed_samples = samples.copy()
+        processed_samples[should_apply] = applied_samples + amplitudes * noise_std * noise
+        return processed_samples
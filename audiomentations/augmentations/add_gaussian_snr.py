@@ -17,6 +17,7 @@ class AddGaussianSNR(BaseWaveformTransform):
     """
 
     supports_multichannel = True
+    supports_vectorized_batch = True
 
     def __init__(
         self, min_snr_in_db: float = 5.0, max_snr_in_db: float = 40.0, p: float = 0.5
@@ -47,3 +48,14 @@ class AddGaussianSNR(BaseWaveformTransform):
             0.0, self.parameters["noise_std"], size=samples.shape
         ).astype(np.float32)
         return samples + noise
+
+    def apply_vectorized_batch(self, samples, sample_rate):
+        should_apply = self.get_batch_should_apply_mask()
+        applied_samples = samples[should_apply]
+        noise_std = self.get_batch_parameter(
+            "noise_std", fill_value=0.0, ndim=samples.ndim
+        )[should_apply]
+        noise = np.random.standard_normal(applied_samples.shape).astype(np.float32)
+        processed_samples = samples.copy()
+        processed_samples[should_apply] = applied_samples + noise_std * noise
+        return processed_samples
@@ -1,4 +1,3 @@
-import functools
 import random
 import warnings
 from pathlib import Path
@@ -6,14 +5,19 @@ from typing import Optional, List, Union, Callable
 
 import numpy as np
 
-from audiomentations.core.audio_loading_utils import load_sound_file
+from audiomentations.core.audio_cache import AudioCache
+from audiomentations.core.audio_loading_utils import get_num_frames
+from audiomentations.core.corpus_manifest import (
+    CorpusManifest,
+    resolve_sound_file_paths,
+)
+from audiomentations.core.noise_bank import NoiseBank
 from audiomentations.core.transforms_interface import BaseWaveformTransform
 from audiomentations.core.utils import (
     calculate_desired_noise_rms,
     calculate_rms,
     calculate_rms_without_silence,
     convert_decibels_to_amplitude_ratio,
-    find_audio_files_in_paths,
 )
 
 
@@ -26,7 +30,7 @@ class AddShortNoises(BaseWaveformTransform):
 
     def __init__(
         self,
-        sounds_path: Union[List[Path], List[str], Path, str],
+        sounds_path: Optional[Union[List[Path], List[str], Path, str]] = None,
         min_snr_in_db: float = 0.0,
         max_snr_in_db: float = 24.0,
         min_time_between_sounds: float = 4.0,
@@ -46,7 +50,10 @@ class AddShortNoises(BaseWaveformTransform):
         signal_gain_in_db_during_noise: float = 0.0,
         noise_transform: Optional[Callable[[np.ndarray, int], np.ndarray]] = None,
         p: float = 0.5,
-        lru_cache_size: Optional[int] = 64,
+        lru_cache_size: Optional[int] = None,
+        manifest: Optional[Union[CorpusManifest, Path, str]] = None,
+        noise_bank: Optional[Union[NoiseBank, Path, str]] = None,
+        cache: Optional[AudioCache] = None,
     ):
         """
         :param sounds_path: A path or list of paths to audio file(s) and/or folder(s) with
@@ -108,11 +115,33 @@ class AddShortNoises(BaseWaveformTransform):
         :param noise_transform: A callable waveform transform (or composition of transforms) that
             gets applied to noises before they get mixed in.
         :param p: The probability of applying this transform
-        :param lru_cache_size: Maximum size of the LRU cache for storing noise files in memory
+        :param lru_cache_size: The maximum number of noise files in the private cache of the
+            transform, in addition to its byte budget. None means no limit.
+        :param manifest: A CorpusManifest of the noise files, or the path to its .npz
+            file (see CorpusManifest.build). If given, the lengths of the files are taken
+            from it instead of from the files when the durations of the sounds are
+            randomized. If sounds_path is None, the files of the manifest are used, so no
+            directories get walked.
+        :param noise_bank: A NoiseBank, or the path to its folder (see NoiseBank.build).
+            If given, the noises are read from the memory-mapped bank instead of the files
+            (which don't need to exist then), and sounds_path and manifest must be None.
+            The bank must have the sample rate of the input.
+        :param cache: An AudioCache that the decoded noise files are stored in. One cache
+            can be shared by several transforms, and with AudioCache(shared=True) by all
+            processes on the machine (including DataLoader workers). Defaults to a private
+            AudioCache with a budget of 256 MiB.
         """
         super().__init__(p)
-        self.sound_file_paths = find_audio_files_in_paths(sounds_path)
-        self.sound_file_paths = [str(p) for p in self.sound_file_paths]
+        if isinstance(noise_bank, (Path, str)):
+            noise_bank = NoiseBank(noise_bank)
+        self.noise_bank = noise_bank
+        if noise_bank is not None:
+            assert sounds_path is None and manifest is None
+            self.sound_file_paths, self.manifest = noise_bank.file_paths, None
+        else:
+            self.sound_file_paths, self.manifest = resolve_sound_file_paths(
+                sounds_path, manifest
+            )
         assert len(self.sound_file_paths) > 0
         assert min_snr_in_db <= max_snr_in_db
         assert min_time_between_sounds <= max_time_between_sounds
@@ -164,13 +193,41 @@ class AddShortNoises(BaseWaveformTransform):
         self.add_all_noises_with_same_level = add_all_noises_with_same_level
         self.signal_gain_in_db_during_noise = signal_gain_in_db_during_noise
         self.noise_transform = noise_transform
-        self._load_sound = functools.lru_cache(maxsize=lru_cache_size)(
-            AddShortNoises.__load_sound
-        )
+        if cache is None:
+            cache = AudioCache(max_entries=lru_cache_size)
+        self.sound_cache = cache
+
+    def _check_noise_bank_sample_rate(self, sample_rate):
+        if sample_rate != self.noise_bank.sample_rate:
+            raise ValueError(
+                "The noise bank has a sample rate of {} Hz, but the input has {} Hz".format(
+                    self.noise_bank.sample_rate, sample_rate
+                )
+            )
 
-    @staticmethod
-    def __load_sound(file_path, sample_rate):
-        return load_sound_file(file_path, sample_rate)
+    def _load_sound(self, file_path, sample_rate):
+        if self.noise_bank is not None:
+            self._check_noise_bank_sample_rate(sample_rate)
+            return self.noise_bank.get_samples(file_path), sample_rate
+        return self.sound_cache.load(file_path, sample_rate), sample_rate
+
+    def _get_sound_duration(self, file_path, sample_rate):
+        """
+        Return the duration of the sound in seconds. If the sound is neither in the manifest
+        nor cached, only the header of the file is read, if possible.
+        """
+        if self.noise_bank is not None:
+            self._check_noise_bank_sample_rate(sample_rate)
+            return self.noise_bank.get_num_frames(file_path) / sample_rate
+        num_frames = None
+        if self.manifest is not None:
+            num_frames = self.manifest.get_num_frames(file_path, sample_rate)
+        if num_frames is None and not self.sound_cache.contains(file_path, sample_rate):
+            num_frames = get_num_frames(file_path, sample_rate)
+        if num_frames is None:
+            sound, _ = self._load_sound(file_path, sample_rate)
+            num_frames = len(sound)
+        return num_frames / sample_rate
 
     def randomize_parameters(self, samples, sample_rate):
         super().randomize_parameters(samples, sample_rate)
@@ -191,8 +248,7 @@ class AddShortNoises(BaseWaveformTransform):
 
             while current_time < input_sound_duration:
                 sound_file_path = random.choice(self.sound_file_paths)
-                sound, _ = self.__load_sound(sound_file_path, sample_rate)
-                sound_duration = len(sound) / sample_rate
+                sound_duration = self._get_sound_duration(sound_file_path, sample_rate)
 
                 # Ensure that the fade time is not longer than the duration of the sound
                 fade_in_time = min(
@@ -238,8 +294,9 @@ class AddShortNoises(BaseWaveformTransform):
                         break
 
                     sound_file_path = random.choice(self.sound_file_paths)
-                    sound, _ = self.__load_sound(sound_file_path, sample_rate)
-                    sound_duration = len(sound) / sample_rate
+                    sound_duration = self._get_sound_duration(
+                        sound_file_path, sample_rate
+                    )
 
                     fade_in_time = min(
                         sound_duration,
@@ -296,7 +353,7 @@ class AddShortNoises(BaseWaveformTransform):
                 # Skip a sound if it ended before the start of the input sound
                 continue
 
-            noise_samples, _ = self.__load_sound(sound_params["file_path"], sample_rate)
+            noise_samples, _ = self._load_sound(sound_params["file_path"], sample_rate)
 
             if self.noise_transform:
                 noise_samples = self.noise_transform(noise_samples, sample_rate)
@@ -376,10 +433,10 @@ class AddShortNoises(BaseWaveformTransform):
 
     def __getstate__(self):
         state = self.__dict__.copy()
-        warnings.warn(
-            "Warning: the LRU cache of AddShortNoises gets discarded when pickling it."
-            " E.g. this means the cache will not be used when using AddShortNoises together"
-            " with multiprocessing on Windows"
-        )
-        del state["_load_sound"]
+        if not self.sound_cache.shared:
+            warnings.warn(
+                "Warning: the LRU cache of AddShortNoises gets discarded when pickling it."
+                " E.g. this means the cache will not be used when using AddShortNoises together"
+                " with multiprocessing on Windows"
+            )
         return state
@@ -1,7 +1,17 @@
+from audiomentations.core.cache import LRUCache
+from audiomentations.core.convolution import (
+    compute_filter_spectra,
+    convolve_with_spectra,
+    get_block_size,
+)
 from audiomentations.core.transforms_interface import BaseWaveformTransform
 import numpy as np
 import librosa
 
+# The distance is rounded to this resolution (in meters) before the attenuation is
+# computed, so the attenuation responses of nearby distances can be cached and shared
+DISTANCE_RESOLUTION = 0.01
+
 
 def next_power_of_2(x: int) -> int:
     """
@@ -63,6 +73,7 @@ class AirAbsorption(BaseWaveformTransform):
         ],
         "center_freqs": [125, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000],
     }
+    humidity_bounds = [30, 50, 70, 90]
 
     def __init__(
         self,
@@ -73,6 +84,8 @@ class AirAbsorption(BaseWaveformTransform):
         min_distance: float = 10.0,
         max_distance: float = 100.0,
         p=0.5,
+        method: str = "stft",
+        response_cache_max_bytes: int = 16 * 1024 * 1024,
     ):
         """
         :param min_temperature: Minimum temperature in Celsius (can take a value of either 10.0 or 20.0)
@@ -82,6 +95,13 @@ class AirAbsorption(BaseWaveformTransform):
         :param min_distance: Minimum microphone-source distance in meters.
         :param max_distance: Maximum microphone-source distance in meters.
         :param p: The probability of applying this transform
+        :param method: "stft" or "fir". "stft" multiplies the STFT of the audio by the
+            attenuation response. "fir" turns the attenuation response into a linear-phase
+            FIR filter and applies it with an FFT convolution, which is several times
+            faster and gives almost the same result.
+        :param response_cache_max_bytes: The maximum size of the cache of attenuation
+            responses, which are keyed by temperature, humidity band, distance (rounded to
+            1 cm) and sample rate
         """
         assert float(min_temperature) in [
             10.0,
@@ -96,6 +116,7 @@ class AirAbsorption(BaseWaveformTransform):
         assert min_distance > 0.0
         assert max_distance > 0.0
         assert min_distance <= max_distance
+        assert method in ("stft", "fir")
 
         super().__init__(p)
 
@@ -108,6 +129,9 @@ class AirAbsorption(BaseWaveformTransform):
         self.min_distance = min_distance
         self.max_distance = max_distance
 
+        self.method = method
+        self.response_cache = LRUCache(response_cache_max_bytes)
+
     def randomize_parameters(self, samples: np.ndarray, sample_rate: int) -> np.ndarray:
         super().randomize_parameters(samples, sample_rate)
         self.parameters["temperature"] = 10 * np.random.randint(
@@ -120,32 +144,75 @@ class AirAbsorption(BaseWaveformTransform):
             self.min_distance, self.max_distance
         )
 
-    def apply(self, samples: np.ndarray, sample_rate: int):
-        assert samples.dtype == np.float32
+    @classmethod
+    def get_table_key(cls, temperature: int, humidity: float) -> str:
+        """
+        Return the key of the row of air_absorption_table for the given temperature and
+        humidity. Like in pyroomacoustics, a humidity on the boundary between two bands
+        belongs to the upper band.
+        """
+        bounds = cls.humidity_bounds
+        band = 1
+        while band < len(bounds) - 1 and humidity >= bounds[band]:
+            band += 1
+        return f"{int(temperature)}C_{bounds[band - 1]}-{bounds[band]}%"
+
+    @classmethod
+    def get_n_fft(cls, sample_rate: int) -> int:
+        # Calculate n_fft so that the lowest band can be stored in a single fft bin
+        first_band_bw = cls.air_absorption_table["center_freqs"][0] / (2**0.5)
+        return next_power_of_2(int(sample_rate / 2 / first_band_bw))
+
+    def get_attenuation_response(
+        self, table_key: str, distance: float, sample_rate: int
+    ) -> np.ndarray:
+        """
+        Return the linear attenuation of each STFT frequency bin, for the given row of the
+        air absorption table and distance. The response is cached.
+        """
+        distance = round(distance / DISTANCE_RESOLUTION) * DISTANCE_RESOLUTION
+        cache_key = (table_key, round(distance / DISTANCE_RESOLUTION), sample_rate)
+        return self.response_cache.get_or_compute(
+            cache_key,
+            lambda: self._compute_attenuation_response(table_key, distance, sample_rate),
+        )
 
-        humidity = self.parameters["humidity"]
-        distance = self.parameters["distance"]
+    def get_fir_spectra(self, table_key: str, distance: float, sample_rate: int):
+        """
+        Return the partition spectra (see audiomentations.core.convolution) of the
+        linear-phase FIR filter with the attenuation response, and the block size. The
+        filter has n_fft + 1 taps and a delay of n_fft / 2 samples. The spectra are cached.
+        """
+        cache_key = (
+            "fir",
+            table_key,
+            round(distance / DISTANCE_RESOLUTION),
+            sample_rate,
+        )
 
-        # Choose correct absorption coefficients
-        key = str(int(self.parameters["temperature"])) + "C"
-        bounds = [30, 50, 70, 90]
-        for n in range(1, len(bounds)):
-            if bounds[n - 1] <= humidity or humidity <= bounds[n]:
-                key += f"_{bounds[n-1]}-{bounds[n]}%"
-                break
+        def compute():
+            response = self.get_attenuation_response(table_key, distance, sample_rate)
+            n_fft = self.get_n_fft(sample_rate)
+            # The zero-phase impulse response, centered and made symmetric
+            impulse_response = np.fft.fftshift(np.fft.irfft(response, n=n_fft))
+            impulse_response = np.append(impulse_response, impulse_response[0])
+            impulse_response *= np.hanning(n_fft + 1)
+            block_size = get_block_size(n_fft + 1)
+            return compute_filter_spectra(impulse_response, block_size), block_size
 
+        spectra, block_size = self.response_cache.get_or_compute(cache_key, compute)
+        return spectra, block_size
+
+    def _compute_attenuation_response(self, table_key, distance, sample_rate):
         # Convert to attenuations
         attenuation_values = np.exp(
-            -distance * np.array(self.air_absorption_table[key])
+            -distance * np.array(self.air_absorption_table[table_key])
         )
 
-        # Calculate n_fft so that the lowest band can be stored in a single
-        # fft bin.
-        first_band_bw = self.air_absorption_table["center_freqs"][0] / (2**0.5)
-        n_fft = next_power_of_2(int(sample_rate / 2 / first_band_bw))
-
         # Frequencies to calculate the attenuations caused by air absorption
-        frequencies = librosa.fft_frequencies(sr=sample_rate, n_fft=n_fft)
+        frequencies = librosa.fft_frequencies(
+            sr=sample_rate, n_fft=self.get_n_fft(sample_rate)
+        )
 
         # Interpolate to the desired frequencies (we have to do this in dB)
         db_target_attenuations = np.interp(
@@ -153,29 +220,32 @@ class AirAbsorption(BaseWaveformTransform):
             self.air_absorption_table["center_freqs"],
             20 * np.log10(attenuation_values),
         )
+        response = 10 ** (db_target_attenuations / 20)
+        # float32, so that multiplying the complex64 STFT does not upcast it
+        response = response.astype(np.float32)
+        response.flags.writeable = False
+        return response
 
-        linear_target_attenuations = 10 ** (db_target_attenuations / 20)
-
-        # Apply using STFT
-        if len(samples.shape) == 1:
-            stft = librosa.stft(samples, n_fft=n_fft)
-
-            # Compute mask
-            mask = np.tile(linear_target_attenuations, (stft.shape[1], 1)).T
-
-            # Compute target degraded audio
-            result = librosa.istft(stft * mask, length=len(samples), dtype=np.float32)
-
-        else:
-            result = np.zeros_like(samples, dtype=np.float32)
-
-            for chn_idx, channel in enumerate(samples):
-                stft = librosa.stft(channel, n_fft=n_fft)
-
-                # Compute mask
-                mask = np.tile(linear_target_attenuations, (stft.shape[1], 1)).T
+    def apply(self, samples: np.ndarray, sample_rate: int):
+        assert samples.dtype == np.float32
 
-                # Compute target degraded audio
-                result[chn_idx, :] = librosa.istft(stft * mask, length=result.shape[1])
+        table_key = self.get_table_key(
+            self.parameters["temperature"], self.parameters["humidity"]
+        )
+        distance = self.parameters["distance"]
 
-        return result
+        if self.method == "fir":
+            spectra, block_size = self.get_fir_spectra(table_key, distance, sample_rate)
+            delay = self.get_n_fft(sample_rate) // 2
+            filtered = convolve_with_spectra(
+                samples, spectra, block_size, samples.shape[-1] + delay
+            )
+            return np.ascontiguousarray(filtered[..., delay:])
+
+        response = self.get_attenuation_response(table_key, distance, sample_rate)
+
+        # Apply using one STFT for all channels. The response is broadcast over the
+        # frames (and channels).
+        stft = librosa.stft(samples, n_fft=self.get_n_fft(sample_rate))
+        stft *= response[:, np.newaxis]
+        return librosa.istft(stft, length=samples.shape[-1], dtype=np.float32)
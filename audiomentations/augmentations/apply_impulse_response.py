@@ -1,15 +1,22 @@
-import functools
 import random
 import warnings
 from pathlib import Path
-from typing import List, Union
+from typing import List, Optional, Union
 
 import numpy as np
-from scipy.signal import convolve
 
-from audiomentations.core.audio_loading_utils import load_sound_file
+from audiomentations.core.audio_cache import AudioCache
+from audiomentations.core.cache import LRUCache, get_sound_file_cache_key
+from audiomentations.core.corpus_manifest import (
+    CorpusManifest,
+    resolve_sound_file_paths,
+)
+from audiomentations.core.convolution import (
+    compute_filter_spectra,
+    convolve_with_spectra,
+    get_block_size,
+)
 from audiomentations.core.transforms_interface import BaseWaveformTransform
-from audiomentations.core.utils import find_audio_files_in_paths
 
 
 class ApplyImpulseResponse(BaseWaveformTransform):
@@ -22,74 +29,91 @@ class ApplyImpulseResponse(BaseWaveformTransform):
 
     def __init__(
         self,
-        ir_path: Union[List[Path], List[str], str, Path],
+        ir_path: Optional[Union[List[Path], List[str], str, Path]] = None,
         p=0.5,
-        lru_cache_size=128,
+        lru_cache_size: Optional[int] = None,
         leave_length_unchanged: bool = True,
+        spectrum_cache_max_bytes: int = 256 * 1024 ** 2,
+        manifest: Optional[Union[CorpusManifest, Path, str]] = None,
+        cache: Optional[AudioCache] = None,
     ):
         """
         :param ir_path: A path or list of paths to audio file(s) and/or folder(s) with
             audio files. Can be str or Path instance(s). The audio files given here are
             supposed to be impulse responses.
         :param p: The probability of applying this transform
-        :param lru_cache_size: Maximum size of the LRU cache for storing impulse response files
-        in memory.
+        :param lru_cache_size: The maximum number of impulse responses in the private cache
+            of the transform, in addition to its byte budget. None means no limit.
         :param leave_length_unchanged: When set to True, the tail of the sound (e.g. reverb at
             the end) will be chopped off so that the length of the output is equal to the
-            length of the input.
+            length of the input. The tail is then not computed at all.
+        :param spectrum_cache_max_bytes: Maximum total size in bytes of the cached spectra of
+            the impulse responses. The spectrum of an impulse response takes about 4 times
+            as much memory as the impulse response itself (as float32).
+        :param manifest: A CorpusManifest of the impulse responses, or the path to its .npz
+            file (see CorpusManifest.build). If ir_path is None, the files of the manifest
+            are used, so no directories get walked.
+        :param cache: An AudioCache that the decoded impulse responses are stored in. One
+            cache can be shared by several transforms, and with AudioCache(shared=True) by all
+            processes on the machine (including DataLoader workers). Defaults to a private
+            AudioCache with a budget of 256 MiB.
         """
         super().__init__(p)
-        self.ir_files = find_audio_files_in_paths(ir_path)
-        self.ir_files = [str(p) for p in self.ir_files]
+        self.ir_files, self.manifest = resolve_sound_file_paths(ir_path, manifest)
         assert len(self.ir_files) > 0
-        self.__load_ir = functools.lru_cache(maxsize=lru_cache_size)(
-            ApplyImpulseResponse.__load_ir
-        )
+        if cache is None:
+            cache = AudioCache(max_entries=lru_cache_size)
+        self.ir_cache = cache
 
         self.leave_length_unchanged = leave_length_unchanged
+        self.spectrum_cache = LRUCache(max_bytes=spectrum_cache_max_bytes)
 
-    @staticmethod
-    def __load_ir(file_path, sample_rate):
-        return load_sound_file(file_path, sample_rate)
+    def _load_ir(self, file_path, sample_rate):
+        return self.ir_cache.load(file_path, sample_rate)
 
     def randomize_parameters(self, samples, sample_rate):
         super().randomize_parameters(samples, sample_rate)
         if self.parameters["should_apply"]:
             self.parameters["ir_file_path"] = random.choice(self.ir_files)
 
+    def get_ir_spectra(self, file_path, sample_rate):
+        """
+        Return the (cached) spectra of the partitions of the impulse response, the block
+        size of the partitions and the length of the impulse response
+        """
+        ir = self._load_ir(file_path, sample_rate)
+        block_size = get_block_size(ir.shape[-1])
+        ir_spectra = self.spectrum_cache.get_or_compute(
+            get_sound_file_cache_key(file_path, sample_rate) + (block_size,),
+            lambda: compute_filter_spectra(ir, block_size),
+        )
+        return ir_spectra, block_size, ir.shape[-1]
+
     def apply(self, samples, sample_rate):
-        ir, sample_rate2 = self.__load_ir(self.parameters["ir_file_path"], sample_rate)
-        if sample_rate != sample_rate2:
-            # This will typically not happen, as librosa should automatically resample the
-            # impulse response sound to the desired sample rate
-            raise Exception(
-                "Recording sample rate {} did not match Impulse Response signal"
-                " sample rate {}!".format(sample_rate, sample_rate2)
-            )
+        ir_spectra, block_size, ir_length = self.get_ir_spectra(
+            self.parameters["ir_file_path"], sample_rate
+        )
 
-        if samples.ndim > 1:
-            signal_ir = []
-            for i in range(samples.shape[0]):
-                channel_conv = convolve(samples[i], ir)
-                signal_ir.append(channel_conv)
-            signal_ir = np.array(signal_ir, dtype=samples.dtype)
+        if self.leave_length_unchanged:
+            output_length = samples.shape[-1]
         else:
-            signal_ir = convolve(samples, ir)
+            output_length = samples.shape[-1] + ir_length - 1
+        signal_ir = convolve_with_spectra(
+            samples, ir_spectra, block_size, output_length
+        )
 
         max_value = max(np.amax(signal_ir), -np.amin(signal_ir))
         if max_value > 0.0:
             scale = 0.5 / max_value
             signal_ir *= scale
-        if self.leave_length_unchanged:
-            signal_ir = signal_ir[..., : samples.shape[-1]]
         return signal_ir
 
     def __getstate__(self):
         state = self.__dict__.copy()
-        warnings.warn(
-            "Warning: the LRU cache of ApplyImpulseResponse gets discarded when pickling it."
-            " E.g. this means the cache will be not be used when using ApplyImpulseResponse"
-            " together with multiprocessing on Windows"
-        )
-        del state["_ApplyImpulseResponse__load_ir"]
+        if not self.ir_cache.shared:
+            warnings.warn(
+                "Warning: the LRU cache of ApplyImpulseResponse gets discarded when pickling it."
+                " E.g. this means the cache will be not be used when using ApplyImpulseResponse"
+                " together with multiprocessing on Windows"
+            )
         return state
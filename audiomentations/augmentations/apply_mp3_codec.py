@@ -1,18 +1,22 @@
 import random
+import sys
 
-import librosa
-import torch
-import torchaudio
 import numpy as np
 
-from audiomentations.core.utils import find_time_shift
+from audiomentations.core.codecs import (
+    align_codec_output,
+    apply_mp3_codec,
+    get_codec_delay,
+    get_mp3_delay,
+)
 from audiomentations.core.transforms_interface import BaseWaveformTransform
 
 
 class ApplyMP3Codec(BaseWaveformTransform):
     """
-    Apply MP3 Codec. 
-    Mp3 encode and decode the audio signal. May cause time shift issues.
+    Apply MP3 Codec.
+    Mp3 encode and decode the audio signal. The delay that the codec adds is removed,
+    so the output is aligned with the input and has the same length.
     """
 
     supports_multichannel = True
@@ -20,16 +24,28 @@ class ApplyMP3Codec(BaseWaveformTransform):
     def __init__(self,
                  min_bitrate=8,
                  max_bitrate=320,
+                 backend="lameenc",
                  p=0.5):
         """
         :param min_bitrate, int, minimum bitrate (in `kbps`)
         :param max_bitrate, int, maximum bitrate (in `kbps`)
+        :param backend: "lameenc" or "torchaudio". "lameenc" converts the audio to 16
+            bits, encodes it in memory with LAME (through the optional lameenc package)
+            at quality 7, the fastest setting, and decodes it with libsndfile (through
+            soundfile 0.12 or newer, with libsndfile 1.1 or newer). At low bitrates,
+            LAME may lower the sample rate; the decoded audio is then resampled back.
+            It supports mono and stereo audio. "torchaudio" uses
+            torchaudio.functional.apply_codec (sox with its own LAME settings and
+            decoder), so the outputs of the two backends are similar but not identical.
+            It needs torch and torchaudio.
         :param p: The probability of applying this transform
         """
         super().__init__(p)
         self.min_bitrate = min_bitrate
         self.max_bitrate = max_bitrate
         assert self.min_bitrate < self.max_bitrate
+        assert backend in ("lameenc", "torchaudio")
+        self.backend = backend
 
     def randomize_parameters(self, samples, sample_rate):
         super().randomize_parameters(samples, sample_rate)
@@ -39,6 +55,47 @@ class ApplyMP3Codec(BaseWaveformTransform):
             )
 
     def apply(self, samples, sample_rate):
+        bitrate = self.parameters['bitrate']
+        num_channels = 1 if samples.ndim == 1 else samples.shape[0]
+        if self.backend == "lameenc":
+            compressed_samples = apply_mp3_codec(
+                samples.astype(np.float32), sample_rate, bitrate
+            )
+            delay = get_mp3_delay(bitrate, sample_rate, num_channels)
+        else:
+            compressed_samples = self.apply_torchaudio_codec(
+                samples, sample_rate, bitrate
+            )
+            delay = get_codec_delay(
+                ("torchaudio_mp3", bitrate, sample_rate, num_channels),
+                sample_rate,
+                lambda probe, sr: self.apply_torchaudio_codec(
+                    np.tile(probe, (num_channels, 1)), sr, bitrate
+                )[0],
+            )
+
+        # The decoded audio starts with the delay of the codec, and it is usually longer
+        # than the input, because the last frame is padded
+        compressed_samples = align_codec_output(
+            compressed_samples, delay, samples.shape[-1]
+        )
+
+        assert compressed_samples.shape == samples.shape
+        return compressed_samples
+
+    def apply_torchaudio_codec(self, samples, sample_rate, bitrate):
+        try:
+            import torch
+            import torchaudio
+        except ImportError:
+            print(
+                "Failed to import torchaudio. Maybe it is not installed? "
+                "To use the torchaudio backend of ApplyMP3Codec,"
+                " run `pip install torchaudio`",
+                file=sys.stderr,
+            )
+            raise
+
         samples_torch = torch.tensor(samples.astype(np.float32))
 
         if len(samples.shape) == 1:
@@ -46,24 +103,12 @@ class ApplyMP3Codec(BaseWaveformTransform):
 
         compressed_samples = torchaudio.functional.apply_codec(
             samples_torch,
-            sample_rate, 
+            sample_rate,
             format='mp3',
-            compression=self.parameters['bitrate']
+            compression=bitrate
         )
 
-        # the decoded audio may have more samples than the original due to mp3 codec characteristics.
-        # to alight the decoded audio with original, first use convolution to find time shift.
-        shift = find_time_shift(compressed_samples[0].numpy(), samples_torch[0].numpy())
-
-        assert shift > 0
-        compressed_samples = compressed_samples[:, shift:]
-        assert compressed_samples.shape[-1] >= samples_torch.shape[-1]
-        compressed_samples = compressed_samples[:, :samples_torch.shape[-1]]
-
         if len(samples.shape) == 1:
             compressed_samples = compressed_samples[0]
 
-        compressed_samples = compressed_samples.numpy()
-
-        assert compressed_samples.shape == samples.shape
-        return compressed_samples
\ No newline at end of file
+        return compressed_samples.numpy()
@@ -1,30 +1,93 @@
-import random
+import sys
 
 import librosa
 import numpy as np
-import torch
-import torchaudio
 
+from audiomentations.core.g711 import ENCODINGS, apply_g711_codec
 from audiomentations.core.transforms_interface import BaseWaveformTransform
 
-    
+
 class ApplyULawCodec(BaseWaveformTransform):
     """
-    Apply MU-Law/U-Law Codec. 
+    Apply MU-Law/U-Law Codec.
     ULAW encode and decode the audio signal.
     """
 
     supports_multichannel = True
 
+    # The sample rate of telephone audio
+    TELEPHONY_SAMPLE_RATE = 8000
+
     def __init__(self,
+                 encoding="ULAW",
+                 resample_to_telephony_rate=False,
+                 backend="native",
                  p=0.5):
         """
+        :param encoding: "ULAW" (mu-law) or "ALAW" (A-law)
+        :param resample_to_telephony_rate: If True, resample the audio to 8 kHz before
+            encoding it and back to the original sample rate after decoding it, like in a
+            telephone call
+        :param backend: "native" or "torchaudio". "native" rounds the samples to 16 bits
+            (clipping them to [-1, 1]) and maps them to 8-bit codes and back with numpy
+            lookup tables (audiomentations.core.g711). The tables follow the G.711
+            reference implementation that sox and Python's audioop module use, so a
+            16-bit sample gets the same code as in sox. It needs no extra dependencies
+            and handles any number of channels in one indexing operation. "torchaudio"
+            writes the audio to an in-memory WAV file with
+            torchaudio.functional.apply_codec (which uses sox) and needs torch and
+            torchaudio.
         :param p: The probability of applying this transform
         """
         super().__init__(p)
-
+        assert encoding in ENCODINGS
+        assert backend in ("native", "torchaudio")
+        self.encoding = encoding
+        self.resample_to_telephony_rate = resample_to_telephony_rate
+        self.backend = backend
 
     def apply(self, samples, sample_rate):
+        codec_sample_rate = sample_rate
+        if self.resample_to_telephony_rate and sample_rate != self.TELEPHONY_SAMPLE_RATE:
+            codec_sample_rate = self.TELEPHONY_SAMPLE_RATE
+            codec_input = librosa.core.resample(
+                samples, orig_sr=sample_rate, target_sr=codec_sample_rate
+            )
+        else:
+            codec_input = samples
+
+        if self.backend == "native":
+            compressed_samples = apply_g711_codec(codec_input, self.encoding)
+        else:
+            compressed_samples = self.apply_torchaudio_codec(
+                codec_input, codec_sample_rate
+            )
+
+        if codec_sample_rate != sample_rate:
+            compressed_samples = librosa.core.resample(
+                compressed_samples, orig_sr=codec_sample_rate, target_sr=sample_rate
+            )
+            if samples.shape != compressed_samples.shape:
+                compressed_samples = librosa.util.fix_length(
+                    compressed_samples, size=samples.shape[-1]
+                )
+
+        assert compressed_samples.shape == samples.shape
+        return compressed_samples.astype(np.float32)
+
+    def apply_torchaudio_codec(self, samples, sample_rate):
+        try:
+            import torch
+            import torchaudio
+        except ImportError:
+            print(
+                "Failed to import torchaudio. Maybe it is not installed? "
+                "To use the torchaudio backend of ApplyULawCodec,"
+                " run `pip install torchaudio`",
+                file=sys.stderr,
+            )
+            raise
+
         samples_torch = torch.tensor(samples.astype(np.float32))
 
         if len(samples.shape) == 1:
@@ -32,16 +95,13 @@ class ApplyULawCodec(BaseWaveformTransform):
 
         compressed_samples = torchaudio.functional.apply_codec(
             samples_torch,
-            sample_rate, 
+            sample_rate,
             format='wav',
-            encoding='ULAW',
+            encoding=self.encoding,
             bits_per_sample=8
         )
 
         if len(samples.shape) == 1:
             compressed_samples = compressed_samples[0]
 
-        compressed_samples = compressed_samples.numpy()
-
-        assert compressed_samples.shape == samples.shape
-        return compressed_samples
\ No newline at end of file
+        return compressed_samples.numpy()
@@ -1,34 +1,54 @@
 import random
+import sys
 
 import librosa
 import numpy as np
-import torch
-import torchaudio
 
+from audiomentations.core.codecs import OPUS_SAMPLE_RATES, apply_soundfile_codec
 from audiomentations.core.transforms_interface import BaseWaveformTransform
 
 
 class ApplyVorbisCodec(BaseWaveformTransform):
     """
-    Apply OGG/Vorbis Codec. 
+    Apply OGG/Vorbis Codec.
     OGG/Vorbis encode and decode the audio signal.
     """
 
     supports_multichannel = True
 
+    # The sample rate that audio with a sample rate that Opus does not support is
+    # resampled to
+    OPUS_FALLBACK_SAMPLE_RATE = 48000
+
     def __init__(self,
                  min_compression=-1,
                  max_compression=10,
+                 codec="vorbis",
+                 backend="native",
                  p=0.5):
         """
         :param min_compression, int, minimum compression. This corresponds to ``-C`` option of ``sox`` command.
         :param max_compression, int, maximum compression. This corresponds to ``-C`` option of ``sox`` command.
+        :param codec: "vorbis" or "opus". Opus is only supported by the native backend.
+        :param backend: "native" or "torchaudio". "native" encodes the audio to an
+            in-memory OGG file with libsndfile (through soundfile 0.12 or newer) and
+            decodes it again. Both backends use libvorbis. The compression is mapped to
+            libsndfile's compression level so that 0 to 10 give the same Vorbis quality
+            as sox's -C, but -1 is encoded like 0, because libsndfile has no lower
+            quality. With codec="opus", audio at a sample rate that Opus does not
+            support is resampled to 48 kHz and back. "torchaudio" uses
+            torchaudio.functional.apply_codec (sox) and needs torch and torchaudio.
         :param p: The probability of applying this transform
         """
         super().__init__(p)
         self.min_compression = min_compression
         self.max_compression = max_compression
         assert self.min_compression < self.max_compression
+        assert codec in ("vorbis", "opus")
+        assert backend in ("native", "torchaudio")
+        assert codec == "vorbis" or backend == "native"
+        self.codec = codec
+        self.backend = backend
 
     def randomize_parameters(self, samples, sample_rate):
         super().randomize_parameters(samples, sample_rate)
@@ -38,6 +58,61 @@ class ApplyVorbisCodec(BaseWaveformTransform):
             )
 
     def apply(self, samples, sample_rate):
+        if self.backend == "native":
+            compressed_samples = self.apply_soundfile_codec(samples, sample_rate)
+        else:
+            compressed_samples = self.apply_torchaudio_codec(samples, sample_rate)
+
+        assert compressed_samples.shape == samples.shape
+        return compressed_samples
+
+    def get_compression_level(self):
+        """
+        Map the compression (like sox's ``-C`` option: -1 is the lowest and 10 the highest
+        quality) to libsndfile's compression level (0 is the highest and 1 the lowest
+        quality)
+        """
+        return min(1.0, max(0.0, 1.0 - self.parameters['compression'] / 10))
+
+    def apply_soundfile_codec(self, samples, sample_rate):
+        codec_sample_rate = sample_rate
+        codec_input = samples
+        if self.codec == "opus" and sample_rate not in OPUS_SAMPLE_RATES:
+            codec_sample_rate = self.OPUS_FALLBACK_SAMPLE_RATE
+            codec_input = librosa.core.resample(
+                samples, orig_sr=sample_rate, target_sr=codec_sample_rate
+            )
+
+        compressed_samples = apply_soundfile_codec(
+            codec_input,
+            codec_sample_rate,
+            format="OGG",
+            subtype=self.codec.upper(),
+            compression_level=self.get_compression_level(),
+        )
+
+        if codec_sample_rate != sample_rate:
+            compressed_samples = librosa.core.resample(
+                compressed_samples, orig_sr=codec_sample_rate, target_sr=sample_rate
+            )
+            compressed_samples = librosa.util.fix_length(
+                compressed_samples, size=samples.shape[-1]
+            )
+        return compressed_samples.astype(np.float32)
+
+    def apply_torchaudio_codec(self, samples, sample_rate):
+        try:
+            import torch
+            import torchaudio
+        except ImportError:
+            print(
+                "Failed to import torchaudio. Maybe it is not installed? "
+                "To use the torchaudio backend of ApplyVorbisCodec,"
+                " run `pip install torchaudio`",
+                file=sys.stderr,
+            )
+            raise
+
         samples_torch = torch.tensor(samples.astype(np.float32))
 
         if len(samples.shape) == 1:
@@ -45,7 +120,7 @@ class ApplyVorbisCodec(BaseWaveformTransform):
 
         compressed_samples = torchaudio.functional.apply_codec(
             samples_torch,
-            sample_rate, 
+            sample_rate,
             format='ogg',
             compression=self.parameters['compression']
         )
@@ -53,7 +128,4 @@ class ApplyVorbisCodec(BaseWaveformTransform):
         if len(samples.shape) == 1:
             compressed_samples = compressed_samples[0]
 
-        compressed_samples = compressed_samples.numpy()
-
-        assert compressed_samples.shape == samples.shape
-        return compressed_samples
\ No newline at end of file
+        return compressed_samples.numpy()
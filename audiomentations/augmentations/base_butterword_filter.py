@@ -1,8 +1,15 @@
 import random
+from functools import partial
 
 import numpy as np
-from scipy.signal import butter, sosfilt, sosfiltfilt, sosfilt_zi
+from scipy.signal import butter
 
+from audiomentations.core.filtering import (
+    apply_sos_filter,
+    apply_sos_filter_to_batch,
+    get_cached_sos,
+    snap_to_octave_grid,
+)
 from audiomentations.core.transforms_interface import BaseWaveformTransform
 from audiomentations.core.utils import (
     convert_frequency_to_mel,
@@ -16,6 +23,7 @@ class BaseButterworthFilter(BaseWaveformTransform):
     """
 
     supports_multichannel = True
+    supports_vectorized_batch = True
 
     # The types below must be equal to the ones accepted by
     # the `btype` argument of `scipy.signal.butter`
@@ -36,6 +44,8 @@ class BaseButterworthFilter(BaseWaveformTransform):
         self.min_rolloff = kwargs["min_rolloff"]
         self.max_rolloff = kwargs["max_rolloff"]
         self.zero_phase = kwargs["zero_phase"]
+        self.grid_steps_per_octave = kwargs.get("grid_steps_per_octave")
+        assert self.grid_steps_per_octave is None or self.grid_steps_per_octave > 0
 
         if self.zero_phase:
             assert (
@@ -149,6 +159,12 @@ class BaseButterworthFilter(BaseWaveformTransform):
                 "min_bandwidth_fraction must not be greater than max_bandwidth_fraction"
             )
 
+    @property
+    def supports_sos_fusion(self):
+        # A zero-phase filter runs forwards and backwards, so it can't be fused with
+        # other filters into one causal cascade
+        return not self.zero_phase
+
     def randomize_parameters(self, samples: np.array, sample_rate: int = None):
         super().randomize_parameters(samples, sample_rate)
         if self.zero_phase:
@@ -165,79 +181,101 @@ class BaseButterworthFilter(BaseWaveformTransform):
                 low=convert_frequency_to_mel(self.min_cutoff_freq),
                 high=convert_frequency_to_mel(self.max_cutoff_freq),
             )
-            self.parameters["cutoff_freq"] = convert_mel_to_frequency(cutoff_mel)
+            self.parameters["cutoff_freq"] = snap_to_octave_grid(
+                convert_mel_to_frequency(cutoff_mel),
+                self.grid_steps_per_octave,
+                self.min_cutoff_freq,
+                self.max_cutoff_freq,
+            )
         elif self.filter_type in BaseButterworthFilter.ALLOWED_TWO_SIDE_FILTER_TYPES:
             center_mel = np.random.uniform(
                 low=convert_frequency_to_mel(self.min_center_freq),
                 high=convert_frequency_to_mel(self.max_center_freq),
             )
-            self.parameters["center_freq"] = convert_mel_to_frequency(center_mel)
+            self.parameters["center_freq"] = snap_to_octave_grid(
+                convert_mel_to_frequency(center_mel),
+                self.grid_steps_per_octave,
+                self.min_center_freq,
+                self.max_center_freq,
+            )
 
-            bandwidth_fraction = np.random.uniform(
-                low=self.min_bandwidth_fraction, high=self.max_bandwidth_fraction
+            bandwidth_fraction = snap_to_octave_grid(
+                np.random.uniform(
+                    low=self.min_bandwidth_fraction, high=self.max_bandwidth_fraction
+                ),
+                self.grid_steps_per_octave,
+                self.min_bandwidth_fraction,
+                self.max_bandwidth_fraction,
             )
             self.parameters["bandwidth"] = (
                 self.parameters["center_freq"] * bandwidth_fraction
             )
 
-    def apply(self, samples: np.array, sample_rate: int = None):
-        assert samples.dtype == np.float32
+    def get_sos(self, sample_rate: int, parameters: dict = None) -> np.ndarray:
+        """
+        Return the filter coefficients in `sos` format for the given parameters. The current
+        parameters are used by default.
+        """
+        if parameters is None:
+            parameters = self.parameters
 
+        order = parameters["rolloff"] // (12 if self.zero_phase else 6)
+        nyquist_freq = sample_rate // 2
         if self.filter_type in BaseButterworthFilter.ALLOWED_ONE_SIDE_FILTER_TYPES:
-            cutoff_freq = self.parameters["cutoff_freq"]
-            nyquist_freq = sample_rate // 2
+            cutoff_freq = parameters["cutoff_freq"]
             if cutoff_freq > nyquist_freq:
                 # Ensure that the cutoff frequency does not exceed the nyquist
                 # frequency to avoid an exception from scipy
                 cutoff_freq = nyquist_freq * 0.9999
-            sos = butter(
-                self.parameters["rolloff"] // (12 if self.zero_phase else 6),
-                cutoff_freq,
-                btype=self.filter_type,
-                analog=False,
-                fs=sample_rate,
-                output="sos",
-            )
+            critical_freqs = (cutoff_freq,)
         elif self.filter_type in BaseButterworthFilter.ALLOWED_TWO_SIDE_FILTER_TYPES:
-            low_freq = self.parameters["center_freq"] - self.parameters["bandwidth"] / 2
-            high_freq = (
-                self.parameters["center_freq"] + self.parameters["bandwidth"] / 2
-            )
-            nyquist_freq = sample_rate // 2
+            low_freq = parameters["center_freq"] - parameters["bandwidth"] / 2
+            high_freq = parameters["center_freq"] + parameters["bandwidth"] / 2
             if high_freq > nyquist_freq:
                 # Ensure that the upper critical frequency does not exceed the nyquist
                 # frequency to avoid an exception from scipy
                 high_freq = nyquist_freq * 0.9999
-            sos = butter(
-                self.parameters["rolloff"] // (12 if self.zero_phase else 6),
-                [low_freq, high_freq],
-                btype=self.filter_type,
-                analog=False,
-                fs=sample_rate,
-                output="sos",
+            critical_freqs = (low_freq, high_freq)
+
+        return get_cached_sos(
+            self.filter_type,
+            order,
+            critical_freqs,
+            sample_rate,
+            partial(self._design_sos, order, sample_rate),
+        )
+
+    def _design_sos(self, order: int, sample_rate: int, *critical_freqs) -> np.ndarray:
+        return butter(
+            order,
+            critical_freqs[0] if len(critical_freqs) == 1 else list(critical_freqs),
+            btype=self.filter_type,
+            analog=False,
+            fs=sample_rate,
+            output="sos",
+        )
+
+    def apply(self, samples: np.array, sample_rate: int = None):
+        assert samples.dtype == np.float32
+
+        # All channels are filtered in one call
+        return apply_sos_filter(
+            self.get_sos(sample_rate), samples, zero_phase=self.zero_phase
+        )
+
+    def apply_vectorized_batch(self, samples: np.array, sample_rate: int = None):
+        assert samples.dtype == np.float32
+
+        if self.are_parameters_frozen:
+            # All items share the same filter, so the whole batch is filtered in one call
+            return apply_sos_filter(
+                self.get_sos(sample_rate), samples, zero_phase=self.zero_phase
             )
 
-        # The actual processing takes place here
-        if len(samples.shape) == 1:
-            if self.zero_phase:
-                processed_samples = sosfiltfilt(sos, samples)
-            else:
-                processed_samples, _ = sosfilt(
-                    sos, samples, zi=sosfilt_zi(sos) * samples[0]
-                )
-            processed_samples = processed_samples.astype(np.float32)
-        else:
-            processed_samples = np.zeros_like(samples, dtype=np.float32)
-            if self.zero_phase:
-                for chn_idx in range(samples.shape[0]):
-                    processed_samples[chn_idx, :] = sosfiltfilt(
-                        sos, samples[chn_idx, :]
-                    )
-            else:
-                zi = sosfilt_zi(sos)
-                for chn_idx in range(samples.shape[0]):
-                    processed_samples[chn_idx, :], _ = sosfilt(
-                        sos, samples[chn_idx, :], zi=zi * samples[chn_idx, 0]
-                    )
-
-        return processed_samples
+        # Items with the same design are filtered together
+        return apply_sos_filter_to_batch(
+            lambda parameters: self.get_sos(sample_rate, parameters),
+            samples,
+            self.batch_parameters,
+            zero_phase=self.zero_phase,
+        )
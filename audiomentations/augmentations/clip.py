@@ -21,6 +21,7 @@ class Clip(BaseWaveformTransform):
     """
 
     supports_multichannel = True
+    supports_vectorized_batch = True
 
     def __init__(self, a_min=-1.0, a_max=1.0, p=0.5):
         """
@@ -35,3 +36,11 @@ class Clip(BaseWaveformTransform):
 
     def apply(self, samples, sample_rate):
         return np.clip(samples, self.a_min, self.a_max)
+
+    def apply_vectorized_batch(self, samples, sample_rate):
+        should_apply = self.get_batch_should_apply_mask()
+        processed_samples = samples.copy()
+        processed_samples[should_apply] = np.clip(
+            samples[should_apply], self.a_min, self.a_max
+        )
+        return processed_samples
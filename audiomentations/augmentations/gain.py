@@ -17,6 +17,7 @@ class Gain(BaseWaveformTransform):
     """
 
     supports_multichannel = True
+    supports_vectorized_batch = True
 
     def __init__(
         self,
@@ -43,3 +44,9 @@ class Gain(BaseWaveformTransform):
 
     def apply(self, samples, sample_rate):
         return samples * self.parameters["amplitude_ratio"]
+
+    def apply_vectorized_batch(self, samples, sample_rate):
+        amplitude_ratios = self.get_batch_parameter(
+            "amplitude_ratio", fill_value=1.0, ndim=samples.ndim
+        )
+        return samples * amplitude_ratios
@@ -4,6 +4,7 @@ import sys
 
 import numpy as np
 
+from audiomentations.core.dynamics import limit
 from audiomentations.core.transforms_interface import BaseWaveformTransform
 from audiomentations.core.utils import convert_decibels_to_amplitude_ratio
 
@@ -25,6 +26,7 @@ class Limiter(BaseWaveformTransform):
         min_release: float = 0.05,
         max_release: float = 0.7,
         threshold_mode: str = "relative_to_signal_peak",
+        backend: str = "native",
         p: float = 0.5,
     ):
         """
@@ -42,6 +44,9 @@ class Limiter(BaseWaveformTransform):
             "relative_to_signal_peak" means the threshold is relative to peak of the signal.
             "absolute" means the threshold is relative to 0 dBFS, so it doesn't depend
             on the peak of the signal.
+        :param backend: "native" or "cylimiter". The native backend is compiled with
+            Numba, processes all channels in one call and gives the same output as
+            cylimiter. The cylimiter backend needs the optional cylimiter dependency.
         :param p: The probability of applying this transform
         """
         super().__init__(p)
@@ -62,6 +67,7 @@ class Limiter(BaseWaveformTransform):
             "relative_to_signal_peak",
             "absolute",
         ), 'threshold_mode must be either "relative_to_signal_peak" or "absolute"'
+        assert backend in ("native", "cylimiter")
         self.min_threshold_db = min_threshold_db
         self.max_threshold_db = max_threshold_db
         self.min_attack = min_attack
@@ -69,6 +75,7 @@ class Limiter(BaseWaveformTransform):
         self.min_release = min_release
         self.max_release = max_release
         self.threshold_mode = threshold_mode
+        self.backend = backend
 
     @staticmethod
     def convert_time_to_coefficient(
@@ -108,6 +115,15 @@ class Limiter(BaseWaveformTransform):
             ] = threshold_factor * convert_decibels_to_amplitude_ratio(threshold_db)
 
     def apply(self, samples, sample_rate):
+        if self.backend == "native":
+            return limit(
+                samples,
+                attack=self.parameters["attack"],
+                release=self.parameters["release"],
+                delay=self.parameters["delay"],
+                threshold=self.parameters["threshold"],
+            )
+
         try:
             from cylimiter import Limiter as CyLimiter
         except ImportError:
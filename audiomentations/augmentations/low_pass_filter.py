@@ -1,3 +1,5 @@
+from typing import Optional
+
 from audiomentations.augmentations.base_butterword_filter import BaseButterworthFilter
 
 
@@ -16,6 +18,7 @@ class LowPassFilter(BaseButterworthFilter):
         min_rolloff: int = 12,
         max_rolloff: int = 24,
         zero_phase: bool = False,
+        grid_steps_per_octave: Optional[int] = None,
         p: float = 0.5,
     ):
         """
@@ -32,6 +35,11 @@ class LowPassFilter(BaseButterworthFilter):
             it is 2 times slower than in the non-zero phase case. If you
             absolutely want no phase distortions (e.g. want to augment a
             drum track), set this to `true`.
+        :param grid_steps_per_octave: If set, the randomized frequencies (and bandwidth
+            fractions) are snapped to a logarithmic grid with this many points per octave,
+            e.g. 48. Then the filter designs can often be reused from the shared design
+            cache (see `audiomentations.core.filtering.SOS_DESIGN_CACHE`) instead of being
+            recomputed. By default, the frequencies are not snapped.
         :param p: The probability of applying this transform
         """
         super().__init__(
@@ -40,6 +48,7 @@ class LowPassFilter(BaseButterworthFilter):
             min_rolloff=min_rolloff,
             max_rolloff=max_rolloff,
             zero_phase=zero_phase,
+            grid_steps_per_octave=grid_steps_per_octave,
             p=p,
             filter_type="lowpass",
         )
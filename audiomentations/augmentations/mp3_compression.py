@@ -1,12 +1,15 @@
-import os
+import io
 import random
-import tempfile
-import uuid
+import sys
 
-import librosa
 import numpy as np
-import sys
 
+from audiomentations.core.codecs import (
+    align_codec_output,
+    apply_mp3_codec,
+    decode_mp3,
+    get_mp3_delay,
+)
 from audiomentations.core.transforms_interface import BaseWaveformTransform
 from audiomentations.core.utils import (
     convert_float_samples_to_int16,
@@ -21,11 +24,11 @@ class Mp3Compression(BaseWaveformTransform):
 
     Note that bitrates below 32 kbps are only supported for low sample rates (up to 24000 hz).
 
-    Note: When using the lameenc backend, the output may be slightly longer than the input due
-    to the fact that the LAME encoder inserts some silence at the beginning of the audio.
+    The LAME encoder inserts some silence at the beginning of the audio. When using the
+    lameenc backend, this delay is removed, so the output has the same length as the input.
 
-    Warning: This transform writes to disk, so it may be slow. Ideally, the work should be done
-    in memory. Contributions are welcome.
+    The lameenc backend encodes and decodes in memory. The pydub backend lets pydub run
+    ffmpeg, which uses temporary files, but decodes the result in memory.
     """
 
     supports_multichannel = True
@@ -63,7 +66,9 @@ class Mp3Compression(BaseWaveformTransform):
                 Cons: Slower than lameenc.
             lameenc:
                 Pros: You can set the quality parameter in addition to bitrate.
-                Cons: Seems to introduce some silence at the start of the audio.
+                Cons: Introduces some silence at the start of the audio, which gets removed
+                    again (the delay is measured once per bitrate, sample rate and
+                    number of channels).
         :param p: The probability of applying this transform
         """
         super().__init__(p)
@@ -94,53 +99,13 @@ class Mp3Compression(BaseWaveformTransform):
             raise Exception("Backend {} not recognized".format(self.backend))
 
     def apply_lameenc(self, samples, sample_rate):
-        try:
-            import lameenc
-        except ImportError:
-            print(
-                "Failed to import the lame encoder. Maybe it is not installed? "
-                "To install the optional lameenc dependency of audiomentations,"
-                " do `pip install audiomentations[extras]` or simply"
-                " `pip install lameenc`",
-                file=sys.stderr,
-            )
-            raise
-
         assert samples.dtype == np.float32
 
-        int_samples = convert_float_samples_to_int16(samples).T
-
+        bitrate = self.parameters["bitrate"]
         num_channels = 1 if samples.ndim == 1 else samples.shape[0]
-
-        encoder = lameenc.Encoder()
-        encoder.set_bit_rate(self.parameters["bitrate"])
-        encoder.set_in_sample_rate(sample_rate)
-        encoder.set_channels(num_channels)
-        encoder.set_quality(7)  # 2 = highest, 7 = fastest
-        encoder.silence()
-
-        mp3_data = encoder.encode(int_samples.tobytes())
-        mp3_data += encoder.flush()
-
-        # Write a temporary MP3 file that will then be decoded
-        tmp_dir = tempfile.gettempdir()
-        tmp_file_path = os.path.join(
-            tmp_dir, "tmp_compressed_{}.mp3".format(str(uuid.uuid4())[0:12])
-        )
-        with open(tmp_file_path, "wb") as f:
-            f.write(mp3_data)
-
-        degraded_samples, _ = librosa.load(tmp_file_path, sr=sample_rate, mono=False)
-
-        os.unlink(tmp_file_path)
-
-        if num_channels == 1:
-            if int_samples.ndim == 1 and degraded_samples.ndim == 2:
-                degraded_samples = degraded_samples.flatten()
-            elif int_samples.ndim == 2 and degraded_samples.ndim == 1:
-                degraded_samples = degraded_samples.reshape((1, -1))
-
-        return degraded_samples
+        degraded_samples = apply_mp3_codec(samples, sample_rate, bitrate)
+        delay = get_mp3_delay(bitrate, sample_rate, num_channels)
+        return align_codec_output(degraded_samples, delay, samples.shape[-1])
 
     def apply_pydub(self, samples, sample_rate):
         try:
@@ -166,23 +131,10 @@ class Mp3Compression(BaseWaveformTransform):
             channels=num_channels,
         )
 
-        tmp_dir = tempfile.gettempdir()
-        tmp_file_path = os.path.join(
-            tmp_dir, "tmp_compressed_{}.mp3".format(str(uuid.uuid4())[0:12])
-        )
-
         bitrate_string = "{}k".format(self.parameters["bitrate"])
-        file_handle = audio_segment.export(tmp_file_path, bitrate=bitrate_string)
-        file_handle.close()
-
-        degraded_samples, _ = librosa.load(tmp_file_path, sr=sample_rate, mono=False)
-
-        os.unlink(tmp_file_path)
-
-        if num_channels == 1:
-            if int_samples.ndim == 1 and degraded_samples.ndim == 2:
-                degraded_samples = degraded_samples.flatten()
-            elif int_samples.ndim == 2 and degraded_samples.ndim == 1:
-                degraded_samples = degraded_samples.reshape((1, -1))
+        mp3_file = audio_segment.export(
+            io.BytesIO(), format="mp3", bitrate=bitrate_string
+        )
+        degraded_samples = decode_mp3(mp3_file, sample_rate, num_channels)
 
-        return degraded_samples
+        return degraded_samples[0] if samples.ndim == 1 else degraded_samples
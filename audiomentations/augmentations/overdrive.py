@@ -1,17 +1,17 @@
 import random
+import sys
 
 import numpy as np
-import torch
-import torchaudio
 
+from audiomentations.core.distortion import overdrive
 from audiomentations.core.transforms_interface import BaseWaveformTransform
 
 
 class Overdrive(BaseWaveformTransform):
     """
-    Apply a constant amount of gain, so that highest signal level present in the sound becomes
-    0 dBFS, i.e. the loudest level allowed if all samples must be between -1 and 1. Also known
-    as peak normalization.
+    Apply a non-linear overdrive distortion, like sox's overdrive effect. The gain controls
+    how much the signal gets boosted into the soft clipper, and the colour controls the
+    amount of even harmonics in the output.
     """
 
     supports_multichannel = True
@@ -21,7 +21,22 @@ class Overdrive(BaseWaveformTransform):
                  max_gain=60,
                  min_colour=0,
                  max_colour=100,
+                 backend="native",
                  p=0.5):
+        """
+        :param min_gain: Minimum gain in dB
+        :param max_gain: Maximum gain in dB
+        :param min_colour: Minimum colour
+        :param max_colour: Maximum colour
+        :param backend: "native" or "torchaudio". "native" runs a Numba kernel
+            (audiomentations.core.distortion.overdrive) with the same soft clipper, DC
+            blocking filter and final clamp as torchaudio.functional.overdrive, all in
+            float32 like torchaudio, so the output is bit-identical. The kernel
+            processes the channels one after another and releases the GIL, so threads
+            can process several sounds at once. "torchaudio" converts the audio to a
+            torch tensor and needs torch and torchaudio.
+        :param p: The probability of applying this transform
+        """
         super().__init__(p)
         self.min_gain = min_gain
         self.max_gain = max_gain
@@ -29,6 +44,8 @@ class Overdrive(BaseWaveformTransform):
         self.max_colour = max_colour
         assert self.min_gain <= self.max_gain
         assert self.min_colour <= self.max_colour
+        assert backend in ("native", "torchaudio")
+        self.backend = backend
 
     def randomize_parameters(self, samples, sample_rate):
         super().randomize_parameters(samples, sample_rate)
@@ -37,6 +54,30 @@ class Overdrive(BaseWaveformTransform):
             self.parameters['colour'] = random.randint(self.min_colour, self.max_colour)
 
     def apply(self, samples, sample_rate):
+        if self.backend == "native":
+            distorted_samples = overdrive(
+                samples, gain=self.parameters['gain'], colour=self.parameters['colour']
+            )
+        else:
+            distorted_samples = self.apply_torchaudio(samples)
+
+        assert distorted_samples.shape == samples.shape
+
+        return distorted_samples
+
+    def apply_torchaudio(self, samples):
+        try:
+            import torch
+            import torchaudio
+        except ImportError:
+            print(
+                "Failed to import torchaudio. Maybe it is not installed? "
+                "To use the torchaudio backend of Overdrive,"
+                " run `pip install torchaudio`",
+                file=sys.stderr,
+            )
+            raise
+
         samples_torch = torch.tensor(samples.astype(np.float32))
 
         if len(samples.shape) == 1:
@@ -51,8 +92,4 @@ class Overdrive(BaseWaveformTransform):
         if len(samples.shape) == 1:
             distorted_samples = distorted_samples[0]
 
-        distorted_samples = distorted_samples.numpy()
-
-        assert distorted_samples.shape == samples.shape
-
-        return distorted_samples
\ No newline at end of file
+        return distorted_samples.numpy()
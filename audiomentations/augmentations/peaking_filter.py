@@ -1,8 +1,15 @@
 import random
+from functools import partial
 
 import numpy as np
-from scipy.signal import sosfilt, sosfilt_zi
 
+from audiomentations.core.filtering import (
+    apply_sos_filter,
+    apply_sos_filter_to_batch,
+    get_cached_sos,
+    snap_gain_db_to_octave_grid,
+    snap_to_octave_grid,
+)
 from audiomentations.core.transforms_interface import BaseWaveformTransform
 from audiomentations.core.utils import (
     convert_frequency_to_mel,
@@ -19,6 +26,8 @@ class PeakingFilter(BaseWaveformTransform):
     """
 
     supports_multichannel = True
+    supports_vectorized_batch = True
+    supports_sos_fusion = True
 
     def __init__(
         self,
@@ -28,6 +37,7 @@ class PeakingFilter(BaseWaveformTransform):
         max_gain_db=24,
         min_q=0.5,
         max_q=5.0,
+        grid_steps_per_octave=None,
         p=0.5,
     ):
         """
@@ -39,6 +49,12 @@ class PeakingFilter(BaseWaveformTransform):
             transition band will be.
         :param max_q: The maximum quality factor Q. The higher the Q, the steeper the
             transition band will be.
+        :param grid_steps_per_octave: If set, the randomized center frequency and Q factor
+            are snapped to a logarithmic grid with this many points per octave, e.g. 48, and
+            the gain is snapped to steps of 6.02 / grid_steps_per_octave dB. Then the filter
+            designs can be reused from the shared design cache (see
+            `audiomentations.core.filtering.SOS_DESIGN_CACHE`) more often. By default, the
+            parameters are not snapped.
         """
 
         assert (
@@ -62,6 +78,9 @@ class PeakingFilter(BaseWaveformTransform):
         self.min_q = min_q
         self.max_q = max_q
 
+        assert grid_steps_per_octave is None or grid_steps_per_octave > 0
+        self.grid_steps_per_octave = grid_steps_per_octave
+
     def _get_biquad_coefficients_from_input_parameters(
         self, center_freq, gain_db, q_factor, sample_rate
     ):
@@ -89,30 +108,58 @@ class PeakingFilter(BaseWaveformTransform):
             low=convert_frequency_to_mel(self.min_center_freq),
             high=convert_frequency_to_mel(self.max_center_freq),
         )
-        self.parameters["center_freq"] = convert_mel_to_frequency(center_mel)
-        self.parameters["gain_db"] = random.uniform(self.min_gain_db, self.max_gain_db)
-        self.parameters["q_factor"] = random.uniform(self.min_q, self.max_q)
+        self.parameters["center_freq"] = snap_to_octave_grid(
+            convert_mel_to_frequency(center_mel),
+            self.grid_steps_per_octave,
+            self.min_center_freq,
+            self.max_center_freq,
+        )
+        self.parameters["gain_db"] = snap_gain_db_to_octave_grid(
+            random.uniform(self.min_gain_db, self.max_gain_db),
+            self.grid_steps_per_octave,
+            self.min_gain_db,
+            self.max_gain_db,
+        )
+        self.parameters["q_factor"] = snap_to_octave_grid(
+            random.uniform(self.min_q, self.max_q),
+            self.grid_steps_per_octave,
+            self.min_q,
+            self.max_q,
+        )
 
-    def apply(self, samples, sample_rate):
-        assert samples.dtype == np.float32
+    def get_sos(self, sample_rate: int, parameters: dict = None) -> np.ndarray:
+        """
+        Return the filter coefficients in `sos` format for the given parameters. The current
+        parameters are used by default.
+        """
+        if parameters is None:
+            parameters = self.parameters
 
-        sos = self._get_biquad_coefficients_from_input_parameters(
-            self.parameters["center_freq"],
-            self.parameters["gain_db"],
-            self.parameters["q_factor"],
+        return get_cached_sos(
+            "peaking",
+            2,
+            (parameters["center_freq"], parameters["gain_db"], parameters["q_factor"]),
             sample_rate,
+            partial(
+                self._get_biquad_coefficients_from_input_parameters,
+                sample_rate=sample_rate,
+            ),
         )
 
-        # The processing takes place here
-        zi = sosfilt_zi(sos)
-        if len(samples.shape) == 1:
-            processed_samples, _ = sosfilt(sos, samples, zi=zi * samples[0])
-            processed_samples = processed_samples.astype(np.float32)
-        else:
-            processed_samples = np.zeros_like(samples, dtype=np.float32)
-            for chn_idx in range(samples.shape[0]):
-                processed_samples[chn_idx, :], _ = sosfilt(
-                    sos, samples[chn_idx, :], zi=zi * samples[chn_idx, 0]
-                )
-
-        return processed_samples
+    def apply(self, samples, sample_rate):
+        assert samples.dtype == np.float32
+
+        # All channels are filtered in one call
+        return apply_sos_filter(self.get_sos(sample_rate), samples)
+
+    def apply_vectorized_batch(self, samples, sample_rate):
+        if self.are_parameters_frozen:
+            # All items share the same filter, so the whole batch is filtered in one call
+            return apply_sos_filter(self.get_sos(sample_rate), samples)
+
+        # Items with the same design are filtered together
+        return apply_sos_filter_to_batch(
+            lambda parameters: self.get_sos(sample_rate, parameters),
+            samples,
+            self.batch_parameters,
+        )
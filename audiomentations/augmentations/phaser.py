@@ -1,5 +1,6 @@
 import random
 
+from audiomentations.core.modulation import phaser
 from audiomentations.core.utils import apply_ffmpeg_commands
 from audiomentations.core.transforms_interface import BaseWaveformTransform
 
@@ -12,7 +13,16 @@ class Phaser(BaseWaveformTransform):
                  min_speed=0.1,
                  max_speed=2,
                  modulation_types=['sinusoidal', 'triangular'],
+                 backend="native",
                  p=0.5):
+        """
+        :param backend: "native" or "ffmpeg". "native" runs a Numba port of ffmpeg's
+            aphaser filter in the current process (audiomentations.core.modulation
+            .phaser): a feedback delay line whose delay follows a sine or triangle LFO,
+            rounded to whole samples like in ffmpeg, so the output is the same as
+            ffmpeg's for float32 input. "ffmpeg" runs aphaser in the ffmpeg executable,
+            which must be installed and on the PATH.
+        """
         super().__init__(p)
         self.min_gain = min_gain
         self.max_gain = max_gain
@@ -23,6 +33,8 @@ class Phaser(BaseWaveformTransform):
         assert self.min_speed <= self.max_speed
         for mt in self.modulation_types:
             assert mt in ['sinusoidal', 'triangular']
+        assert backend in ("native", "ffmpeg")
+        self.backend = backend
 
     def randomize_parameters(self, samples, sample_rate):
         super().randomize_parameters(samples, sample_rate)
@@ -39,6 +51,15 @@ class Phaser(BaseWaveformTransform):
 
             
     def apply(self, samples, sample_rate):
+        if self.backend == "native":
+            return phaser(
+                samples,
+                sample_rate,
+                out_gain=self.parameters['gain'],
+                speed=self.parameters['speed'],
+                wave_type=self.parameters['modulation_type'],
+            )
+
         ffmpeg_command = "aphaser=out_gain={}:speed={}:type={}".format(
             self.parameters['gain'],
             self.parameters['speed'],
@@ -1,3 +1,5 @@
+import numpy as np
+
 from audiomentations.core.transforms_interface import BaseWaveformTransform
 
 
@@ -13,6 +15,7 @@ class PolarityInversion(BaseWaveformTransform):
     """
 
     supports_multichannel = True
+    supports_vectorized_batch = True
 
     def __init__(self, p=0.5):
         """
@@ -25,3 +28,7 @@ class PolarityInversion(BaseWaveformTransform):
 
     def apply(self, samples, sample_rate):
         return -samples
+
+    def apply_vectorized_batch(self, samples, sample_rate):
+        signs = np.where(self.get_batch_should_apply_mask(), -1.0, 1.0).astype(np.float32)
+        return samples * signs.reshape((-1,) + (1,) * (samples.ndim - 1))
@@ -1,13 +1,43 @@
+import functools
+import json
 import random
+import warnings
 from typing import Optional, Dict
 
 import numpy as np
 import sys
-from scipy.signal import convolve
+from scipy.signal import oaconvolve
 
+from audiomentations.core.image_source import generate_shoebox_rirs, inverse_sabine
+from audiomentations.core.rir_bank import RIRBank
 from audiomentations.core.transforms_interface import BaseWaveformTransform
 
 
+def _import_pyroomacoustics():
+    try:
+        import pyroomacoustics as pra
+    except ImportError:
+        print(
+            "Failed to import pyroomacoustics. Maybe it is not installed? "
+            "To install the optional pyroomacoustics dependency of audiomentations,"
+            " do `pip install audiomentations[extras]` or simply "
+            " `pip install pyroomacoustics`",
+            file=sys.stderr,
+        )
+        raise
+    return pra
+
+
+# The image source order of pyroomacoustics rooms, when max_order is not set
+DEFAULT_MAX_ORDER = 1
+
+
+def _generate_rir_bank_entry(room_simulator, sample_rate, seed):
+    random.seed(seed)
+    np.random.seed(seed % 2**32)
+    return room_simulator.generate_rir(sample_rate)
+
+
 class RoomSimulator(BaseWaveformTransform):
     """
     A ShoeBox Room Simulator. Simulates a cuboid of parametrized size and 
@@ -30,6 +60,16 @@ class RoomSimulator(BaseWaveformTransform):
 
     > augment = RoomSimulator(min_mic_radius=1.0, max_min_radius=1.0, min_mic_elevation=0.0, max_mic_elevation=0.0)
     Augment with a RIR captured by all positions of the microphone on a circle, centred around the source at 1m    
+
+    > augment = RoomSimulator(rir_bank_path="/data/rir_bank_16k", rir_bank_size=2000)
+    > augment.build_rir_bank(sample_rate=16000)
+    Simulate 2000 rooms once (in parallel), store their RIRs on disk and draw from them
+    afterwards instead of simulating a new room for every sound. Transforms with the same
+    rir_bank_path (e.g. in DataLoader workers) load the stored bank.
+
+    > augment = RoomSimulator(backend="native", use_ray_tracing=False, max_order=10)
+    Simulate the rooms with the image source method of audiomentations, which is faster
+    and does not need pyroomacoustics
     """
 
     supports_multichannel = True
@@ -65,6 +105,11 @@ class RoomSimulator(BaseWaveformTransform):
         padding: float = 0.1,
         p: float = 0.5,
         ray_tracing_options: Dict or None = None,
+        rir_bank_path: Optional[str] = None,
+        rir_bank_size: int = 1000,
+        rir_bank_num_workers: Optional[int] = None,
+        rir_bank_refresh_fraction: float = 0.0,
+        backend: str = "pyroomacoustics",
     ):
         """
 
@@ -115,7 +160,7 @@ class RoomSimulator(BaseWaveformTransform):
             Disable this if you need speed but do not really care for incorrect results.
         :param max_order: Maximum order of reflections for the Image Source Model. E.g. a value of
             1 will only add first order reflections while a value of 30 will add a
-            diffuse reverberation tail.
+            diffuse reverberation tail. Defaults to 1 (the default of pyroomacoustics).
         :param leave_length_unchanged: When set to True, the tail of the sound (e.g. reverb at
             the end) will be chopped off so that the length of the output is equal to the
             length of the input.
@@ -123,6 +168,23 @@ class RoomSimulator(BaseWaveformTransform):
         :param p: The probability of applying this transform
         :param ray_tracing_options: Options for the ray tracer. See `set_ray_tracing` here:
             https://github.com/LCAV/pyroomacoustics/blob/master/pyroomacoustics/room.py
+        :param rir_bank_path: If set, RIRs are drawn from a precomputed bank in this folder
+            instead of simulating a room for every sound. The bank has to be generated
+            beforehand with `build_rir_bank` (e.g. in the main process, before starting
+            DataLoader workers). Otherwise, applying the transform raises a
+            FileNotFoundError. In this mode, `self.room` is not set.
+        :param rir_bank_size: The number of RIRs in a generated bank
+        :param rir_bank_num_workers: The number of processes that generate the bank.
+            Defaults to the number of CPUs.
+        :param rir_bank_refresh_fraction: If larger than 0, a background thread keeps
+            replacing up to this fraction of the bank (in memory) with newly simulated
+            rooms, to increase the diversity
+        :param backend: "pyroomacoustics" or "native". The native backend computes the
+            RIRs of shoebox rooms with a vectorized image source method
+            (`audiomentations.core.image_source`) instead of building pyroomacoustics
+            rooms. It gives the same RIRs (within float32 precision), is much faster and
+            does not need pyroomacoustics, but it does not support ray tracing, so it
+            requires `use_ray_tracing=False`. In this mode, `self.room` is not set.
         """
         super().__init__(p)
 
@@ -189,168 +251,316 @@ class RoomSimulator(BaseWaveformTransform):
         else:
             self.ray_tracing_options = ray_tracing_options
 
-    def randomize_parameters(self, samples: np.array, sample_rate: int):
-
-        try:
-            import pyroomacoustics as pra
-        except ImportError:
-            print(
-                "Failed to import pyroomacoustics. Maybe it is not installed? "
-                "To install the optional pyroomacoustics dependency of audiomentations,"
-                " do `pip install audiomentations[extras]` or simply "
-                " `pip install pyroomacoustics`",
-                file=sys.stderr,
+        assert backend in ("pyroomacoustics", "native")
+        assert not (
+            backend == "native" and use_ray_tracing
+        ), "The native backend does not support ray tracing. Set use_ray_tracing=False."
+        self.backend = backend
+
+        assert rir_bank_size >= 1
+        assert 0.0 <= rir_bank_refresh_fraction <= 1.0
+        self.rir_bank_path = None if rir_bank_path is None else str(rir_bank_path)
+        self.rir_bank_size = rir_bank_size
+        self.rir_bank_num_workers = rir_bank_num_workers
+        self.rir_bank_refresh_fraction = rir_bank_refresh_fraction
+        self.rir_bank = None
+        self.room = None
+        self.rir = None
+
+    def get_generator_settings(self) -> Dict:
+        """Return the settings that determine the distribution of the simulated rooms"""
+        return {
+            key: value
+            for key, value in self.__dict__.items()
+            if (key.startswith("min_") or key.startswith("max_"))
+            or key
+            in (
+                "calculation_mode",
+                "use_ray_tracing",
+                "padding",
+                "ray_tracing_options",
             )
-            raise
+        }
 
-        super().randomize_parameters(samples, sample_rate)
-        self.parameters["size_x"] = random.uniform(self.min_size_x, self.max_size_x)
-        self.parameters["size_y"] = random.uniform(self.min_size_y, self.max_size_y)
-        self.parameters["size_z"] = random.uniform(self.min_size_z, self.max_size_z)
+    def sample_room_parameters(self) -> Dict:
+        """Draw random room, source and microphone parameters"""
+        parameters = {}
+        parameters["size_x"] = random.uniform(self.min_size_x, self.max_size_x)
+        parameters["size_y"] = random.uniform(self.min_size_y, self.max_size_y)
+        parameters["size_z"] = random.uniform(self.min_size_z, self.max_size_z)
 
         room_dim = np.array(
             [
-                self.parameters["size_x"],
-                self.parameters["size_y"],
-                self.parameters["size_z"],
+                parameters["size_x"],
+                parameters["size_y"],
+                parameters["size_z"],
             ]
         )
 
-        self.parameters["max_order"] = self.max_order
+        parameters["max_order"] = self.max_order
 
         if self.calculation_mode == "rt60":
             target_rt60 = random.uniform(self.min_target_rt60, self.max_target_rt60)
-            self.parameters["target_rt60"] = target_rt60
+            parameters["target_rt60"] = target_rt60
 
             # If we are in rt60 mode, estimate the absorption coefficient on a desired target
             # rt60 value.
-            self.parameters["absorption_coefficient"], max_order = pra.inverse_sabine(
-                self.parameters["target_rt60"], room_dim
+            parameters["absorption_coefficient"], max_order = inverse_sabine(
+                parameters["target_rt60"], room_dim
             )
 
             # Prioritise manually set `max_order` if it is set, over the one
             # calculated by the inverse sabine formula.
             if not self.max_order:
-                self.parameters["max_order"] = max_order
+                parameters["max_order"] = max_order
         else:
-            self.parameters["absorption_coefficient"] = random.uniform(
+            parameters["absorption_coefficient"] = random.uniform(
                 self.min_absorption_value, self.max_absorption_value
             )
 
-        self.parameters["source_x"] = random.uniform(
+        parameters["source_x"] = random.uniform(
             max(self.min_source_x, self.padding),
-            min(self.max_source_x, self.parameters["size_x"] - self.padding),
+            min(self.max_source_x, parameters["size_x"] - self.padding),
         )
-        self.parameters["source_y"] = random.uniform(
+        parameters["source_y"] = random.uniform(
             max(self.min_source_y, self.padding),
-            min(self.max_source_y, self.parameters["size_y"] - self.padding),
+            min(self.max_source_y, parameters["size_y"] - self.padding),
         )
-        self.parameters["source_z"] = random.uniform(
+        parameters["source_z"] = random.uniform(
             max(self.min_source_z, self.padding),
-            min(self.max_source_z, self.parameters["size_z"] - self.padding),
+            min(self.max_source_z, parameters["size_z"] - self.padding),
         )
 
-        self.parameters["mic_radius"] = random.uniform(
+        parameters["mic_radius"] = random.uniform(
             self.min_mic_distance, self.max_mic_distance
         )
-        self.parameters["mic_azimuth"] = random.uniform(
+        parameters["mic_azimuth"] = random.uniform(
             self.min_mic_azimuth, self.max_mic_azimuth
         )
-        self.parameters["mic_elevation"] = random.uniform(
+        parameters["mic_elevation"] = random.uniform(
             self.min_mic_elevation, self.max_mic_elevation
         )
 
         # Convert to cartesian coordinates according to ADM
-        mic_x = self.parameters["source_x"] - self.parameters["mic_radius"] * np.cos(
-            self.parameters["mic_elevation"]
-        ) * np.sin(self.parameters["mic_azimuth"])
-        mic_y = self.parameters["source_y"] + self.parameters["mic_radius"] * np.cos(
-            self.parameters["mic_elevation"]
-        ) * np.cos(self.parameters["mic_azimuth"])
-        mic_z = self.parameters["source_z"] + self.parameters["mic_radius"] * np.sin(
-            self.parameters["mic_elevation"]
+        mic_x = parameters["source_x"] - parameters["mic_radius"] * np.cos(
+            parameters["mic_elevation"]
+        ) * np.sin(parameters["mic_azimuth"])
+        mic_y = parameters["source_y"] + parameters["mic_radius"] * np.cos(
+            parameters["mic_elevation"]
+        ) * np.cos(parameters["mic_azimuth"])
+        mic_z = parameters["source_z"] + parameters["mic_radius"] * np.sin(
+            parameters["mic_elevation"]
         )
 
         # Clamp between 0 and room dimensions
-        self.parameters["mic_x"] = max(
-            self.padding, min(self.parameters["size_x"] - self.padding, mic_x)
+        parameters["mic_x"] = max(
+            self.padding, min(parameters["size_x"] - self.padding, mic_x)
         )
-        self.parameters["mic_y"] = max(
-            self.padding, min(self.parameters["size_y"] - self.padding, mic_y)
+        parameters["mic_y"] = max(
+            self.padding, min(parameters["size_y"] - self.padding, mic_y)
         )
-        self.parameters["mic_z"] = max(
-            self.padding, min(self.parameters["size_z"] - self.padding, mic_z)
+        parameters["mic_z"] = max(
+            self.padding, min(parameters["size_z"] - self.padding, mic_z)
         )
+        return parameters
 
-        # Construct room
-        self.room = pra.Room.from_corners(
+    def create_room(self, parameters: Dict, sample_rate: int, samples=None):
+        """
+        Construct the pyroomacoustics room, with the source and the microphone, for the
+        given parameters
+        """
+        pra = _import_pyroomacoustics()
+
+        room = pra.Room.from_corners(
             np.array(
                 [
                     [0, 0],
-                    [0, self.parameters["size_y"]],
-                    [self.parameters["size_x"], self.parameters["size_y"]],
-                    [self.parameters["size_x"], 0],
+                    [0, parameters["size_y"]],
+                    [parameters["size_x"], parameters["size_y"]],
+                    [parameters["size_x"], 0],
                 ]
             ).T,
             fs=sample_rate,
-            materials=pra.Material(self.parameters["absorption_coefficient"]),
+            max_order=self.get_image_source_max_order(),
+            materials=pra.Material(parameters["absorption_coefficient"]),
             ray_tracing=self.use_ray_tracing,
             air_absorption=True,
         )
 
         if self.use_ray_tracing:
             # TODO: Somehow make those parameters
-            self.room.set_ray_tracing(**self.ray_tracing_options)
+            room.set_ray_tracing(**self.ray_tracing_options)
 
-        self.room.extrude(
-            height=self.parameters["size_z"],
-            materials=pra.Material(self.parameters["absorption_coefficient"]),
+        room.extrude(
+            height=parameters["size_z"],
+            materials=pra.Material(parameters["absorption_coefficient"]),
         )
 
         # Add the point source
-        self.room.add_source(
+        room.add_source(
             np.array(
                 [
-                    self.parameters["source_x"],
-                    self.parameters["source_y"],
-                    self.parameters["source_z"],
+                    parameters["source_x"],
+                    parameters["source_y"],
+                    parameters["source_z"],
                 ]
             ),
             signal=samples,
         )
 
         # Add the microphone
-        self.room.add_microphone_array(
+        room.add_microphone_array(
             pra.MicrophoneArray(
                 np.array(
                     [
                         [
-                            self.parameters["mic_x"],
-                            self.parameters["mic_y"],
-                            self.parameters["mic_z"],
+                            parameters["mic_x"],
+                            parameters["mic_y"],
+                            parameters["mic_z"],
                         ]
                     ]
                 ).T,
-                self.room.fs,
+                room.fs,
             )
         )
+        return room
+
+    def get_image_source_max_order(self) -> int:
+        return DEFAULT_MAX_ORDER if self.max_order is None else self.max_order
+
+    def compute_native_rirs(self, parameters_list, sample_rate: int):
+        """
+        Compute the room impulse responses for a batch of room parameters (see
+        `sample_room_parameters`) with the native image source method, and return them
+        as a list of float32 arrays
+        """
+        return generate_shoebox_rirs(
+            room_sizes=[
+                [p["size_x"], p["size_y"], p["size_z"]] for p in parameters_list
+            ],
+            source_positions=[
+                [p["source_x"], p["source_y"], p["source_z"]] for p in parameters_list
+            ],
+            mic_positions=[[p["mic_x"], p["mic_y"], p["mic_z"]] for p in parameters_list],
+            absorption_coefficients=[
+                p["absorption_coefficient"] for p in parameters_list
+            ],
+            max_order=self.get_image_source_max_order(),
+            sample_rate=sample_rate,
+        )
+
+    def generate_rirs(self, sample_rate: int, num_rirs: int):
+        """
+        Simulate num_rirs random rooms and return a list with the parameters and the room
+        impulse response of each room. The native backend simulates all rooms at once.
+        """
+        parameters_list = [self.sample_room_parameters() for _ in range(num_rirs)]
+        if self.backend == "native":
+            rirs = self.compute_native_rirs(parameters_list, sample_rate)
+        else:
+            rirs = []
+            for parameters in parameters_list:
+                room = self.create_room(parameters, sample_rate)
+                room.compute_rir()
+                rirs.append(np.asarray(room.rir[0][0], dtype=np.float32))
+        return list(zip(parameters_list, rirs))
+
+    def generate_rir(self, sample_rate: int):
+        """
+        Simulate a random room and return its parameters and its room impulse response
+        """
+        return self.generate_rirs(sample_rate, 1)[0]
+
+    def build_rir_bank(self, sample_rate: int) -> RIRBank:
+        """
+        Generate a bank of `rir_bank_size` RIRs with the settings of this transform and
+        store it in `rir_bank_path`, replacing an existing bank
+        """
+        assert self.rir_bank_path is not None
+        self.rir_bank = RIRBank.build(
+            self.rir_bank_path,
+            self._get_rir_bank_entry_generator(sample_rate),
+            num_rirs=self.rir_bank_size,
+            sample_rate=sample_rate,
+            metadata=self.get_generator_settings(),
+            num_workers=self.rir_bank_num_workers,
+            refresh_fraction=self.rir_bank_refresh_fraction,
+        )
+        return self.rir_bank
+
+    def get_rir_bank(self, sample_rate: int) -> RIRBank:
+        """Return the RIR bank, after loading it if necessary"""
+        if self.rir_bank is None:
+            if not RIRBank.exists(self.rir_bank_path):
+                # Generating the bank here would start a process pool in the middle of
+                # data loading, which fails in daemonic processes like DataLoader workers
+                raise FileNotFoundError(
+                    "There is no RIR bank in {}. Generate it with"
+                    " RoomSimulator.build_rir_bank(sample_rate) before applying the"
+                    " transform.".format(self.rir_bank_path)
+                )
+            self.rir_bank = RIRBank(
+                self.rir_bank_path,
+                generate_entry=self._get_rir_bank_entry_generator(sample_rate),
+                refresh_fraction=self.rir_bank_refresh_fraction,
+            )
+            settings = json.loads(json.dumps(self.get_generator_settings()))
+            if self.rir_bank.metadata != settings:
+                warnings.warn(
+                    "The RIR bank in {} was generated with different settings than the"
+                    " ones of this RoomSimulator".format(self.rir_bank_path)
+                )
+        if self.rir_bank.sample_rate != sample_rate:
+            raise ValueError(
+                "The RIR bank in {} has a sample rate of {} Hz, but the audio has a sample"
+                " rate of {} Hz".format(
+                    self.rir_bank_path, self.rir_bank.sample_rate, sample_rate
+                )
+            )
+        return self.rir_bank
+
+    def _get_rir_bank_entry_generator(self, sample_rate: int):
+        # A copy without the bank and the room, so it can be sent to worker processes
+        generator = self.__class__.__new__(self.__class__)
+        generator.__dict__.update(self.__dict__)
+        generator.rir_bank = None
+        generator.room = None
+        generator.rir = None
+        generator.parameters = {}
+        return functools.partial(_generate_rir_bank_entry, generator, sample_rate)
+
+    def randomize_parameters(self, samples: np.array, sample_rate: int):
+        super().randomize_parameters(samples, sample_rate)
+        if not self.parameters["should_apply"]:
+            return
+
+        if self.rir_bank_path is not None:
+            index, parameters, self.rir = self.get_rir_bank(sample_rate).sample()
+            self.parameters.update(parameters)
+            self.parameters["rir_bank_index"] = index
+            self.room = None
+            return
+
+        self.parameters.update(self.sample_room_parameters())
+        if self.backend == "native":
+            self.room = None
+            self.rir = self.compute_native_rirs([self.parameters], sample_rate)[0]
+            return
+
+        self.room = self.create_room(self.parameters, sample_rate, samples)
         # Do the simulation
         self.room.compute_rir()
+        self.rir = self.room.rir[0][0]
 
     def apply(self, samples, sample_rate):
         assert samples.dtype == np.float32
 
-        rir = self.room.rir[0][0]
+        rir = np.asarray(self.rir, dtype=np.float32)
 
-        # This is the same as ApplyImpulseResponse transform
-        if samples.ndim > 1:
-            signal_ir = []
-            for i in range(samples.shape[0]):
-                channel_conv = convolve(samples[i], rir)
-                signal_ir.append(channel_conv)
-            signal_ir = np.array(signal_ir, dtype=samples.dtype)
-        else:
-            signal_ir = convolve(samples, rir).astype(samples.dtype)
+        # All channels are convolved with the RIR in one call
+        signal_ir = oaconvolve(
+            samples, rir if samples.ndim == 1 else rir[np.newaxis, :], axes=-1
+        ).astype(np.float32, copy=False)
 
         if self.leave_length_unchanged:
             signal_ir = signal_ir[..., : samples.shape[-1]]
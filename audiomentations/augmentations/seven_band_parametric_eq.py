@@ -1,4 +1,7 @@
+import numpy as np
+
 from audiomentations import LowShelfFilter, PeakingFilter, HighShelfFilter
+from audiomentations.core.filtering import apply_sos_filter
 from audiomentations.core.transforms_interface import BaseWaveformTransform
 
 
@@ -104,9 +107,17 @@ class SevenBandParametricEQ(BaseWaveformTransform):
             self.peaking_filters[i].randomize_parameters(samples, sample_rate)
         self.high_shelf_filter.randomize_parameters(samples, sample_rate)
 
+    def get_sos(self, sample_rate: int) -> np.ndarray:
+        """
+        Return the coefficients of all seven bands as one cascade of second-order
+        sections in `sos` format, with shape (7, 6)
+        """
+        return np.concatenate(
+            [self.low_shelf_filter.get_sos(sample_rate)]
+            + [peaking_filter.get_sos(sample_rate) for peaking_filter in self.peaking_filters]
+            + [self.high_shelf_filter.get_sos(sample_rate)]
+        )
+
     def apply(self, samples, sample_rate):
-        samples = self.low_shelf_filter(samples, sample_rate)
-        for i in range(len(self.peaking_filters)):
-            samples = self.peaking_filters[i](samples, sample_rate)
-        samples = self.high_shelf_filter(samples, sample_rate)
-        return samples
+        # The bands are applied as one cascade in a single pass over the samples
+        return apply_sos_filter(self.get_sos(sample_rate), samples)
@@ -12,6 +12,7 @@ class TimeMask(BaseWaveformTransform):
     """
 
     supports_multichannel = True
+    supports_vectorized_batch = True
 
     def __init__(self, min_band_part=0.0, max_band_part=0.5, fade=False, p=0.5):
         """
@@ -45,14 +46,31 @@ class TimeMask(BaseWaveformTransform):
                 0, num_samples - self.parameters["t"]
             )
 
+    def get_mask(self, t: int, sample_rate: int) -> np.ndarray:
+        mask = np.zeros(t)
+        if self.fade:
+            fade_length = min(int(sample_rate * 0.01), int(t * 0.1))
+            # A silent part shorter than 10 samples gets no fade, since mask[-0:] would
+            # address the whole mask
+            if fade_length > 0:
+                mask[0:fade_length] = np.linspace(1, 0, num=fade_length)
+                mask[-fade_length:] = np.linspace(0, 1, num=fade_length)
+        return mask
+
     def apply(self, samples, sample_rate):
         new_samples = samples.copy()
         t = self.parameters["t"]
         t0 = self.parameters["t0"]
-        mask = np.zeros(t)
-        if self.fade:
-            fade_length = min(int(sample_rate * 0.01), int(t * 0.1))
-            mask[0:fade_length] = np.linspace(1, 0, num=fade_length)
-            mask[-fade_length:] = np.linspace(0, 1, num=fade_length)
-        new_samples[..., t0 : t0 + t] *= mask
+        new_samples[..., t0 : t0 + t] *= self.get_mask(t, sample_rate)
         return new_samples
+
+    def apply_vectorized_batch(self, samples, sample_rate):
+        gains = np.ones((samples.shape[0], samples.shape[-1]), dtype=np.float32)
+        for i, parameters in enumerate(self.batch_parameters):
+            if parameters["should_apply"]:
+                t = parameters["t"]
+                t0 = parameters["t0"]
+                gains[i, t0 : t0 + t] = self.get_mask(t, sample_rate)
+        if samples.ndim == 3:
+            gains = gains[:, np.newaxis, :]
+        return samples * gains
@@ -1,17 +1,33 @@
 import random
 
+import numpy as np
+
+from audiomentations.core.modulation import get_tremolo_gain, tremolo
 from audiomentations.core.transforms_interface import BaseWaveformTransform
 from audiomentations.core.utils import apply_ffmpeg_commands
 
 class Tremolo(BaseWaveformTransform):
     supports_multichannel = True
+    supports_vectorized_batch = True
+
+    # ffmpeg's tremolo filter doesn't accept lower frequencies
+    MIN_FREQUENCY = 0.1
 
     def __init__(self,
                  min_f=-.1,
                  max_f=10,
                  min_d=0.3,
                  max_d=1,
+                 backend="native",
                  p=0.5):
+        """
+        :param backend: "native" or "ffmpeg". "native" multiplies the audio in the
+            current process with the sine gain curve of ffmpeg's tremolo filter
+            (audiomentations.core.modulation.tremolo), computed in double precision like
+            in ffmpeg, so the output is the same as ffmpeg's for float32 input. It also
+            processes a whole batch at once in apply_batch. "ffmpeg" runs tremolo in the
+            ffmpeg executable, which must be installed and on the PATH.
+        """
         super().__init__(p)
         self.min_f = min_f
         self.max_f = max_f
@@ -19,12 +35,16 @@ class Tremolo(BaseWaveformTransform):
         self.max_d = max_d
         assert self.min_f <= self.max_f
         assert self.min_d <= self.max_d
+        assert backend in ("native", "ffmpeg")
+        self.backend = backend
+        # Only the native backend can process a whole batch at once
+        self.supports_vectorized_batch = backend == "native"
 
     def randomize_parameters(self, samples, sample_rate):
         super().randomize_parameters(samples, sample_rate)
         if self.parameters["should_apply"]:
-            self.parameters['f'] = random.uniform(
-                self.min_f, self.max_f
+            self.parameters['f'] = max(
+                random.uniform(self.min_f, self.max_f), self.MIN_FREQUENCY
             )
             
             self.parameters['d'] = random.uniform(
@@ -32,7 +52,11 @@ class Tremolo(BaseWaveformTransform):
             )
 
     def apply(self, samples, sample_rate):
-        
+        if self.backend == "native":
+            return tremolo(
+                samples, sample_rate, self.parameters['f'], self.parameters['d']
+            )
+
         # Ref: https://ffmpeg.org/ffmpeg-all.html#tremolo
         ffmpeg_command = f"tremolo=f={self.parameters['f']}:d={self.parameters['d']}"
 
@@ -40,4 +64,15 @@ class Tremolo(BaseWaveformTransform):
 
         assert compressed.shape == samples.shape
         
-        return compressed
\ No newline at end of file
+        return compressed
+
+    def apply_vectorized_batch(self, samples, sample_rate):
+        gains = np.ones((samples.shape[0], samples.shape[-1]))
+        for i, parameters in enumerate(self.batch_parameters):
+            if parameters["should_apply"]:
+                gains[i] = get_tremolo_gain(
+                    samples.shape[-1], sample_rate, parameters['f'], parameters['d']
+                )
+        if samples.ndim == 3:
+            gains = gains[:, np.newaxis, :]
+        return (samples * gains).astype(np.float32)
@@ -0,0 +1,168 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from audiomentations.core.audio_loading_utils import load_sound_file
+from audiomentations.core.cache import LRUCache, get_sound_file_cache_key
+from audiomentations.core.shared_audio_cache import SharedAudioCache
+
+DEFAULT_MAX_BYTES = 256 * 1024**2
+SUPPORTED_DTYPES = ("float32", "float16", "int16")
+INT16_SCALE = 32767.0
+
+
+def compact_samples(samples: np.ndarray, dtype: str) -> np.ndarray:
+    """
+    Convert float samples to the given dtype for storage. int16 values are scaled by 32767,
+    and values outside [-1, 1] are clipped.
+    """
+    if dtype == "int16":
+        return np.round(np.clip(samples, -1.0, 1.0) * INT16_SCALE).astype(np.int16)
+    return np.asarray(samples, dtype=dtype)
+
+
+def expand_samples(samples: np.ndarray) -> np.ndarray:
+    """Convert stored samples (see compact_samples) back to float32"""
+    if samples.dtype == np.int16:
+        return samples.astype(np.float32) / np.float32(INT16_SCALE)
+    if samples.dtype == np.float16:
+        return samples.astype(np.float32)
+    return samples
+
+
+class AudioCache:
+    """
+    A cache of decoded sound files that is bounded by the total number of bytes of the
+    cached sounds, for the transforms that load sound files (AddBackgroundNoise,
+    AddShortNoises and ApplyImpulseResponse), which take it with their cache parameter. One
+    cache can be shared by several transforms. Sounds that are larger than the whole budget
+    are not cached.
+
+    The sounds can be stored as float16 or int16 to fit twice as many in the budget. They
+    are converted back to float32 when they are loaded from the cache.
+
+    By default, the sounds are held in the memory of the process (in an LRUCache). With
+    shared=True, they are stored in a SharedAudioCache instead, which is shared by all
+    processes on the machine, e.g. all DataLoader workers.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        dtype: str = "float32",
+        shared: bool = False,
+        directory: Optional[str] = None,
+        max_entries: Optional[int] = None,
+    ):
+        """
+        :param max_bytes: The maximum total size of the cached sounds in bytes (after the
+            conversion to dtype)
+        :param dtype: "float32", "float16" or "int16". The dtype that the sounds are stored
+            in. int16 clips values outside [-1, 1].
+        :param shared: If True, the sounds are stored in a SharedAudioCache, which is shared
+            by all processes on the machine
+        :param directory: The directory of the SharedAudioCache, if shared is True
+        :param max_entries: The maximum number of cached sounds, in addition to max_bytes.
+            None means no limit. Only supported if shared is False.
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(
+                "dtype must be one of {}, got {!r}".format(SUPPORTED_DTYPES, dtype)
+            )
+        assert not shared or max_entries is None
+        self.dtype = dtype
+        self.shared = shared
+        if shared:
+            self.storage = SharedAudioCache(max_bytes=max_bytes, directory=directory)
+        else:
+            self.storage = LRUCache(max_bytes=max_bytes, max_entries=max_entries)
+
+    def load(
+        self,
+        file_path,
+        sample_rate: int,
+        mono: bool = True,
+        start_index: int = 0,
+        end_index: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Return the sound of the file at the given sample rate as float32 samples, like
+        load_sound_file, and load and cache it if it is not cached. The returned array must
+        not be modified.
+
+        :param start_index: The first sample of the part of the sound that gets returned
+        :param end_index: The end (exclusive) of the part of the sound that gets returned.
+            Defaults to the end of the sound. Only this part gets converted to float32 if
+            the cache stores another dtype.
+        """
+        samples = self.storage.get_or_compute(
+            get_sound_file_cache_key(file_path, sample_rate, mono),
+            lambda: compact_samples(
+                load_sound_file(file_path, sample_rate, mono=mono)[0], self.dtype
+            ),
+        )
+        return expand_samples(samples[..., start_index:end_index])
+
+    def contains(self, file_path, sample_rate: int, mono: bool = True) -> bool:
+        return get_sound_file_cache_key(file_path, sample_rate, mono) in self.storage
+
+    def warm(
+        self,
+        file_paths: Iterable,
+        sample_rate: int,
+        mono: bool = True,
+        num_workers: Optional[int] = None,
+    ):
+        """
+        Load the given files into the cache, with a pool of threads, e.g. before training,
+        so the first epoch does not have to decode them
+
+        :param num_workers: The number of threads. Defaults to the number of CPUs.
+        """
+        file_paths = list(file_paths)
+        num_workers = max(1, min(num_workers or os.cpu_count() or 1, len(file_paths)))
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            for _ in executor.map(
+                lambda file_path: self.load(file_path, sample_rate, mono), file_paths
+            ):
+                pass
+
+    def clear(self):
+        self.storage.clear()
+
+    @property
+    def hits(self) -> int:
+        return self.storage.hits
+
+    @property
+    def misses(self) -> int:
+        return self.storage.misses
+
+    @property
+    def evictions(self) -> int:
+        return self.storage.evictions
+
+    @property
+    def current_bytes(self) -> int:
+        return self.storage.current_bytes
+
+    @property
+    def max_bytes(self) -> int:
+        return self.storage.max_bytes
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """The number of hits, misses and evictions, the number of cached sounds and bytes"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "num_entries": len(self),
+            "current_bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def __len__(self):
+        return len(self.storage)
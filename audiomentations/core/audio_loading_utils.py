@@ -1,10 +1,150 @@
+import math
 import warnings
+from typing import Optional
 
 import librosa
 import numpy as np
+import soundfile
 
+# When only a part of a file is loaded and resampled, this many zero crossings of the
+# resampling filter (resampy's kaiser_best filter has 64) are decoded on both sides of the
+# part, so the result is the same as if the whole file had been resampled
+RESAMPLE_MARGIN_ZERO_CROSSINGS = 128
 
-def load_sound_file(file_path, sample_rate, mono=True, resample_type="auto"):
+# Seeking is not sample-accurate in these libsndfile subtypes (e.g. seeking in Ogg Vorbis
+# files with libsndfile 1.2 may land dozens of samples off), so they are decoded from the
+# start of the file, and the frames before the requested part are discarded
+INACCURATE_SEEK_SUBTYPES = ("VORBIS", "MPEG_LAYER_I", "MPEG_LAYER_II", "MPEG_LAYER_III")
+SKIP_BLOCK_SIZE = 65536
+
+
+def get_num_frames(file_path, sample_rate: Optional[int] = None) -> Optional[int]:
+    """
+    Return the number of frames (samples per channel) that load_sound_file returns for the
+    given file, by reading the header of the file only. Return None if the file can't be
+    opened with soundfile (e.g. some compressed formats that are decoded with audioread),
+    in which case the length is only known after decoding the file.
+
+    :param file_path: str or Path instance that points to a sound file
+    :param sample_rate: If not None, the number of frames after resampling to this rate
+    """
+    try:
+        info = soundfile.info(str(file_path))
+    except RuntimeError:
+        return None
+    if sample_rate is None or info.samplerate == sample_rate:
+        return info.frames
+    return int(np.ceil(info.frames * float(sample_rate) / info.samplerate))
+
+
+def seeks_accurately(file_path) -> bool:
+    """
+    Return True if a part of the given file can be read with a sample-accurate seek, i.e.
+    without decoding the file from its start (see INACCURATE_SEEK_SUBTYPES). Return False
+    if the file can't be opened with soundfile.
+    """
+    try:
+        info = soundfile.info(str(file_path))
+    except RuntimeError:
+        return False
+    return info.subtype not in INACCURATE_SEEK_SUBTYPES
+
+
+def _read_frames(file_path, file_sample_rate, start, stop, mono):
+    """
+    Read the frames [start, stop) of the file (at its own sample rate) with a seek in
+    libsndfile (if seeking is accurate in the format of the file), or, if soundfile can't
+    open the file, with audioread (via librosa). Return the samples with shape
+    (num_channels, num_frames).
+    """
+    try:
+        with soundfile.SoundFile(file_path) as sound_file:
+            start = min(start, sound_file.frames)
+            stop = sound_file.frames if stop is None else min(stop, sound_file.frames)
+            if sound_file.subtype in INACCURATE_SEEK_SUBTYPES:
+                for block_start in range(0, start, SKIP_BLOCK_SIZE):
+                    sound_file.read(
+                        min(SKIP_BLOCK_SIZE, start - block_start), dtype="float32"
+                    )
+            else:
+                sound_file.seek(start)
+            samples = sound_file.read(
+                max(0, stop - start), dtype="float32", always_2d=True
+            ).T
+    except RuntimeError:
+        samples, _ = librosa.load(
+            file_path,
+            sr=None,
+            mono=False,
+            offset=start / file_sample_rate,
+            duration=None if stop is None else (stop - start) / file_sample_rate,
+            dtype=np.float32,
+        )
+        samples = samples.reshape((-1, samples.shape[-1]))
+
+    if mono:
+        samples = np.mean(samples, axis=0, keepdims=True)
+    return samples
+
+
+def _load_sound_file_part(
+    file_path, sample_rate, mono, resample_type, offset, num_frames
+):
+    """
+    Load the frames [offset, offset + num_frames) (at the output sample rate) of the file,
+    and return them with shape (num_channels, num_frames), together with the sample rate
+    """
+    assert offset >= 0
+    assert num_frames is None or num_frames >= 0
+
+    file_sample_rate = librosa.get_samplerate(file_path)
+    if sample_rate is None or sample_rate == file_sample_rate:
+        stop = None if num_frames is None else offset + num_frames
+        samples = _read_frames(file_path, file_sample_rate, offset, stop, mono)
+        return samples, file_sample_rate
+
+    # Read the corresponding part of the file with a margin for the resampling filter on
+    # both sides. The start is aligned so that it maps to a whole output frame.
+    gcd = math.gcd(file_sample_rate, sample_rate)
+    input_step, output_step = file_sample_rate // gcd, sample_rate // gcd
+    margin = math.ceil(
+        RESAMPLE_MARGIN_ZERO_CROSSINGS * max(1.0, file_sample_rate / sample_rate)
+    )
+    start_step = max(0, (offset * input_step // output_step - margin) // input_step)
+    if num_frames is None:
+        stop = None
+    else:
+        stop = math.ceil((offset + num_frames) * file_sample_rate / sample_rate) + margin
+    samples = _read_frames(
+        file_path, file_sample_rate, start_step * input_step, stop, mono
+    )
+
+    if resample_type == "auto":
+        resample_type = "kaiser_fast" if file_sample_rate < sample_rate else "kaiser_best"
+    samples = librosa.resample(
+        samples,
+        orig_sr=file_sample_rate,
+        target_sr=sample_rate,
+        res_type=resample_type,
+    )
+    warnings.warn(
+        "{} had to be resampled from {} hz to {} hz. This hurt execution time.".format(
+            str(file_path), file_sample_rate, sample_rate
+        )
+    )
+    output_start = offset - start_step * output_step
+    output_stop = None if num_frames is None else output_start + num_frames
+    return samples[:, output_start:output_stop], sample_rate
+
+
+def load_sound_file(
+    file_path,
+    sample_rate,
+    mono=True,
+    resample_type="auto",
+    offset: int = 0,
+    num_frames: Optional[int] = None,
+):
     """
     Load an audio file as a floating point time series. Audio will be automatically
     resampled to the given sample rate.
@@ -14,8 +154,23 @@ def load_sound_file(file_path, sample_rate, mono=True, resample_type="auto"):
     :param mono: If True, mix any multichannel data down to mono, and return a 1D array
     :param resample_type: "auto" means use "kaiser_fast" when upsampling and "kaiser_best" when
         downsampling
+    :param offset: The index of the first frame to load, at the output sample rate
+    :param num_frames: The number of frames to load, at the output sample rate. None means
+        until the end of the file. If offset or num_frames are given, only the requested
+        part of the file (plus a small margin for the resampling filter) gets decoded and
+        resampled, with a seek in libsndfile if possible, and audioread as a fallback. The
+        result is the same as loading the whole file and slicing it, up to float rounding
+        errors (with the kaiser resampling filters).
     """
     file_path = str(file_path)
+    if offset != 0 or num_frames is not None:
+        samples, actual_sample_rate = _load_sound_file_part(
+            file_path, sample_rate, mono, resample_type, offset, num_frames
+        )
+        if samples.shape[0] == 1:
+            samples = samples[0]
+        return samples, actual_sample_rate
+
     samples, actual_sample_rate = librosa.load(
         str(file_path), sr=None, mono=mono, dtype=np.float32
     )
@@ -0,0 +1,108 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+
+def get_nbytes(value) -> int:
+    """Return the number of bytes of a numpy array, or of a tuple/list of numpy arrays"""
+    if isinstance(value, (tuple, list)):
+        return sum(get_nbytes(v) for v in value)
+    return getattr(value, "nbytes", 0)
+
+
+def get_sound_file_cache_key(file_path, sample_rate, mono: bool = True) -> Tuple:
+    """
+    Return the cache key of a sound file that is loaded with load_sound_file: the path, the
+    sample rate and the channel layout, plus the modification time and the size of the
+    file, so that a file that has changed is loaded again
+    """
+    stat = os.stat(file_path)
+    return (
+        str(file_path),
+        sample_rate,
+        "mono" if mono else "multichannel",
+        stat.st_mtime_ns,
+        stat.st_size,
+    )
+
+
+class LRUCache:
+    """
+    A thread-safe least-recently-used cache whose size is bounded by the total number of
+    bytes of the cached values (numpy arrays, or tuples of numpy arrays). When a new value
+    does not fit, the least recently used values are evicted. A value that is larger than
+    the whole budget is not cached at all. Optionally, the number of entries is bounded too.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: Optional[int] = None):
+        """
+        :param max_bytes: The maximum total size of the cached values in bytes
+        :param max_entries: The maximum number of cached values. None means no limit.
+        """
+        assert max_bytes >= 0
+        assert max_entries is None or max_entries >= 0
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value):
+        nbytes = get_nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            if nbytes > self.max_bytes or self.max_entries == 0:
+                return
+            while self.current_bytes + nbytes > self.max_bytes or (
+                self.max_entries is not None and len(self._entries) >= self.max_entries
+            ):
+                _, (_, evicted_nbytes) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_nbytes
+                self.evictions += 1
+            self._entries[key] = (value, nbytes)
+            self.current_bytes += nbytes
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], object]):
+        """
+        Return the cached value for the key. If there is none, compute it, cache it and
+        return it. The value is computed outside the lock, so two threads may compute the
+        same value at the same time.
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __getstate__(self):
+        # The cached values are not pickled, e.g. when the cache is sent to a worker process
+        return {"max_bytes": self.max_bytes, "max_entries": self.max_entries}
+
+    def __setstate__(self, state):
+        self.__init__(state["max_bytes"], state.get("max_entries"))
@@ -0,0 +1,252 @@
+"""
+In-memory codec round-trips. The audio gets encoded to and decoded from a memory buffer,
+so no temporary files, subprocesses or tensor conversions are involved.
+"""
+import functools
+import io
+import sys
+import threading
+from typing import Callable, Hashable
+
+import librosa
+import numpy as np
+import soundfile
+
+from audiomentations.core.utils import convert_float_samples_to_int16, find_time_shift
+
+# The sample rates that libsndfile's Opus encoder supports
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+_thread_local = threading.local()
+
+_codec_delays = {}
+_codec_delays_lock = threading.Lock()
+
+
+def get_codec_buffer() -> io.BytesIO:
+    """
+    Return the empty memory buffer of the current thread. The buffer is reused by all
+    codec round-trips in the thread, so its memory only needs to be allocated once.
+    """
+    buffer = getattr(_thread_local, "buffer", None)
+    if buffer is None:
+        buffer = _thread_local.buffer = io.BytesIO()
+    buffer.seek(0)
+    buffer.truncate()
+    return buffer
+
+
+def apply_soundfile_codec(
+    samples: np.ndarray,
+    sample_rate: int,
+    format: str,
+    subtype: str,
+    compression_level: float = None,
+) -> np.ndarray:
+    """
+    Encode the audio with libsndfile (through soundfile) into memory, decode it again and
+    return the decoded float32 samples with the same shape as the input.
+
+    :param samples: float32 array with shape (num_samples,) or (num_channels, num_samples)
+    :param sample_rate: The sample rate of the audio
+    :param format: A soundfile format, e.g. "OGG"
+    :param subtype: A soundfile subtype, e.g. "VORBIS" or "OPUS"
+    :param compression_level: Between 0 (highest quality) and 1 (highest compression).
+        None means the default of the codec.
+    """
+    buffer = get_codec_buffer()
+    soundfile.write(
+        buffer,
+        samples.T,
+        sample_rate,
+        format=format,
+        subtype=subtype,
+        compression_level=compression_level,
+    )
+    buffer.seek(0)
+    decoded_samples, _ = soundfile.read(buffer, dtype="float32", always_2d=True)
+    decoded_samples = decoded_samples.T
+    if samples.ndim == 1:
+        decoded_samples = decoded_samples[0]
+
+    return align_codec_output(decoded_samples, 0, samples.shape[-1])
+
+
+def encode_mp3(
+    samples: np.ndarray, sample_rate: int, bitrate: int, quality: int = 7
+) -> bytes:
+    """
+    Encode the audio to MP3 with LAME (through lameenc) and return the MP3 data
+
+    :param samples: float32 array with shape (num_samples,) or (num_channels, num_samples)
+    :param sample_rate: The sample rate of the audio
+    :param bitrate: The bitrate in kbps
+    :param quality: The LAME quality setting. 2 is the highest and 7 the fastest.
+    """
+    try:
+        import lameenc
+    except ImportError:
+        print(
+            "Failed to import the lame encoder. Maybe it is not installed? "
+            "To install the optional lameenc dependency of audiomentations,"
+            " do `pip install audiomentations[extras]` or simply"
+            " `pip install lameenc`",
+            file=sys.stderr,
+        )
+        raise
+
+    num_channels = 1 if samples.ndim == 1 else samples.shape[0]
+    if num_channels > 2:
+        raise ValueError("MP3 supports at most two channels")
+
+    int_samples = convert_float_samples_to_int16(samples).T
+
+    # A LAME encoder can't be used again after it has been flushed, so each sound gets
+    # a new one
+    encoder = lameenc.Encoder()
+    encoder.set_bit_rate(bitrate)
+    encoder.set_in_sample_rate(sample_rate)
+    encoder.set_channels(num_channels)
+    encoder.set_quality(quality)
+    encoder.silence()
+
+    mp3_data = encoder.encode(np.ascontiguousarray(int_samples).tobytes())
+    mp3_data += encoder.flush()
+    return bytes(mp3_data)
+
+
+def decode_mp3(mp3_data, sample_rate: int, num_channels: int = None) -> np.ndarray:
+    """
+    Decode MP3 data in memory with libsndfile (through soundfile) and return float32
+    samples with shape (num_channels, num_samples). The encoder may have lowered the
+    sample rate, so the decoded audio gets resampled to the given sample rate if needed.
+
+    :param mp3_data: The MP3 data, as a bytes-like object or a readable file-like object
+    :param sample_rate: The desired sample rate of the decoded audio
+    :param num_channels: The desired number of channels. A mono input that the decoder
+        returns as stereo (or vice versa) gets converted. None means no conversion.
+    """
+    if not hasattr(mp3_data, "read"):
+        mp3_data = io.BytesIO(mp3_data)
+    decoded_samples, decoded_sample_rate = soundfile.read(
+        mp3_data, dtype="float32", always_2d=True
+    )
+    decoded_samples = np.ascontiguousarray(decoded_samples.T)
+
+    if decoded_sample_rate != sample_rate:
+        decoded_samples = librosa.core.resample(
+            decoded_samples, orig_sr=decoded_sample_rate, target_sr=sample_rate
+        )
+
+    if num_channels is not None and decoded_samples.shape[0] != num_channels:
+        if num_channels == 1:
+            decoded_samples = np.mean(decoded_samples, axis=0, keepdims=True)
+        else:
+            decoded_samples = np.repeat(decoded_samples[:1], num_channels, axis=0)
+    return decoded_samples.astype(np.float32)
+
+
+def apply_mp3_codec(
+    samples: np.ndarray, sample_rate: int, bitrate: int, quality: int = 7
+) -> np.ndarray:
+    """
+    Encode the audio to MP3 and decode it again, all in memory. The decoded audio has the
+    same number of dimensions and channels as the input, but it is longer, because the
+    encoder adds some silence at the start and pads the end to a full frame.
+
+    :param samples: float32 array with shape (num_samples,) or (num_channels, num_samples)
+    :param sample_rate: The sample rate of the audio
+    :param bitrate: The bitrate in kbps
+    :param quality: The LAME quality setting. 2 is the highest and 7 the fastest.
+    """
+    num_channels = 1 if samples.ndim == 1 else samples.shape[0]
+    mp3_data = encode_mp3(samples, sample_rate, bitrate, quality)
+    decoded_samples = decode_mp3(mp3_data, sample_rate, num_channels)
+    return decoded_samples[0] if samples.ndim == 1 else decoded_samples
+
+
+@functools.lru_cache(maxsize=16)
+def get_delay_probe_signal(sample_rate: int) -> np.ndarray:
+    """
+    Return a (cached, read-only) half second of noise that is band-limited to 1 kHz (or a
+    quarter of the sample rate). Every codec keeps this band, even at the lowest bitrates,
+    so the delay can be measured reliably with it.
+    """
+    from scipy.signal import butter, sosfilt
+
+    rng = np.random.default_rng(0)
+    probe = rng.standard_normal(sample_rate // 2)
+    sos = butter(8, min(1000, sample_rate / 4), fs=sample_rate, output="sos")
+    probe = sosfilt(sos, probe)
+    probe = (0.3 * probe / np.amax(np.abs(probe))).astype(np.float32)
+    probe.flags.writeable = False
+    return probe
+
+
+def get_codec_delay(
+    key: Hashable,
+    sample_rate: int,
+    apply_codec: Callable[[np.ndarray, int], np.ndarray],
+) -> int:
+    """
+    Return the number of samples by which the output of a codec round-trip lags behind
+    its input. The delay only depends on the codec and its settings, so it is measured
+    once per key (e.g. ("mp3", bitrate, sample_rate)) with a probe signal and cached.
+
+    :param key: A hashable identifier of the codec and all the settings that may affect
+        the delay, including the sample rate and the number of channels
+    :param sample_rate: The sample rate of the audio
+    :param apply_codec: A function that takes mono float32 samples and the sample rate
+        and returns the decoded samples of one channel
+    """
+    with _codec_delays_lock:
+        delay = _codec_delays.get(key)
+    if delay is None:
+        probe = get_delay_probe_signal(sample_rate)
+        decoded_probe = apply_codec(np.array(probe), sample_rate)
+        delay = max(0, find_time_shift(decoded_probe, probe, max_shift=None))
+        with _codec_delays_lock:
+            _codec_delays[key] = delay
+    return delay
+
+
+def get_mp3_delay(bitrate: int, sample_rate: int, num_channels: int = 1) -> int:
+    """
+    Return the (cached) delay of apply_mp3_codec for the given settings. The number of
+    channels matters, because LAME may choose a lower sample rate for stereo audio.
+    """
+
+    def apply_codec(probe, sr):
+        if num_channels == 1:
+            return apply_mp3_codec(probe, sr, bitrate)
+        return apply_mp3_codec(np.tile(probe, (num_channels, 1)), sr, bitrate)[0]
+
+    return get_codec_delay(
+        ("mp3", bitrate, sample_rate, num_channels), sample_rate, apply_codec
+    )
+
+
+def clear_codec_delay_cache():
+    """Forget all measured codec delays"""
+    with _codec_delays_lock:
+        _codec_delays.clear()
+
+
+def align_codec_output(
+    decoded_samples: np.ndarray, delay: int, num_samples: int
+) -> np.ndarray:
+    """
+    Remove the delay from the start of decoded audio and trim it (or pad it with zeros)
+    to the given number of samples
+
+    :param decoded_samples: Array with shape (num_samples,) or (num_channels, num_samples)
+    :param delay: The delay in samples
+    :param num_samples: The desired number of samples, usually the length of the input
+        of the codec
+    """
+    aligned_samples = decoded_samples[..., delay : delay + num_samples]
+    if aligned_samples.shape[-1] < num_samples:
+        padding = [(0, 0)] * (aligned_samples.ndim - 1)
+        padding.append((0, num_samples - aligned_samples.shape[-1]))
+        aligned_samples = np.pad(aligned_samples, padding)
+    return np.ascontiguousarray(aligned_samples)
@@ -1,5 +1,8 @@
 import random
 
+import numpy as np
+
+from audiomentations.core.filtering import apply_sos_filter
 from audiomentations.core.transforms_interface import BaseSpectrogramTransform
 from audiomentations.core.utils import weights_to_probabilities
 
@@ -31,6 +34,26 @@ class BaseCompose:
             for transform in self.transforms:
                 transform.randomize_parameters(*args, **kwargs)
 
+    @staticmethod
+    def apply_batch_to_subset(transform, samples, item_mask, sample_rate):
+        """
+        Apply the given transform (or composition) to the items in the batch that are
+        selected by the boolean `item_mask`. The other items are left untouched.
+        """
+        if not item_mask.any():
+            return samples
+        if item_mask.all():
+            return transform.apply_batch(samples, sample_rate)
+        processed_subset = transform.apply_batch(samples[item_mask], sample_rate)
+        if processed_subset.shape[1:] != samples.shape[1:]:
+            raise ValueError(
+                "{} changed the shape of some of the sounds in the batch, so they can't be"
+                " stacked into a batch again".format(type(transform).__name__)
+            )
+        processed_samples = samples.copy()
+        processed_samples[item_mask] = processed_subset
+        return processed_samples
+
     def freeze_parameters(self, apply_to_children=True):
         """
         Mark all parameters as frozen, i.e. do not randomize them for each call. This can be
@@ -75,8 +98,87 @@ class Compose(BaseCompose):
     ```
     """
 
-    def __init__(self, transforms, p=1.0, shuffle=False):
+    def __init__(self, transforms, p=1.0, shuffle=False, fuse_filters=True):
+        """
+        :param transforms: The list of transforms
+        :param p: The probability of applying the composition
+        :param shuffle: If True, the order of the transforms is shuffled for every call
+        :param fuse_filters: If True, consecutive IIR filter transforms that can be fused
+            (see `supports_sos_fusion`, e.g. shelf, peaking and non-zero-phase Butterworth
+            filters) get their parameters randomized as usual, but are then applied as
+            one cascade in a single pass over the samples. The result is the same, except
+            that the intermediate results are not rounded to float32.
+        """
         super().__init__(transforms, p, shuffle)
+        self.fuse_filters = fuse_filters
+
+    def group_transforms(self, transforms):
+        """
+        Split the transforms into groups that are applied one after another. Consecutive
+        filters that can be fused end up in the same group, every other transform gets a
+        group of its own.
+        """
+        groups = []
+        for transform in transforms:
+            if (
+                self.fuse_filters
+                and getattr(transform, "supports_sos_fusion", False)
+                and groups
+                and getattr(groups[-1][-1], "supports_sos_fusion", False)
+            ):
+                groups[-1].append(transform)
+            else:
+                groups.append([transform])
+        return groups
+
+    @staticmethod
+    def apply_fused_filters(filters, samples, sample_rate):
+        """
+        Randomize the parameters of the given filters (unless they are frozen) and apply
+        the ones that should be applied as one cascade
+        """
+        sos_list = []
+        for transform in filters:
+            if not transform.are_parameters_frozen:
+                transform.randomize_parameters(samples, sample_rate)
+            if transform.parameters["should_apply"]:
+                sos_list.append(transform.get_sos(sample_rate))
+        if not sos_list or len(samples) == 0:
+            return samples
+        filters[0]._check_channel_support(samples)
+        return apply_sos_filter(np.concatenate(sos_list), samples)
+
+    @staticmethod
+    def apply_fused_filters_to_batch(filters, samples, item_mask, sample_rate):
+        """
+        Like apply_fused_filters, but for the items in the batch that are selected by the
+        boolean `item_mask`, with independently randomized parameters for each item
+        """
+        if not item_mask.any() or samples.shape[-1] == 0:
+            return samples
+        subset = samples if item_mask.all() else samples[item_mask]
+        for transform in filters:
+            if transform.are_parameters_frozen:
+                transform.batch_parameters = [transform.parameters] * subset.shape[0]
+            else:
+                transform.randomize_batch_parameters(subset, sample_rate)
+
+        processed_subset = subset.copy()
+        for i in range(subset.shape[0]):
+            sos_list = [
+                transform.get_sos(sample_rate, transform.batch_parameters[i])
+                for transform in filters
+                if transform.batch_parameters[i]["should_apply"]
+            ]
+            if sos_list:
+                processed_subset[i] = apply_sos_filter(
+                    np.concatenate(sos_list), subset[i]
+                )
+        if subset is samples:
+            return processed_subset
+        processed_samples = samples.copy()
+        processed_samples[item_mask] = processed_subset
+        return processed_samples
 
     def __call__(self, samples, sample_rate):
         transforms = self.transforms.copy()
@@ -86,8 +188,43 @@ class Compose(BaseCompose):
         if should_apply:
             if self.shuffle:
                 random.shuffle(transforms)
-            for transform in transforms:
-                samples = transform(samples, sample_rate)
+            for group in self.group_transforms(transforms):
+                if len(group) > 1 and samples.dtype == np.float32:
+                    samples = self.apply_fused_filters(group, samples, sample_rate)
+                else:
+                    for transform in group:
+                        samples = transform(samples, sample_rate)
+
+        return samples
+
+    def apply_batch(self, samples, sample_rate):
+        """
+        Apply the composition to a batch of sounds with the shape (batch_size, num_samples)
+        or (batch_size, num_channels, num_samples). Whether the composition gets applied is
+        decided for each item separately. If shuffle is enabled, the shuffled order of the
+        transforms is shared by all items in the batch.
+        """
+        transforms = self.transforms.copy()
+        should_apply = np.array(
+            [random.random() < self.p for _ in range(samples.shape[0])], dtype=bool
+        )
+        if should_apply.any():
+            if self.shuffle:
+                random.shuffle(transforms)
+            for group in self.group_transforms(transforms):
+                if (
+                    len(group) > 1
+                    and samples.dtype == np.float32
+                    and samples.ndim in (2, 3)
+                ):
+                    samples = self.apply_fused_filters_to_batch(
+                        group, samples, should_apply, sample_rate
+                    )
+                else:
+                    for transform in group:
+                        samples = self.apply_batch_to_subset(
+                            transform, samples, should_apply, sample_rate
+                        )
 
         return samples
 
@@ -157,31 +294,37 @@ class SomeOf(BaseCompose):
             self.weights = [1.0] * len(transforms)
         assert len(self.weights) == len(transforms)
 
+    def pick_transform_indexes(self):
+        """
+        Randomly pick the (sorted) indexes of the transforms to apply
+        """
+        if type(self.num_transforms) == tuple:
+            if self.num_transforms[1] is None:
+                num_transforms_to_apply = random.randint(
+                    self.num_transforms[0], len(self.transforms)
+                )
+            elif type(self.num_transforms[0]) == int:
+                num_transforms_to_apply = random.randint(
+                    self.num_transforms[0], self.num_transforms[1]
+                )
+            else:
+                # two arrays are given. first are the numbers and the second are probabilities
+                num_transforms_to_apply = random.choices(
+                    self.num_transforms[0], 
+                    weights=weights_to_probabilities(self.num_transforms[1])
+                )[0]
+        else:
+            num_transforms_to_apply = self.num_transforms
+        all_transforms_indexes = list(range(len(self.transforms)))
+        return sorted(
+            random.choices(all_transforms_indexes, weights=self.weights, k=num_transforms_to_apply)
+        )
+
     def randomize_parameters(self, *args, **kwargs):
         super().randomize_parameters(*args, **kwargs)
         self.should_apply = random.random() < self.p
         if self.should_apply:
-            if type(self.num_transforms) == tuple:
-                if self.num_transforms[1] is None:
-                    num_transforms_to_apply = random.randint(
-                        self.num_transforms[0], len(self.transforms)
-                    )
-                elif type(self.num_transforms[0]) == int:
-                    num_transforms_to_apply = random.randint(
-                        self.num_transforms[0], self.num_transforms[1]
-                    )
-                else:
-                    # two arrays are given. first are the numbers and the second are probabilities
-                    num_transforms_to_apply = random.choices(
-                        self.num_transforms[0], 
-                        weights=weights_to_probabilities(self.num_transforms[1])
-                    )[0]
-            else:
-                num_transforms_to_apply = self.num_transforms
-            all_transforms_indexes = list(range(len(self.transforms)))
-            self.transform_indexes = sorted(
-                random.choices(all_transforms_indexes, weights=self.weights, k=num_transforms_to_apply)
-            )
+            self.transform_indexes = self.pick_transform_indexes()
         return self.transform_indexes
 
     def __call__(self, *args, **kwargs):
@@ -225,6 +368,39 @@ class SomeOf(BaseCompose):
         else:
             return args[0]
 
+    def apply_batch(self, samples, sample_rate):
+        """
+        Apply the composition to a batch of sounds with the shape (batch_size, num_samples)
+        or (batch_size, num_channels, num_samples). The transforms to apply are picked
+        for each item separately, unless the parameters are frozen.
+        """
+        num_items = samples.shape[0]
+        # counts[i, j] is the number of times transform j gets applied to item i
+        counts = np.zeros((num_items, len(self.transforms)), dtype=np.int64)
+        for i in range(num_items):
+            if self.are_parameters_frozen:
+                should_apply = self.should_apply
+                transform_indexes = self.transform_indexes
+            else:
+                should_apply = random.random() < self.p
+                transform_indexes = (
+                    self.pick_transform_indexes() if should_apply else []
+                )
+            if should_apply:
+                for transform_index in transform_indexes:
+                    counts[i, transform_index] += 1
+
+        # Apply the transforms in the same order as in __call__, i.e. by increasing index
+        for transform_index, transform in enumerate(self.transforms):
+            for repetition in range(1, counts[:, transform_index].max(initial=0) + 1):
+                samples = self.apply_batch_to_subset(
+                    transform,
+                    samples,
+                    counts[:, transform_index] >= repetition,
+                    sample_rate,
+                )
+        return samples
+
 
 class OneOf(BaseCompose):
     """
@@ -279,3 +455,30 @@ class OneOf(BaseCompose):
             return kwargs["magnitude_spectrogram"]
         else:
             return args[0]
+
+    def apply_batch(self, samples, sample_rate):
+        """
+        Apply the composition to a batch of sounds with the shape (batch_size, num_samples)
+        or (batch_size, num_channels, num_samples). The transform to apply is picked for
+        each item separately, unless the parameters are frozen.
+        """
+        num_items = samples.shape[0]
+        if self.are_parameters_frozen:
+            transform_indexes = np.full(
+                num_items, self.transform_index if self.should_apply else -1
+            )
+        else:
+            transform_indexes = np.array(
+                [
+                    random.choices(range(len(self.transforms)), self.weights)[0]
+                    if random.random() < self.p
+                    else -1
+                    for _ in range(num_items)
+                ],
+                dtype=np.int64,
+            )
+        for transform_index, transform in enumerate(self.transforms):
+            samples = self.apply_batch_to_subset(
+                transform, samples, transform_indexes == transform_index, sample_rate
+            )
+        return samples
@@ -0,0 +1,90 @@
+"""
+FFT convolution with a precomputed filter spectrum. The filter (e.g. an impulse response)
+is split into partitions of `block_size` samples and the spectra of the partitions are
+computed once, so they can be cached and reused for many sounds. The signal is processed
+in blocks with uniformly partitioned overlap-add, which keeps the FFTs short even when the
+filter is long, and only the requested part of the output gets computed.
+"""
+import math
+
+import numpy as np
+import scipy.fft
+
+# Longer filters are split into several partitions of at most this size
+MAX_BLOCK_SIZE = 32768
+
+
+def get_block_size(filter_length: int, max_block_size: int = MAX_BLOCK_SIZE) -> int:
+    """
+    Return the block size to use for a filter with the given length: the filter length
+    rounded up to a power of two, but at most max_block_size
+    """
+    return min(1 << max(int(filter_length) - 1, 1).bit_length(), max_block_size)
+
+
+def compute_filter_spectra(filter_samples: np.ndarray, block_size: int) -> np.ndarray:
+    """
+    Split the filter into partitions of block_size samples and return the spectra of
+    the zero-padded partitions, with shape (num_partitions, block_size + 1)
+
+    :param filter_samples: 1D float array
+    :param block_size: The partition size
+    """
+    num_partitions = max(1, math.ceil(filter_samples.shape[-1] / block_size))
+    partitions = np.zeros((num_partitions, block_size), dtype=np.float32)
+    partitions.reshape(-1)[: filter_samples.shape[-1]] = filter_samples
+    return scipy.fft.rfft(partitions, n=2 * block_size, axis=-1)
+
+
+def convolve_with_spectra(
+    samples: np.ndarray,
+    filter_spectra: np.ndarray,
+    block_size: int,
+    output_length: int,
+) -> np.ndarray:
+    """
+    Convolve the samples with a filter, given by its partition spectra (see
+    compute_filter_spectra), and return the first output_length samples of the result.
+    The full convolution has len(samples) + len(filter) - 1 samples.
+
+    :param samples: float array with shape (num_samples,) or (num_channels, num_samples)
+    :param filter_spectra: The output of compute_filter_spectra
+    :param block_size: The block size that was passed to compute_filter_spectra
+    :param output_length: The number of output samples to compute
+    """
+    num_partitions = filter_spectra.shape[0]
+    num_output_blocks = math.ceil(output_length / block_size)
+    # Input blocks after the last output block don't contribute to the output
+    num_input_blocks = min(num_output_blocks, math.ceil(samples.shape[-1] / block_size))
+
+    samples_2d = samples if samples.ndim == 2 else samples[np.newaxis, :]
+    num_channels = samples_2d.shape[0]
+    input_blocks = np.zeros(
+        (num_channels, num_input_blocks * block_size), dtype=np.float32
+    )
+    num_input_samples = min(samples_2d.shape[-1], input_blocks.shape[-1])
+    input_blocks[:, :num_input_samples] = samples_2d[:, :num_input_samples]
+    input_spectra = scipy.fft.rfft(
+        input_blocks.reshape((num_channels, num_input_blocks, block_size)),
+        n=2 * block_size,
+        axis=-1,
+    )
+
+    # Each output block is the sum of the input blocks, delayed by p blocks, multiplied by
+    # the spectrum of partition p
+    output_spectra = np.zeros(
+        (num_channels, num_output_blocks, block_size + 1), dtype=input_spectra.dtype
+    )
+    for p in range(min(num_partitions, num_output_blocks)):
+        num_blocks = min(num_input_blocks, num_output_blocks - p)
+        output_spectra[:, p : p + num_blocks] += (
+            input_spectra[:, :num_blocks] * filter_spectra[p]
+        )
+    output_blocks = scipy.fft.irfft(output_spectra, n=2 * block_size, axis=-1)
+
+    # Overlap-add: the second half of each block overlaps the first half of the next one
+    output = output_blocks[..., :block_size].copy()
+    output[:, 1:] += output_blocks[:, :-1, block_size:]
+    output = output.reshape((num_channels, -1))[:, :output_length]
+    output = output.astype(np.float32)
+    return output if samples.ndim == 2 else output[0]
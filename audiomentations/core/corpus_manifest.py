@@ -0,0 +1,219 @@
+import math
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from audiomentations.core.audio_loading_utils import load_sound_file
+from audiomentations.core.utils import (
+    calculate_rms,
+    calculate_rms_without_silence,
+    find_audio_files_in_paths,
+)
+
+STATISTICS_COLUMNS = ("peak", "rms", "active_rms")
+
+
+def _get_file_stat(file_path):
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _compute_entry(file_path):
+    samples, sample_rate = load_sound_file(file_path, sample_rate=None, mono=False)
+    if samples.ndim == 1:
+        samples = samples[np.newaxis, :]
+    # The statistics describe the mono mixdown, which is what the transforms mix in
+    mono_samples = np.mean(samples, axis=0)
+    return {
+        "num_frames": samples.shape[-1],
+        "sample_rate": sample_rate,
+        "num_channels": samples.shape[0],
+        "peak": float(np.amax(np.abs(samples))) if samples.size else 0.0,
+        "rms": float(calculate_rms(mono_samples)) if samples.size else 0.0,
+        "active_rms": float(calculate_rms_without_silence(mono_samples, sample_rate))
+        if samples.size
+        else 0.0,
+    }
+
+
+class CorpusManifest:
+    """
+    An index of a corpus of sound files with the number of frames, the sample rate, the
+    number of channels, the peak and the RMS (of the whole file, and without silence, see
+    calculate_rms_without_silence) of each file, computed once by decoding the files.
+    Transforms that take a manifest get the list of files and the lengths of the files from
+    it, so they don't need to walk the directories and decode (or open) the files for that.
+
+    On disk, a manifest is a single .npz file with one column per field, plus the
+    modification time (in ns) and the size of each file when it was indexed. An entry whose
+    file has changed since then is considered stale: it is ignored by the lookups, and it is
+    recomputed when the manifest is rebuilt.
+    """
+
+    def __init__(self, path: Union[Path, str]):
+        """
+        :param path: The .npz file of the manifest
+        """
+        self.path = str(path)
+        with np.load(self.path) as manifest:
+            self._columns = {key: manifest[key] for key in manifest.files}
+        self._index = {
+            file_path: i for i, file_path in enumerate(self._columns["file_paths"])
+        }
+
+    @classmethod
+    def build(
+        cls,
+        sounds_path: Union[List[Path], List[str], Path, str],
+        path: Union[Path, str],
+        num_workers: Optional[int] = None,
+    ) -> "CorpusManifest":
+        """
+        Index all audio files in the given path(s), store the manifest in the given file and
+        return it. If the file already holds a manifest, the entries of the files that have
+        not changed (same modification time and size) are reused, and only new and changed
+        files are decoded. The file is replaced atomically, so concurrent readers never see
+        a partially written manifest.
+
+        :param sounds_path: A path or list of paths to audio file(s) and/or folder(s) with
+            audio files. Can be str or Path instance(s).
+        :param path: The .npz file of the manifest
+        :param num_workers: The number of worker processes that decode the files. Defaults to
+            the number of CPUs. 1 means that the files are decoded in the current process.
+        """
+        file_paths = [str(p) for p in find_audio_files_in_paths(sounds_path)]
+        assert len(file_paths) > 0
+        file_stats = [_get_file_stat(file_path) for file_path in file_paths]
+
+        previous_manifest = cls(path) if os.path.isfile(str(path)) else None
+        entries = [None] * len(file_paths)
+        for i, file_path in enumerate(file_paths):
+            if previous_manifest is not None and previous_manifest.is_up_to_date(
+                file_path, file_stats[i]
+            ):
+                entries[i] = previous_manifest.get_entry(file_path)
+
+        indices_to_compute = [i for i, entry in enumerate(entries) if entry is None]
+        paths_to_compute = [file_paths[i] for i in indices_to_compute]
+        num_workers = min(
+            num_workers or os.cpu_count() or 1, max(1, len(paths_to_compute))
+        )
+        if num_workers == 1:
+            computed_entries = [_compute_entry(p) for p in paths_to_compute]
+        else:
+            chunksize = max(1, math.ceil(len(paths_to_compute) / (4 * num_workers)))
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                computed_entries = list(
+                    executor.map(_compute_entry, paths_to_compute, chunksize=chunksize)
+                )
+        for i, entry in zip(indices_to_compute, computed_entries):
+            entries[i] = entry
+
+        columns = {
+            "file_paths": np.array(file_paths),
+            "mtimes_ns": np.array([stat[0] for stat in file_stats], dtype=np.int64),
+            "file_sizes": np.array([stat[1] for stat in file_stats], dtype=np.int64),
+        }
+        for name in ("num_frames", "sample_rate", "num_channels"):
+            columns[name] = np.array([entry[name] for entry in entries], dtype=np.int64)
+        for name in STATISTICS_COLUMNS:
+            columns[name] = np.array(
+                [entry[name] for entry in entries], dtype=np.float32
+            )
+
+        parent = os.path.dirname(os.path.abspath(str(path)))
+        os.makedirs(parent, exist_ok=True)
+        file_descriptor, tmp_path = tempfile.mkstemp(
+            prefix=".corpus_manifest_", suffix=".npz", dir=parent
+        )
+        try:
+            with os.fdopen(file_descriptor, "wb") as tmp_file:
+                np.savez(tmp_file, **columns)
+            os.replace(tmp_path, str(path))
+        finally:
+            if os.path.isfile(tmp_path):
+                os.remove(tmp_path)
+
+        return cls(path)
+
+    @property
+    def file_paths(self) -> List[str]:
+        return [str(file_path) for file_path in self._columns["file_paths"]]
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, file_path):
+        return str(file_path) in self._index
+
+    def is_up_to_date(self, file_path, file_stat=None) -> bool:
+        """
+        Return True if the file is in the manifest, and has the same modification time and
+        size as when it was indexed
+        """
+        i = self._index.get(str(file_path))
+        if i is None:
+            return False
+        if file_stat is None:
+            try:
+                file_stat = _get_file_stat(file_path)
+            except OSError:
+                return False
+        return (
+            file_stat[0] == self._columns["mtimes_ns"][i]
+            and file_stat[1] == self._columns["file_sizes"][i]
+        )
+
+    def get_entry(self, file_path) -> Optional[Dict]:
+        """
+        Return the number of frames, the sample rate, the number of channels, the peak, the
+        RMS and the active RMS of the file, or None if the entry of the file is missing or
+        stale
+        """
+        if not self.is_up_to_date(file_path):
+            return None
+        i = self._index[str(file_path)]
+        entry = {
+            name: int(self._columns[name][i])
+            for name in ("num_frames", "sample_rate", "num_channels")
+        }
+        for name in STATISTICS_COLUMNS:
+            entry[name] = float(self._columns[name][i])
+        return entry
+
+    def get_num_frames(self, file_path, sample_rate: Optional[int] = None) -> Optional[int]:
+        """
+        Return the number of frames that load_sound_file returns for the file, or None if
+        the entry of the file is missing or stale
+
+        :param sample_rate: If not None, the number of frames after resampling to this rate
+        """
+        entry = self.get_entry(file_path)
+        if entry is None:
+            return None
+        if sample_rate is None or sample_rate == entry["sample_rate"]:
+            return entry["num_frames"]
+        return int(
+            np.ceil(entry["num_frames"] * float(sample_rate) / entry["sample_rate"])
+        )
+
+
+def resolve_sound_file_paths(
+    sounds_path: Optional[Union[List[Path], List[str], Path, str]],
+    manifest: Optional[Union[CorpusManifest, Path, str]],
+) -> Tuple[List[str], Optional[CorpusManifest]]:
+    """
+    Return the paths of the audio files that a transform draws from, and the manifest
+    (loaded, if a path was given). If sounds_path is None, the files of the manifest are
+    used, so no directories get walked.
+    """
+    if isinstance(manifest, (Path, str)):
+        manifest = CorpusManifest(manifest)
+    if sounds_path is None:
+        assert manifest is not None, "Either sounds_path or manifest must be given"
+        return manifest.file_paths, manifest
+    return [str(p) for p in find_audio_files_in_paths(sounds_path)], manifest
@@ -0,0 +1,59 @@
+"""
+In-process distortion effects, compiled with Numba. They follow the semantics of the
+corresponding sox effects (as implemented in torchaudio), so the transforms that used to
+call torchaudio can use them without converting the audio to torch tensors.
+"""
+import math
+
+import numba
+import numpy as np
+
+
+# Numba's parallel threading layers are not fork-safe (a process that forks after using
+# them may hang), and PyTorch DataLoader workers are usually forked. So the kernel runs
+# serially, but it releases the GIL, so threads can process several sounds in parallel.
+@numba.njit(cache=True, nogil=True)
+def _overdrive_kernel(samples, output, gain, colour):
+    num_channels, num_samples = samples.shape
+    for c in range(num_channels):
+        last_in = np.float32(0.0)
+        last_out = np.float32(0.0)
+        for i in range(num_samples):
+            x = samples[c, i]
+            shaped = x * gain + colour
+            if shaped < -1.0:
+                shaped = np.float32(-2.0 / 3.0)
+            elif shaped > 1.0:
+                shaped = np.float32(2.0 / 3.0)
+            else:
+                shaped = np.float32(shaped - shaped * shaped * shaped * np.float32(1.0 / 3.0))
+            # DC blocking filter
+            last_out = np.float32(shaped - last_in + 0.995 * last_out)
+            last_in = shaped
+            y = np.float32(x * 0.5 + last_out * 0.75)
+            output[c, i] = min(max(y, np.float32(-1.0)), np.float32(1.0))
+
+
+def overdrive(
+    samples: np.ndarray, gain: float = 20.0, colour: float = 20.0
+) -> np.ndarray:
+    """
+    Non-linear distortion with the same semantics and defaults as sox's overdrive effect
+    (and torchaudio.functional.overdrive). The computation is done in float32, like in
+    torchaudio.
+
+    :param samples: float32 array with shape (num_samples,) or (num_channels, num_samples)
+    :param gain: The gain at the boost in dB, between 0 and 100
+    :param colour: The amount of even harmonic content in the output, between 0 and 100
+    """
+    input_samples = np.ascontiguousarray(
+        samples if samples.ndim == 2 else samples[np.newaxis, :], dtype=np.float32
+    )
+    output = np.empty_like(input_samples)
+    _overdrive_kernel(
+        input_samples,
+        output,
+        np.float32(math.exp(gain * math.log(10) / 20)),
+        np.float32(colour / 200),
+    )
+    return output if samples.ndim == 2 else output[0]
@@ -0,0 +1,423 @@
+"""
+In-process dynamic range processors. They follow the semantics of the corresponding
+ffmpeg filters (and of cylimiter, in the case of the limiter), so the transforms that used
+to call ffmpeg can use them as a drop-in replacement, without spawning a subprocess for each
+sound.
+"""
+import math
+
+import numba
+import numpy as np
+
+from audiomentations.core.utils import convert_decibels_to_amplitude_ratio
+
+# ffmpeg represents an infinite ratio by this value
+_FAKE_INFINITY = 65536.0 * 65536.0
+
+
+@numba.njit(cache=True, nogil=True)
+def _hermite_interpolation(x, x0, x1, p0, p1, m0, m1):
+    width = x1 - x0
+    t = (x - x0) / width
+    m0 *= width
+    m1 *= width
+    t2 = t * t
+    t3 = t2 * t
+    ct2 = -3 * p0 - 2 * m0 + 3 * p1 - m1
+    ct3 = 2 * p0 + m0 - 2 * p1 + m1
+    return ct3 * t3 + ct2 * t2 + m0 * t + p0
+
+
+@numba.njit(cache=True, nogil=True)
+def _compressor_kernel(
+    samples,
+    output,
+    threshold,
+    ratio,
+    attack_coeff,
+    release_coeff,
+    makeup,
+    knee,
+    link_maximum,
+    detection_rms,
+):
+    num_channels, num_samples = samples.shape
+    thres = math.log(threshold)
+    lin_knee_start = threshold / math.sqrt(knee)
+    lin_knee_stop = threshold * math.sqrt(knee)
+    knee_start = math.log(lin_knee_start)
+    knee_stop = math.log(lin_knee_stop)
+    compressed_knee_stop = (knee_stop - thres) / ratio + thres
+    detector_threshold = lin_knee_start
+    if detection_rms:
+        detector_threshold = lin_knee_start * lin_knee_start
+    infinite_ratio = abs(ratio - _FAKE_INFINITY) < 1.0
+
+    lin_slope = 0.0
+    for i in range(num_samples):
+        # Link the channels, so they all get the same gain
+        abs_sample = abs(samples[0, i])
+        for c in range(1, num_channels):
+            if link_maximum:
+                abs_sample = max(abs(samples[c, i]), abs_sample)
+            else:
+                abs_sample += abs(samples[c, i])
+        if not link_maximum:
+            abs_sample /= num_channels
+        if detection_rms:
+            abs_sample *= abs_sample
+
+        # Envelope follower
+        if abs_sample > lin_slope:
+            lin_slope += (abs_sample - lin_slope) * attack_coeff
+        else:
+            lin_slope += (abs_sample - lin_slope) * release_coeff
+
+        gain = 1.0
+        if lin_slope > 0.0 and lin_slope > detector_threshold:
+            slope = math.log(lin_slope)
+            if detection_rms:
+                slope *= 0.5
+            if infinite_ratio:
+                out_level = thres
+                delta = 0.0
+            else:
+                out_level = (slope - thres) / ratio + thres
+                delta = 1.0 / ratio
+            if knee > 1.0 and slope < knee_stop:
+                out_level = _hermite_interpolation(
+                    slope,
+                    knee_start,
+                    knee_stop,
+                    knee_start,
+                    compressed_knee_stop,
+                    1.0,
+                    delta,
+                )
+            gain = math.exp(out_level - slope)
+
+        for c in range(num_channels):
+            output[c, i] = samples[c, i] * gain * makeup
+
+
+def compress(
+    samples: np.ndarray,
+    sample_rate: int,
+    threshold_db: float = -18.0618,
+    ratio: float = 2.0,
+    attack: float = 20.0,
+    release: float = 250.0,
+    makeup: float = 1.0,
+    knee: float = 2.82843,
+    link: str = "average",
+    detection: str = "rms",
+) -> np.ndarray:
+    """
+    Feed-forward dynamic range compressor with the same semantics and defaults as ffmpeg's
+    acompressor filter. The output matches ffmpeg within 1e-6 (absolute) for float32
+    input in [-1, 1].
+
+    :param samples: float32 array with shape (num_samples,) or (num_channels, num_samples)
+    :param sample_rate: The sample rate of the audio
+    :param threshold_db: The level above which the gain reduction kicks in, in dB
+    :param ratio: The compression ratio, e.g. 4 means 4:1
+    :param attack: The time it takes for the gain reduction to kick in, in milliseconds
+    :param release: The time it takes for the gain reduction to stop, in milliseconds
+    :param makeup: The (linear) amount of gain applied after the compression
+    :param knee: The curve of the knee around the threshold (linear, between 1 and 8)
+    :param link: "average" or "maximum". Determines how the level of the channels is
+        combined into one level, so that all channels get the same gain reduction.
+    :param detection: "rms" or "peak". The level detection mode.
+    """
+    assert link in ("average", "maximum")
+    assert detection in ("rms", "peak")
+    assert ratio >= 1.0
+    assert attack > 0.0 and release > 0.0
+
+    input_samples = np.ascontiguousarray(
+        samples if samples.ndim == 2 else samples[np.newaxis, :], dtype=np.float32
+    )
+    output = np.empty_like(input_samples)
+    if input_samples.shape[-1] > 0:
+        _compressor_kernel(
+            input_samples,
+            output,
+            convert_decibels_to_amplitude_ratio(threshold_db),
+            float(ratio),
+            min(1.0, 1.0 / (attack * sample_rate / 4000.0)),
+            min(1.0, 1.0 / (release * sample_rate / 4000.0)),
+            float(makeup),
+            float(knee),
+            link == "maximum",
+            detection == "rms",
+        )
+    return output if samples.ndim == 2 else output[0]
+
+
+def _build_compand_segments(points, soft_knee_db, gain_db):
+    """
+    Build the transfer function of the compander the same way as ffmpeg's compand filter:
+    the points become straight segments (stored as log gain), and each corner gets a
+    quadratic soft-knee segment in between. Returns the segments as four arrays (x, y, a, b)
+    together with the lowest input level and its gain.
+    """
+    num_points = len(points)
+    num_segments = (num_points + 4) * 2
+    x = np.zeros(num_segments)
+    y = np.zeros(num_segments)
+    a = np.zeros(num_segments)
+    b = np.zeros(num_segments)
+
+    for i, (in_db, out_db) in enumerate(points):
+        if i and points[i - 1][0] > in_db:
+            raise ValueError("The transfer function points must be sorted by input level")
+        x[2 * (i + 1)] = in_db
+        y[2 * (i + 1)] = out_db - in_db
+    num = num_points
+
+    # Add the point 0/0 (which is already zero-initialized) if necessary
+    if num == 0 or x[2 * num] != 0:
+        num += 1
+
+    # Add a tail off segment at the start
+    x[0] = x[2] - 2 * soft_knee_db
+    y[0] = y[2]
+    num += 1
+
+    # Join adjacent colinear segments
+    i = 2
+    while i < num:
+        g1 = (y[2 * (i - 1)] - y[2 * (i - 2)]) * (x[2 * i] - x[2 * (i - 1)])
+        g2 = (y[2 * i] - y[2 * (i - 1)]) * (x[2 * (i - 1)] - x[2 * (i - 2)])
+        if g1 == g2:
+            num -= 1
+            i -= 1
+            for j in range(i, num):
+                for array in (x, y, a, b):
+                    array[2 * j] = array[2 * (j + 1)]
+        i += 1
+
+    to_log = math.log(10) / 20
+    y[0::2] += gain_db
+    x[0::2] *= to_log
+    y[0::2] *= to_log
+
+    radius = soft_knee_db * to_log
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for i in range(4, num_segments, 2):
+            a[i - 4] = 0
+            b[i - 4] = (y[i - 2] - y[i - 4]) / (x[i - 2] - x[i - 4])
+
+            a[i - 2] = 0
+            b[i - 2] = (y[i] - y[i - 2]) / (x[i] - x[i - 2])
+
+            theta = np.arctan2(y[i - 2] - y[i - 4], x[i - 2] - x[i - 4])
+            length = np.hypot(x[i - 2] - x[i - 4], y[i - 2] - y[i - 4])
+            r = min(radius, length)
+            x[i - 3] = x[i - 2] - r * np.cos(theta)
+            y[i - 3] = y[i - 2] - r * np.sin(theta)
+
+            theta = np.arctan2(y[i] - y[i - 2], x[i] - x[i - 2])
+            length = np.hypot(x[i] - x[i - 2], y[i] - y[i - 2])
+            r = min(radius, length / 2)
+            knee_end_x = x[i - 2] + r * np.cos(theta)
+            knee_end_y = y[i - 2] + r * np.sin(theta)
+
+            cx = (x[i - 3] + x[i - 2] + knee_end_x) / 3
+            cy = (y[i - 3] + y[i - 2] + knee_end_y) / 3
+
+            x[i - 2] = knee_end_x
+            y[i - 2] = knee_end_y
+
+            in1 = cx - x[i - 3]
+            out1 = cy - y[i - 3]
+            in2 = x[i - 2] - x[i - 3]
+            out2 = y[i - 2] - y[i - 3]
+            a[i - 3] = (out2 / in2 - out1 / in1) / (in2 - in1)
+            b[i - 3] = out1 / in1 - a[i - 3] * in1
+    x[num_segments - 3] = 0
+    y[num_segments - 3] = y[num_segments - 2]
+
+    return x, y, a, b, math.exp(x[1]), math.exp(y[1])
+
+
+@numba.njit(cache=True, nogil=True)
+def _compand_gain(volume, x, y, a, b, in_min_lin, out_min_lin):
+    if volume < in_min_lin:
+        return out_min_lin
+    in_log = math.log(volume)
+    i = 1
+    while i < x.shape[0]:
+        if in_log <= x[i]:
+            break
+        i += 1
+    in_log -= x[i - 1]
+    return math.exp(y[i - 1] + in_log * (a[i - 1] * in_log + b[i - 1]))
+
+
+@numba.njit(cache=True, nogil=True)
+def _compand_kernel(
+    samples,
+    output,
+    x,
+    y,
+    a,
+    b,
+    in_min_lin,
+    out_min_lin,
+    attack_coeff,
+    decay_coeff,
+    initial_volume,
+    delay_samples,
+):
+    num_channels, num_samples = samples.shape
+    for c in range(num_channels):
+        volume = initial_volume
+        for i in range(num_samples):
+            delta = abs(samples[c, i]) - volume
+            if delta > 0.0:
+                volume += delta * attack_coeff
+            else:
+                volume += delta * decay_coeff
+
+            if delay_samples <= 0:
+                gain = _compand_gain(volume, x, y, a, b, in_min_lin, out_min_lin)
+                output[c, i] = samples[c, i] * gain
+            elif i >= delay_samples:
+                # The gain is looked up delay_samples ahead of the sample it gets applied to
+                gain = _compand_gain(volume, x, y, a, b, in_min_lin, out_min_lin)
+                value = samples[c, i - delay_samples] * gain
+                output[c, i - delay_samples] = min(max(value, -1.0), 1.0)
+
+        if delay_samples > 0:
+            # Flush the delay line with the final gain
+            gain = _compand_gain(volume, x, y, a, b, in_min_lin, out_min_lin)
+            for i in range(max(num_samples - delay_samples, 0), num_samples):
+                value = samples[c, i] * gain
+                output[c, i] = min(max(value, -1.0), 1.0)
+
+
+def _time_to_coefficient(t, sample_rate):
+    if t > 1.0 / sample_rate:
+        return 1.0 - math.exp(-1.0 / (sample_rate * t))
+    return 1.0
+
+
+def compand(
+    samples: np.ndarray,
+    sample_rate: int,
+    points,
+    attack: float = 0.0,
+    decay: float = 0.8,
+    soft_knee_db: float = 0.01,
+    gain_db: float = 0.0,
+    initial_volume_db: float = 0.0,
+    delay: float = 0.0,
+) -> np.ndarray:
+    """
+    Compress or expand the dynamic range of the audio with a piecewise linear transfer
+    function (in dB) with soft knees, with the same semantics and defaults as ffmpeg's
+    compand filter. Each channel has its own envelope. The output matches ffmpeg within
+    1e-6 (absolute) for float32 input in [-1, 1].
+
+    :param samples: float32 array with shape (num_samples,) or (num_channels, num_samples)
+    :param sample_rate: The sample rate of the audio
+    :param points: A list of (input_db, output_db) tuples, sorted by input level, that
+        define the transfer function. E.g. [(-80, -80), (-60, -90), (0, 0)]
+    :param attack: The time (in seconds) over which an increase of the volume is averaged
+    :param decay: The time (in seconds) over which a decrease of the volume is averaged
+    :param soft_knee_db: The radius (in dB) of the soft knee at each point
+    :param gain_db: Gain (in dB) that gets added to all points of the transfer function
+    :param initial_volume_db: The volume (in dB) that the envelope starts at
+    :param delay: Look-ahead time in seconds. Together with a short attack time, this
+        lets the gain react before the level changes. When a delay is used, the output
+        is clipped to [-1, 1], like in ffmpeg.
+    """
+    assert attack >= 0.0 and decay >= 0.0
+    assert delay >= 0.0
+
+    x, y, a, b, in_min_lin, out_min_lin = _build_compand_segments(
+        points, soft_knee_db, gain_db
+    )
+    input_samples = np.ascontiguousarray(
+        samples if samples.ndim == 2 else samples[np.newaxis, :], dtype=np.float32
+    )
+    output = np.empty_like(input_samples)
+    _compand_kernel(
+        input_samples,
+        output,
+        x,
+        y,
+        a,
+        b,
+        in_min_lin,
+        out_min_lin,
+        _time_to_coefficient(attack, sample_rate),
+        _time_to_coefficient(decay, sample_rate),
+        convert_decibels_to_amplitude_ratio(initial_volume_db),
+        int(delay * sample_rate),
+    )
+    return output if samples.ndim == 2 else output[0]
+
+
+@numba.njit(cache=True, nogil=True)
+def _limiter_kernel(samples, output, attack, release, delay, threshold):
+    num_channels, num_samples = samples.shape
+    one = np.float32(1.0)
+    delay_line = np.zeros(delay, dtype=np.float32)
+    for c in range(num_channels):
+        delay_line[:] = 0.0
+        delay_index = 0
+        envelope = np.float32(0.0)
+        gain = one
+        for i in range(num_samples):
+            sample = samples[c, i]
+            delay_line[delay_index] = sample
+            delay_index += 1
+            if delay_index == delay:
+                delay_index = 0
+
+            envelope = max(abs(sample), np.float32(envelope * release))
+            target_gain = one
+            if envelope > threshold:
+                target_gain = np.float32(threshold / envelope)
+            # The gain goes towards the target gain
+            gain = np.float32(gain * attack + target_gain * (one - attack))
+            output[c, i] = np.float32(delay_line[delay_index] * gain)
+
+
+def limit(
+    samples: np.ndarray,
+    attack: float,
+    release: float,
+    delay: int,
+    threshold: float,
+) -> np.ndarray:
+    """
+    Peak limiter with a look-ahead delay, with the same semantics as cylimiter's Limiter.
+    The channels are processed independently (without linking), all in one call. The
+    computation is done in float32 like in cylimiter, and the output matches cylimiter
+    within 1e-6.
+
+    :param samples: float32 array with shape (num_samples,) or (num_channels, num_samples)
+    :param attack: The attack coefficient (between 0 and 1) of the gain smoothing
+    :param release: The release coefficient (between 0 and 1) of the envelope follower
+    :param delay: The delay of the signal in samples (at least 1). A delay of 1 means
+        that the signal is not delayed.
+    :param threshold: The (linear) level above which the limiter reduces the gain
+    """
+    assert delay >= 1
+
+    input_samples = np.ascontiguousarray(
+        samples if samples.ndim == 2 else samples[np.newaxis, :], dtype=np.float32
+    )
+    output = np.empty_like(input_samples)
+    _limiter_kernel(
+        input_samples,
+        output,
+        np.float32(attack),
+        np.float32(release),
+        int(delay),
+        np.float32(threshold),
+    )
+    return output if samples.ndim == 2 else output[0]
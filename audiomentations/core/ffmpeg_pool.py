@@ -0,0 +1,205 @@
+import atexit
+import os
+import shutil
+import threading
+from subprocess import Popen, PIPE
+from typing import List, Optional
+
+
+class FFmpegError(Exception):
+    pass
+
+
+class FFmpegProcessPool:
+    """
+    Runs ffmpeg commands on behalf of the transforms that are backed by ffmpeg.
+
+    The ffmpeg command line tool configures its filter graph once at startup, so a single
+    ffmpeg process can't be reused for requests with different filter graphs. Instead, the
+    pool manages the ffmpeg processes of all threads in the current process:
+
+    * At most `max_workers` ffmpeg processes run at the same time. Further requests wait
+        for a free slot instead of oversubscribing the CPU.
+    * A process that does not finish within `timeout` seconds gets killed, and a process
+        that gets killed by a signal (e.g. by the OOM killer) is treated as a crash. In both
+        cases the request is retried up to `max_retries` times before an FFmpegError is raised.
+    * Processes that are still running when the interpreter exits get killed.
+
+    Use get_ffmpeg_pool() to get the shared pool of the current process. A forked process
+    (e.g. a PyTorch DataLoader worker) gets its own pool the first time it asks for one.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = 60.0,
+        max_retries: int = 1,
+        executable: Optional[str] = None,
+    ):
+        """
+        :param max_workers: The maximum number of ffmpeg processes that may run at the same
+            time. Defaults to the number of CPUs.
+        :param timeout: Time limit in seconds for each ffmpeg process. None means no limit.
+        :param max_retries: How many times a request gets retried after a timeout or a crash
+        :param executable: Path to the ffmpeg executable. By default, ffmpeg is looked up
+            in PATH.
+        """
+        assert max_workers is None or max_workers >= 1
+        assert max_retries >= 0
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.executable = executable or shutil.which("ffmpeg") or "ffmpeg"
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._lock = threading.Lock()
+        self._running_processes = set()
+
+    def run(
+        self, args: List[str], input_data, expected_output_size: Optional[int] = None
+    ) -> bytearray:
+        """
+        Run ffmpeg with the given arguments, feed it `input_data` through stdin and
+        return what it writes to stdout.
+
+        :param args: The ffmpeg arguments, without the leading executable
+        :param input_data: A bytes-like object (e.g. a contiguous numpy array) to write to
+            the stdin of the ffmpeg process
+        :param expected_output_size: The expected number of bytes in the output, if known.
+            The output is then read directly into a buffer of that size.
+        """
+        cmd = [self.executable, "-hide_banner", "-nostats", *args]
+        input_view = memoryview(input_data).cast("B")
+        with self._slots:
+            for _ in range(self.max_retries + 1):
+                process = Popen(cmd, stdin=PIPE, stdout=PIPE, stderr=PIPE)
+                with self._lock:
+                    self._running_processes.add(process)
+                timed_out = threading.Event()
+
+                def kill_after_timeout():
+                    timed_out.set()
+                    process.kill()
+
+                timer = None
+                if self.timeout is not None:
+                    timer = threading.Timer(self.timeout, kill_after_timeout)
+                    timer.start()
+                try:
+                    output, stderr = self._communicate(
+                        process, input_view, expected_output_size
+                    )
+                finally:
+                    if timer is not None:
+                        timer.cancel()
+                    with self._lock:
+                        self._running_processes.discard(process)
+
+                if timed_out.is_set():
+                    error = FFmpegError(
+                        "ffmpeg did not finish within {} seconds".format(self.timeout)
+                    )
+                    continue
+                if process.returncode < 0:
+                    error = FFmpegError(
+                        "ffmpeg was killed by signal {}".format(-process.returncode)
+                    )
+                    continue
+                if process.returncode != 0 or b"Error" in stderr:
+                    raise FFmpegError(stderr.decode(errors="replace"))
+                return output
+        raise error
+
+    @staticmethod
+    def _communicate(process, input_view, expected_output_size):
+        """
+        Write the input to stdin and read stdout into a preallocated buffer, while stderr
+        is collected in the background so the process never blocks on a full pipe.
+        """
+        stderr_chunks = []
+
+        def write_input():
+            try:
+                process.stdin.write(input_view)
+            except (BrokenPipeError, OSError):
+                # ffmpeg exited early, e.g. because of an invalid filter graph
+                pass
+            finally:
+                try:
+                    process.stdin.close()
+                except (BrokenPipeError, OSError):
+                    pass
+
+        def read_stderr():
+            stderr_chunks.append(process.stderr.read())
+
+        threads = [
+            threading.Thread(target=write_input, daemon=True),
+            threading.Thread(target=read_stderr, daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+
+        output = bytearray(expected_output_size or 0)
+        output_view = memoryview(output)
+        num_bytes_read = 0
+        while num_bytes_read < len(output):
+            n = process.stdout.readinto(output_view[num_bytes_read:])
+            if not n:
+                break
+            num_bytes_read += n
+        output_view.release()
+        if num_bytes_read < len(output):
+            del output[num_bytes_read:]
+        else:
+            # Read whatever exceeds the expected size (or everything, if the size was unknown)
+            output += process.stdout.read()
+        process.stdout.close()
+
+        for thread in threads:
+            thread.join()
+        process.stderr.close()
+        process.wait()
+        return output, b"".join(stderr_chunks)
+
+    def shutdown(self):
+        """Kill all ffmpeg processes that are still running"""
+        with self._lock:
+            processes = list(self._running_processes)
+        for process in processes:
+            if process.poll() is None:
+                process.kill()
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_ffmpeg_pool() -> FFmpegProcessPool:
+    """Return the ffmpeg process pool of the current process"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = FFmpegProcessPool()
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def configure_ffmpeg_pool(**kwargs) -> FFmpegProcessPool:
+    """
+    Replace the ffmpeg process pool of the current process by a new one that is created
+    with the given keyword arguments, e.g. configure_ffmpeg_pool(max_workers=2, timeout=10)
+    """
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown()
+        _pool = FFmpegProcessPool(**kwargs)
+        _pool_pid = os.getpid()
+        return _pool
+
+
+@atexit.register
+def _shutdown_ffmpeg_pool():
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.shutdown()
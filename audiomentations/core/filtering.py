@@ -0,0 +1,144 @@
+import math
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from scipy.signal import sosfilt, sosfilt_zi, sosfiltfilt
+
+from audiomentations.core.cache import LRUCache
+
+# The filter designs of all filter transforms in the process. An entry takes a few hundred
+# bytes at most, so this holds thousands of designs. SOS_DESIGN_CACHE.hits and
+# SOS_DESIGN_CACHE.misses count the lookups, and SOS_DESIGN_CACHE.clear() empties it.
+SOS_DESIGN_CACHE = LRUCache(max_bytes=4 * 1024 * 1024)
+
+# The filter parameters are rounded to this many significant digits before the design, so
+# values that only differ by floating point noise share a cache entry
+DESIGN_PARAMETER_SIGNIFICANT_DIGITS = 10
+
+
+def apply_sos_filter(sos: np.ndarray, samples: np.ndarray, zero_phase: bool = False):
+    """
+    Filter the samples along the last axis with a cascade of second-order sections and
+    return the result as float32. All channels are filtered in one call.
+
+    :param sos: Filter coefficients in `sos` format, with shape (n_sections, 6)
+    :param samples: numpy array with shape (num_samples,) or (num_channels, num_samples)
+    :param zero_phase: If True, filter forwards and backwards with `sosfiltfilt`. Otherwise,
+        the filter state is initialized to the steady state that corresponds to the first
+        sample of each channel, so the output does not start with a transient.
+    """
+    if zero_phase:
+        return sosfiltfilt(sos, samples, axis=-1).astype(np.float32)
+
+    zi_shape = (sos.shape[0],) + (1,) * (samples.ndim - 1) + (2,)
+    zi = sosfilt_zi(sos).reshape(zi_shape) * samples[np.newaxis, ..., :1]
+    processed_samples, _ = sosfilt(sos, samples, axis=-1, zi=zi)
+    return processed_samples.astype(np.float32)
+
+
+def apply_sos_filter_to_batch(
+    get_sos: Callable[[dict], np.ndarray],
+    samples: np.ndarray,
+    batch_parameters: List[dict],
+    zero_phase: bool = False,
+) -> np.ndarray:
+    """
+    Filter the items of a batch that have should_apply set, each with the filter that
+    get_sos(parameters) returns for it, and return the result as float32. Items that get
+    the same design (e.g. because the parameters are snapped to a grid) are filtered
+    together in one call, so the number of calls is the number of distinct designs.
+
+    :param get_sos: A function that takes the parameters of an item and returns the filter
+        coefficients in `sos` format
+    :param samples: numpy array with shape (batch_size, num_samples) or
+        (batch_size, num_channels, num_samples)
+    :param batch_parameters: The parameters of each item
+    :param zero_phase: See apply_sos_filter
+    """
+    groups = {}
+    for i, parameters in enumerate(batch_parameters):
+        if parameters["should_apply"]:
+            sos = get_sos(parameters)
+            groups.setdefault((sos.shape, sos.tobytes()), (sos, []))[1].append(i)
+
+    processed_samples = samples.copy()
+    for sos, indices in groups.values():
+        processed_samples[indices] = apply_sos_filter(
+            sos, samples[indices], zero_phase=zero_phase
+        )
+    return processed_samples
+
+
+def quantize_design_parameter(value: float) -> float:
+    """Round a filter parameter to DESIGN_PARAMETER_SIGNIFICANT_DIGITS significant digits"""
+    if value == 0.0:
+        return 0.0
+    digits = DESIGN_PARAMETER_SIGNIFICANT_DIGITS - 1 - math.floor(math.log10(abs(value)))
+    return round(float(value), digits)
+
+
+def get_cached_sos(
+    filter_type: str,
+    order: int,
+    parameters: Tuple[float, ...],
+    sample_rate: int,
+    design: Callable[..., np.ndarray],
+) -> np.ndarray:
+    """
+    Return the filter coefficients in `sos` format for the given filter, from the shared
+    design cache. On a miss, the filter is designed with design(*quantized_parameters).
+    The design is always computed from the quantized parameters, so the result does not
+    depend on whether it came from the cache.
+
+    :param filter_type: The name of the filter, e.g. "lowpass" or "peaking"
+    :param order: The order of the filter
+    :param parameters: The frequencies, gains, Q factors etc. of the filter
+    :param sample_rate: The sample rate
+    :param design: A function that takes the quantized parameters and returns the filter
+        coefficients in `sos` format
+    """
+    parameters = tuple(quantize_design_parameter(value) for value in parameters)
+    key = (filter_type, int(order), parameters, int(sample_rate))
+    sos = SOS_DESIGN_CACHE.get_or_compute(
+        key, lambda: np.asarray(design(*parameters), dtype=np.float64)
+    )
+    # scipy's filter functions don't accept read-only arrays, so the cached array is
+    # protected by handing out copies
+    return sos.copy()
+
+
+def snap_to_octave_grid(
+    value: float,
+    steps_per_octave: Optional[int],
+    min_value: float = 0.0,
+    max_value: float = math.inf,
+) -> float:
+    """
+    Round a positive value (e.g. a frequency or a Q factor) to the nearest point of a
+    logarithmic grid with steps_per_octave points per octave, and clip it to
+    [min_value, max_value]. With a coarser grid, randomized filters are more likely to
+    share a design in SOS_DESIGN_CACHE. If steps_per_octave is None, the value is returned
+    unchanged.
+    """
+    if steps_per_octave is None:
+        return value
+    snapped_value = 2.0 ** (round(math.log2(value) * steps_per_octave) / steps_per_octave)
+    return min(max(snapped_value, min_value), max_value)
+
+
+def snap_gain_db_to_octave_grid(
+    gain_db: float,
+    steps_per_octave: Optional[int],
+    min_gain_db: float = -math.inf,
+    max_gain_db: float = math.inf,
+) -> float:
+    """
+    Round a gain in dB so the amplitude ratio lies on a logarithmic grid with
+    steps_per_octave points per octave (i.e. steps of 6.02 / steps_per_octave dB), and clip
+    it to [min_gain_db, max_gain_db]. If steps_per_octave is None, the gain is returned
+    unchanged.
+    """
+    if steps_per_octave is None:
+        return gain_db
+    step = 20 * math.log10(2) / steps_per_octave
+    return min(max(round(gain_db / step) * step, min_gain_db), max_gain_db)
@@ -0,0 +1,114 @@
+"""
+G.711 mu-law and A-law companding, implemented with lookup tables. The tables follow the
+reference implementation of the codec that sox and the `audioop` module use, so encoding
+16-bit audio gives the same 8-bit codes.
+"""
+import functools
+
+import numpy as np
+
+ENCODINGS = ("ULAW", "ALAW")
+
+# The upper bounds of the eight segments of the codecs
+_ULAW_SEGMENT_ENDS = np.array(
+    [0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF], dtype=np.int32
+)
+_ALAW_SEGMENT_ENDS = np.array(
+    [0x1F, 0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF], dtype=np.int32
+)
+_ULAW_BIAS = 0x84
+_ULAW_CLIP = 8159
+
+
+def _get_all_int16_values() -> np.ndarray:
+    return np.arange(-32768, 32768, dtype=np.int32)
+
+
+@functools.lru_cache(maxsize=None)
+def get_encoding_table(encoding: str) -> np.ndarray:
+    """
+    Return a (cached, read-only) table with the 8-bit code of each 16-bit sample value.
+    The table is indexed by the sample value + 32768.
+
+    :param encoding: "ULAW" or "ALAW"
+    """
+    assert encoding in ENCODINGS
+    values = _get_all_int16_values()
+    if encoding == "ULAW":
+        # mu-law has a resolution of 14 bits
+        values = values >> 2
+        mask = np.where(values < 0, 0x7F, 0xFF)
+        magnitude = np.minimum(np.abs(values), _ULAW_CLIP) + (_ULAW_BIAS >> 2)
+        segment = np.searchsorted(_ULAW_SEGMENT_ENDS, magnitude)
+        code = (np.minimum(segment, 7) << 4) | ((magnitude >> (segment + 1)) & 0xF)
+        code = np.where(segment >= 8, 0x7F, code)
+    else:
+        # A-law has a resolution of 13 bits
+        values = values >> 3
+        mask = np.where(values >= 0, 0xD5, 0x55)
+        magnitude = np.where(values >= 0, values, -values - 1)
+        segment = np.searchsorted(_ALAW_SEGMENT_ENDS, magnitude)
+        shift = np.where(segment < 2, 1, segment)
+        code = (np.minimum(segment, 7) << 4) | ((magnitude >> shift) & 0xF)
+        code = np.where(segment >= 8, 0x7F, code)
+    table = (code ^ mask).astype(np.uint8)
+    table.flags.writeable = False
+    return table
+
+
+@functools.lru_cache(maxsize=None)
+def get_decoding_table(encoding: str) -> np.ndarray:
+    """
+    Return a (cached, read-only) table with the float32 sample value of each 8-bit code
+
+    :param encoding: "ULAW" or "ALAW"
+    """
+    assert encoding in ENCODINGS
+    codes = np.arange(256, dtype=np.int32)
+    if encoding == "ULAW":
+        codes = ~codes & 0xFF
+        t = (((codes & 0xF) << 3) + _ULAW_BIAS) << ((codes & 0x70) >> 4)
+        values = np.where(codes & 0x80, _ULAW_BIAS - t, t - _ULAW_BIAS)
+    else:
+        codes = codes ^ 0x55
+        segment = (codes & 0x70) >> 4
+        t = (codes & 0xF) << 4
+        t = np.where(
+            segment == 0, t + 8, (t + 0x108) << np.maximum(segment - 1, 0)
+        )
+        values = np.where(codes & 0x80, t, -t)
+    table = (values / 32768).astype(np.float32)
+    table.flags.writeable = False
+    return table
+
+
+def encode(samples: np.ndarray, encoding: str = "ULAW") -> np.ndarray:
+    """
+    Encode float samples (in the range [-1, 1]) to 8-bit G.711 codes
+
+    :param samples: float array of any shape
+    :param encoding: "ULAW" or "ALAW"
+    """
+    int_samples = np.clip(np.rint(samples * 32768.0), -32768, 32767).astype(np.int32)
+    return get_encoding_table(encoding)[int_samples + 32768]
+
+
+def decode(codes: np.ndarray, encoding: str = "ULAW") -> np.ndarray:
+    """
+    Decode 8-bit G.711 codes to float32 samples
+
+    :param codes: uint8 array of any shape
+    :param encoding: "ULAW" or "ALAW"
+    """
+    return get_decoding_table(encoding)[codes]
+
+
+def apply_g711_codec(samples: np.ndarray, encoding: str = "ULAW") -> np.ndarray:
+    """
+    Encode and decode the audio with the G.711 codec, i.e. quantize it to 8 bits with
+    mu-law or A-law companding
+
+    :param samples: float array of any shape
+    :param encoding: "ULAW" or "ALAW"
+    """
+    return decode(encode(samples, encoding), encoding)
@@ -0,0 +1,317 @@
+"""
+Room impulse responses of shoebox rooms with the image source method, without
+pyroomacoustics. The image sources of a batch of rooms are computed as numpy arrays and
+rendered with windowed-sinc fractional delays. The output matches pyroomacoustics (a room
+with one source, one omnidirectional microphone, the same absorption coefficient on all
+surfaces, air absorption and no ray tracing) up to float precision, because the same
+constants, the same sinc look-up table, the same octave band split for the air absorption
+and the same high-pass filter are used.
+"""
+import functools
+import itertools
+import math
+from typing import List, Tuple
+
+import numba
+import numpy as np
+from scipy.signal import iirfilter, sosfiltfilt
+
+SPEED_OF_SOUND = 343.0
+FRACTIONAL_DELAY_LENGTH = 81
+SINC_LUT_GRANULARITY = 20
+OCTAVE_BANDS_BASE_FREQUENCY = 125.0
+# Air absorption in 1/m at 20 °C and 30-50 % humidity (the default of pyroomacoustics)
+AIR_ABSORPTION_CENTER_FREQUENCIES = (125.0, 250.0, 500.0, 1000.0, 2000.0, 4000.0, 8000.0)
+AIR_ABSORPTION_COEFFICIENTS = (1e-4, 3e-4, 6e-4, 1e-3, 1.9e-3, 5.8e-3, 20.3e-3)
+HIGHPASS_CUTOFF = 10.0
+
+
+def inverse_sabine(
+    rt60: float, room_size, speed_of_sound: float = SPEED_OF_SOUND
+) -> Tuple[float, int]:
+    """
+    Return the energy absorption coefficient that gives the target RT60 in a shoebox
+    room according to Sabine's formula, and the image source order that is needed to
+    reach that RT60. Same as pyroomacoustics.inverse_sabine.
+
+    :param rt60: The target RT60 in seconds
+    :param room_size: The (x, y, z) size of the room in meters
+    :param speed_of_sound: The speed of sound in m/s
+    """
+    pairs = list(itertools.combinations(room_size, 2))
+    volume = np.prod(room_size)
+    surface = 2 * np.sum([l1 * l2 for l1, l2 in pairs])
+    absorption = 24 * np.log(10) * volume / (speed_of_sound * surface * rt60)
+    if absorption > 1.0:
+        raise ValueError(
+            "evaluation of parameters failed. room may be too large for required RT60."
+        )
+    # The largest sphere that fits in the diamond of image rooms up to the order
+    radius = min(l1 * l2 / np.sqrt(l1**2 + l2**2) for l1, l2 in pairs)
+    max_order = int(math.ceil(speed_of_sound * rt60 / radius - 1))
+    return absorption, max_order
+
+
+@functools.lru_cache(maxsize=None)
+def get_image_source_indices(max_order: int) -> np.ndarray:
+    """
+    Return the (x, y, z) indices of the image rooms with at most max_order reflections,
+    as an int array with shape (num_image_sources, 3). The array is read-only, because
+    it is cached.
+    """
+    assert max_order >= 0
+    r = np.arange(-max_order, max_order + 1)
+    indices = np.stack(np.meshgrid(r, r, r, indexing="ij"), axis=-1).reshape((-1, 3))
+    indices = indices[np.sum(np.abs(indices), axis=-1) <= max_order]
+    indices.flags.writeable = False
+    return indices
+
+
+def compute_image_sources(
+    room_sizes: np.ndarray,
+    source_positions: np.ndarray,
+    mic_positions: np.ndarray,
+    absorption_coefficients: np.ndarray,
+    max_order: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the image sources of a batch of shoebox rooms and return the distance of
+    every image source to the microphone and its amplitude (the product of the reflection
+    coefficients of the walls, divided by the distance). Both have the shape
+    (num_rooms, num_image_sources).
+
+    :param room_sizes: float array with shape (num_rooms, 3)
+    :param source_positions: float array with shape (num_rooms, 3)
+    :param mic_positions: float array with shape (num_rooms, 3)
+    :param absorption_coefficients: The energy absorption coefficient of the surfaces
+        of each room, with shape (num_rooms,)
+    :param max_order: The maximum number of reflections
+    """
+    indices = get_image_source_indices(max_order)
+    # Like in pyroomacoustics, the image sources are computed in float32
+    room_sizes = np.asarray(room_sizes, dtype=np.float32)[:, np.newaxis, :]
+    source_positions = np.asarray(source_positions, dtype=np.float32)[:, np.newaxis, :]
+    mic_positions = np.asarray(mic_positions, dtype=np.float64)[:, np.newaxis, :]
+
+    # Along each axis, an odd number of reflections mirrors the source
+    image_positions = indices.astype(np.float32) * room_sizes + np.where(
+        indices % 2 == 1, room_sizes - source_positions, source_positions
+    )
+    distances = np.sqrt(np.sum((image_positions - mic_positions) ** 2, axis=-1))
+
+    orders = np.sum(np.abs(indices), axis=-1)
+    reflection_coefficients = np.sqrt(
+        1.0 - np.asarray(absorption_coefficients, dtype=np.float64)
+    )
+    amplitudes = reflection_coefficients[:, np.newaxis] ** orders / distances
+    return distances, amplitudes
+
+
+@functools.lru_cache(maxsize=None)
+def get_octave_band_centers(sample_rate: int) -> np.ndarray:
+    num_bands = math.floor(np.log2(sample_rate / OCTAVE_BANDS_BASE_FREQUENCY))
+    return OCTAVE_BANDS_BASE_FREQUENCY * 2.0 ** np.arange(num_bands)
+
+
+@functools.lru_cache(maxsize=None)
+def get_air_absorption_coefficients(sample_rate: int) -> np.ndarray:
+    """
+    Return the air absorption coefficients (in 1/m) of the octave bands at the given
+    sample rate, interpolated (and extrapolated) linearly on a log-frequency axis
+    """
+    centers = np.log2(AIR_ABSORPTION_CENTER_FREQUENCIES)
+    coefficients = np.array(AIR_ABSORPTION_COEFFICIENTS)
+    band_centers = np.log2(get_octave_band_centers(sample_rate))
+    result = np.interp(band_centers, centers, coefficients)
+    # np.interp does not extrapolate, so extend the last segment for the higher bands
+    slope = (coefficients[-1] - coefficients[-2]) / (centers[-1] - centers[-2])
+    above = band_centers > centers[-1]
+    result[above] = coefficients[-1] + slope * (band_centers[above] - centers[-1])
+    return np.clip(result, 0.0, 1.0)
+
+
+@functools.lru_cache(maxsize=64)
+def get_octave_band_responses(n_fft: int, sample_rate: int) -> np.ndarray:
+    """
+    Return the squared frequency responses of the octave band filters (Antoni's
+    orthogonal-like filter bank with a band overlap of 0.5, like in pyroomacoustics),
+    with shape (num_bands, n_fft // 2 + 1). They sum to one, so splitting a signal into
+    bands and adding them up gives back the signal.
+    """
+    centers = get_octave_band_centers(sample_rate)
+    num_bands = len(centers)
+    num_frequencies = n_fft // 2 + 1
+    lower_bins = np.round(centers / np.sqrt(2) / sample_rate * n_fft).astype(int)
+    center_bins = np.round(centers / sample_rate * n_fft).astype(int)
+    upper_bins = np.round(centers * np.sqrt(2) / sample_rate * n_fft).astype(int)
+    overlaps = np.round(0.5 * (upper_bins - center_bins)).astype(int)
+
+    windows = np.ones((num_bands, num_frequencies))
+    for band in range(1, num_bands):
+        k, p = lower_bins[band], overlaps[band]
+        if p > 0:
+            phi = 0.5 * (np.arange(-p, p + 1) / p + 1)
+            windows[band - 1, k - p : k + p + 1] = np.cos(np.pi / 2 * phi)
+            windows[band, k - p : k + p + 1] = np.sin(np.pi / 2 * phi)
+        windows[band - 1, k + p :] = 0.0
+        windows[band, : k - p] = 0.0
+    responses = windows**2
+    responses.flags.writeable = False
+    return responses
+
+
+@functools.lru_cache(maxsize=1)
+def _get_fractional_delay_tables() -> Tuple[np.ndarray, np.ndarray]:
+    # The sinc look-up table and the Hann window, computed in float32 exactly like in
+    # pyroomacoustics (including the accumulated rounding errors of the table positions),
+    # which keeps the RIRs within float32 precision of the ones of pyroomacoustics
+    size = (FRACTIONAL_DELAY_LENGTH + 2) * SINC_LUT_GRANULARITY
+    step = np.float32(1.0) / np.float32(SINC_LUT_GRANULARITY)
+    positions = np.empty(size, dtype=np.float32)
+    position = np.float32(-(FRACTIONAL_DELAY_LENGTH // 2) - 1)
+    for i in range(size):
+        positions[i] = position
+        position = np.float32(position + step)
+    pi = np.float32(np.pi)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lut = np.where(
+            positions == 0.0, np.float32(1.0), np.sin(pi * positions) / (pi * positions)
+        )
+    k = np.arange(FRACTIONAL_DELAY_LENGTH, dtype=np.float32)
+    window = np.float32(0.5) - np.float32(0.5) * np.cos(
+        pi * np.float32(2.0) * k / np.float32(FRACTIONAL_DELAY_LENGTH - 1)
+    )
+    return lut.astype(np.float64), window.astype(np.float64)
+
+
+@numba.njit(cache=True, nogil=True)
+def _render_kernel(rirs, sample_positions, amplitudes, lut, window, granularity):
+    num_rooms, num_bands, _ = rirs.shape
+    num_taps = window.shape[0]
+    half_length = num_taps // 2
+    taps = np.empty(num_taps)
+    for r in range(num_rooms):
+        for i in range(sample_positions.shape[1]):
+            # Windowed sinc, interpolated linearly from the look-up table
+            position = sample_positions[r, i]
+            integer_position = math.floor(position)
+            offset = (1.0 - (position - integer_position)) * granularity
+            lut_position = int(math.floor(offset))
+            lut_fraction = offset - lut_position
+            for k in range(num_taps):
+                value = lut[lut_position]
+                taps[k] = window[k] * (
+                    value + lut_fraction * (lut[lut_position + 1] - value)
+                )
+                lut_position += granularity
+            start = integer_position - half_length
+            for b in range(num_bands):
+                amplitude = amplitudes[r, b, i]
+                for k in range(num_taps):
+                    rirs[r, b, start + k] += amplitude * taps[k]
+
+
+def render_rirs(
+    distances: np.ndarray,
+    amplitudes: np.ndarray,
+    sample_rate: int,
+    air_absorption: bool = True,
+    highpass: bool = True,
+) -> List[np.ndarray]:
+    """
+    Render the room impulse responses of a batch of rooms, given the distances and the
+    amplitudes of their image sources (see compute_image_sources). The RIRs are delayed
+    by half the length of the fractional delay filter (40 samples), like in
+    pyroomacoustics, and have different lengths, so a list of float32 arrays is returned.
+
+    :param distances: float array with shape (num_rooms, num_image_sources)
+    :param amplitudes: float array with shape (num_rooms, num_image_sources)
+    :param sample_rate: The sample rate of the RIRs
+    :param air_absorption: Whether to attenuate the high frequencies of far image
+        sources more, according to the air absorption in each octave band
+    :param highpass: Whether to remove the DC component with a 10 Hz high-pass filter
+    """
+    half_length = FRACTIONAL_DELAY_LENGTH // 2
+    times = (distances / SPEED_OF_SOUND + half_length / sample_rate).astype(np.float32)
+    sample_positions = (np.float32(sample_rate) * times).astype(np.float64)
+    lengths = np.ceil(np.amax(sample_positions, axis=-1) + half_length + 1).astype(
+        int
+    ) + 1
+
+    if air_absorption:
+        coefficients = get_air_absorption_coefficients(sample_rate)
+        band_amplitudes = amplitudes[:, np.newaxis, :] * np.exp(
+            -0.5 * coefficients[:, np.newaxis] * distances[:, np.newaxis, :]
+        )
+    else:
+        band_amplitudes = amplitudes[:, np.newaxis, :]
+
+    band_rirs = np.zeros(
+        (len(distances), band_amplitudes.shape[1], int(np.amax(lengths)))
+    )
+    lut, window = _get_fractional_delay_tables()
+    _render_kernel(
+        band_rirs,
+        np.ascontiguousarray(sample_positions),
+        np.ascontiguousarray(band_amplitudes),
+        lut,
+        window,
+        SINC_LUT_GRANULARITY,
+    )
+
+    rirs = [None] * len(distances)
+    if air_absorption:
+        # Split each band RIR into its octave band and add up the bands. The FFT size
+        # depends on the length, so the rooms are processed in groups.
+        n_ffts = 2 ** np.ceil(np.log2(2 * lengths)).astype(int)
+        for n_fft in np.unique(n_ffts):
+            group = np.flatnonzero(n_ffts == n_fft)
+            spectra = np.fft.rfft(band_rirs[group], n=n_fft, axis=-1)
+            spectrum = np.sum(
+                spectra * get_octave_band_responses(int(n_fft), sample_rate), axis=1
+            )
+            group_rirs = np.fft.irfft(spectrum, n=n_fft, axis=-1)
+            for i, rir in zip(group, group_rirs):
+                rirs[i] = rir[: lengths[i]]
+    else:
+        for i in range(len(distances)):
+            rirs[i] = band_rirs[i, 0, : lengths[i]]
+
+    if highpass:
+        sos = iirfilter(
+            2,
+            Wn=2.0 * HIGHPASS_CUTOFF / sample_rate,
+            btype="highpass",
+            ftype="butter",
+            output="sos",
+        )
+        rirs = [sosfiltfilt(sos, rir) for rir in rirs]
+    return [rir.astype(np.float32) for rir in rirs]
+
+
+def generate_shoebox_rirs(
+    room_sizes: np.ndarray,
+    source_positions: np.ndarray,
+    mic_positions: np.ndarray,
+    absorption_coefficients: np.ndarray,
+    max_order: int,
+    sample_rate: int,
+    air_absorption: bool = True,
+) -> List[np.ndarray]:
+    """
+    Simulate a batch of shoebox rooms with the image source method and return their room
+    impulse responses, as a list of float32 arrays
+
+    :param room_sizes: The (x, y, z) size of each room in meters, shape (num_rooms, 3)
+    :param source_positions: The position of the source in each room, shape (num_rooms, 3)
+    :param mic_positions: The position of the microphone in each room, shape (num_rooms, 3)
+    :param absorption_coefficients: The energy absorption coefficient (between 0 and 1)
+        of all surfaces of each room, shape (num_rooms,)
+    :param max_order: The maximum number of reflections
+    :param sample_rate: The sample rate of the RIRs
+    :param air_absorption: Whether to simulate air absorption
+    """
+    distances, amplitudes = compute_image_sources(
+        room_sizes, source_positions, mic_positions, absorption_coefficients, max_order
+    )
+    return render_rirs(distances, amplitudes, sample_rate, air_absorption)
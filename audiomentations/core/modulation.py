@@ -0,0 +1,164 @@
+"""
+In-process LFO (low-frequency oscillator) based effects. They follow the semantics of the
+corresponding ffmpeg filters, so the transforms that used to call ffmpeg can use them as a
+drop-in replacement, without spawning a subprocess for each sound.
+"""
+import math
+
+import numba
+import numpy as np
+
+WAVE_TYPES = ("sinusoidal", "triangular")
+
+
+def generate_wave_table(
+    wave_type: str,
+    table_size: int,
+    min_value: float,
+    max_value: float,
+    phase: float,
+    round_to_int: bool = False,
+) -> np.ndarray:
+    """
+    Generate one period of a sine or triangle wave that oscillates between min_value and
+    max_value, like ffmpeg's ff_generate_wave_table
+
+    :param wave_type: "sinusoidal" or "triangular"
+    :param table_size: The length of the period, in samples
+    :param min_value: The minimum value of the wave
+    :param max_value: The maximum value of the wave
+    :param phase: The phase offset in radians
+    :param round_to_int: If True, round the values to the nearest integer (away from
+        zero at .5), which is what ffmpeg does for integer tables
+    """
+    assert wave_type in WAVE_TYPES
+    phase_offset = int(phase / math.pi / 2 * table_size + 0.5)
+    point = (np.arange(table_size, dtype=np.int64) + phase_offset) % table_size
+    if wave_type == "sinusoidal":
+        table = (np.sin(point / table_size * 2 * math.pi) + 1) / 2
+    else:
+        table = point * 2.0 / table_size
+        quadrant = 4 * point // table_size
+        table = np.where(
+            quadrant == 0,
+            table + 0.5,
+            np.where(quadrant == 3, table - 1.5, 1.5 - table),
+        )
+    table = table * (max_value - min_value) + min_value
+    if round_to_int:
+        table = np.trunc(table + np.where(table < 0, -0.5, 0.5)).astype(np.int64)
+    return table
+
+
+def get_tremolo_table(sample_rate: int, frequency: float, depth: float) -> np.ndarray:
+    """
+    Return one period of the gain curve of the tremolo effect
+    """
+    offset = 1.0 - depth / 2.0
+    # Same as lrint(sample_rate / frequency + 0.5) in ffmpeg, i.e. round half to even
+    table_size = int(np.rint(sample_rate / frequency + 0.5))
+    env = frequency * np.arange(table_size) / sample_rate
+    env = np.sin(2 * math.pi * np.fmod(env + 0.25, 1.0))
+    return env * (1 - abs(offset)) + offset
+
+
+def get_tremolo_gain(
+    num_samples: int, sample_rate: int, frequency: float, depth: float
+) -> np.ndarray:
+    """
+    Return the tremolo gain curve for a sound with the given number of samples
+    """
+    return np.resize(get_tremolo_table(sample_rate, frequency, depth), num_samples)
+
+
+def tremolo(
+    samples: np.ndarray, sample_rate: int, frequency: float = 5.0, depth: float = 0.5
+) -> np.ndarray:
+    """
+    Sinusoidal amplitude modulation with the same semantics and defaults as ffmpeg's
+    tremolo filter. The output is identical to ffmpeg's output for float32 input.
+
+    :param samples: float32 array with shape (num_samples,) or (num_channels, num_samples)
+    :param sample_rate: The sample rate of the audio
+    :param frequency: The modulation frequency in Hz
+    :param depth: The modulation depth, between 0 and 1
+    """
+    assert frequency > 0.0
+    assert 0.0 <= depth <= 1.0
+    gain = get_tremolo_gain(samples.shape[-1], sample_rate, frequency, depth)
+    return (samples * gain).astype(np.float32)
+
+
+@numba.njit(cache=True, nogil=True)
+def _phaser_kernel(samples, output, modulation, delay_length, in_gain, out_gain, decay):
+    num_channels, num_samples = samples.shape
+    modulation_length = modulation.shape[0]
+    delay_buffer = np.zeros(delay_length)
+    for c in range(num_channels):
+        delay_buffer[:] = 0.0
+        delay_pos = 0
+        modulation_pos = 0
+        for i in range(num_samples):
+            pos = delay_pos + modulation[modulation_pos]
+            if pos >= delay_length:
+                pos -= delay_length
+            delay_pos += 1
+            if delay_pos >= delay_length:
+                delay_pos = 0
+            v = samples[c, i] * in_gain + delay_buffer[pos] * decay
+            delay_buffer[delay_pos] = v
+            output[c, i] = v * out_gain
+            modulation_pos += 1
+            if modulation_pos >= modulation_length:
+                modulation_pos = 0
+
+
+def phaser(
+    samples: np.ndarray,
+    sample_rate: int,
+    in_gain: float = 0.4,
+    out_gain: float = 0.74,
+    delay: float = 3.0,
+    decay: float = 0.4,
+    speed: float = 0.5,
+    wave_type: str = "triangular",
+) -> np.ndarray:
+    """
+    Phaser effect (a feedback delay line with an LFO-modulated delay time) with the same
+    semantics and defaults as ffmpeg's aphaser filter. The output is identical to ffmpeg's
+    output for float32 input.
+
+    :param samples: float32 array with shape (num_samples,) or (num_channels, num_samples)
+    :param sample_rate: The sample rate of the audio
+    :param in_gain: Input gain
+    :param out_gain: Output gain
+    :param delay: The maximum delay in milliseconds
+    :param decay: The feedback gain
+    :param speed: The modulation speed in Hz
+    :param wave_type: "sinusoidal" or "triangular"
+    """
+    delay_length = int(delay * 0.001 * sample_rate + 0.5)
+    assert delay_length > 0
+    assert speed > 0.0
+    modulation = generate_wave_table(
+        wave_type,
+        int(sample_rate / speed + 0.5),
+        1.0,
+        float(delay_length),
+        math.pi / 2.0,
+        round_to_int=True,
+    )
+    input_samples = np.ascontiguousarray(
+        samples if samples.ndim == 2 else samples[np.newaxis, :], dtype=np.float32
+    )
+    output = np.empty_like(input_samples)
+    _phaser_kernel(
+        input_samples,
+        output,
+        modulation,
+        delay_length,
+        float(in_gain),
+        float(out_gain),
+        float(decay),
+    )
+    return output if samples.ndim == 2 else output[0]
@@ -0,0 +1,212 @@
+import math
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import List, Optional, Union
+
+import numpy as np
+
+from audiomentations.core.audio_cache import (
+    SUPPORTED_DTYPES,
+    compact_samples,
+    expand_samples,
+)
+from audiomentations.core.audio_loading_utils import load_sound_file
+from audiomentations.core.utils import find_audio_files_in_paths, replace_directory
+
+SAMPLES_FILE_NAME = "samples.raw"
+INDEX_FILE_NAME = "index.npz"
+
+
+def _load_mono_sound(file_path, sample_rate):
+    samples, _ = load_sound_file(file_path, sample_rate)
+    return samples
+
+
+class NoiseBank:
+    """
+    A corpus of sounds that are resampled to a common sample rate, mixed down to mono and
+    concatenated into one memory-mapped array, so a window of a sound is read directly from
+    the page cache, which is shared by all processes on a machine (e.g. DataLoader workers),
+    instead of decoding the file or caching it in the memory of each process.
+
+    On disk, a bank is a folder with two files:
+
+    * samples.raw: The samples of all sounds, one after another, as raw int16, float16 or
+        float32 values (in the native byte order). int16 values are scaled by 32767.
+    * index.npz: The path of the original file, the offset and the length of each sound,
+        the sample rate and the dtype.
+    """
+
+    def __init__(self, path: Union[Path, str]):
+        """
+        :param path: The folder of the bank
+        """
+        self.path = str(path)
+        self._init_state()
+
+    def _init_state(self):
+        self._samples = None
+        self._index = None
+        self._file_indices = None
+        self._pid = None
+
+    @staticmethod
+    def exists(path: Union[Path, str]) -> bool:
+        return os.path.isfile(os.path.join(path, SAMPLES_FILE_NAME)) and os.path.isfile(
+            os.path.join(path, INDEX_FILE_NAME)
+        )
+
+    @classmethod
+    def build(
+        cls,
+        sounds_path: Union[List[Path], List[str], Path, str],
+        path: Union[Path, str],
+        sample_rate: int,
+        dtype: str = "float32",
+        num_workers: Optional[int] = None,
+    ) -> "NoiseBank":
+        """
+        Load all audio files in the given path(s) at the given sample rate, store them as a
+        bank in the given folder and return it. The sounds are decoded in parallel and
+        written to disk one by one, so the whole corpus never has to fit in memory. The
+        bank is written to a temporary folder first. An existing bank is then renamed aside
+        and deleted after the new one has been moved in (see replace_directory), so readers
+        never see a partially written bank.
+
+        :param sounds_path: A path or list of paths to audio file(s) and/or folder(s) with
+            audio files. Can be str or Path instance(s).
+        :param path: The folder of the bank
+        :param sample_rate: The sample rate that the sounds get resampled to
+        :param dtype: "int16", "float16" or "float32". int16 and float16 take half the
+            space of float32. int16 clips values outside [-1, 1].
+        :param num_workers: The number of worker processes that decode the files. Defaults to
+            the number of CPUs. 1 means that the files are decoded in the current process,
+            which is also what happens in daemonic processes (e.g. DataLoader workers).
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(
+                "dtype must be one of {}, got {!r}".format(SUPPORTED_DTYPES, dtype)
+            )
+        file_paths = [str(p) for p in find_audio_files_in_paths(sounds_path)]
+        assert len(file_paths) > 0
+        num_workers = min(num_workers or os.cpu_count() or 1, len(file_paths))
+        if multiprocessing.current_process().daemon:
+            # Daemonic processes can't start child processes
+            num_workers = 1
+
+        parent = os.path.dirname(os.path.abspath(str(path)))
+        os.makedirs(parent, exist_ok=True)
+        tmp_path = tempfile.mkdtemp(prefix=".noise_bank_", dir=parent)
+        try:
+            lengths = []
+            load_sound = partial(_load_mono_sound, sample_rate=sample_rate)
+            with open(os.path.join(tmp_path, SAMPLES_FILE_NAME), "wb") as samples_file:
+                if num_workers == 1:
+                    sounds = map(load_sound, file_paths)
+                    executor = None
+                else:
+                    chunksize = max(1, math.ceil(len(file_paths) / (4 * num_workers)))
+                    executor = ProcessPoolExecutor(max_workers=num_workers)
+                    sounds = executor.map(load_sound, file_paths, chunksize=chunksize)
+                try:
+                    for samples in sounds:
+                        samples_file.write(
+                            np.ascontiguousarray(compact_samples(samples, dtype))
+                        )
+                        lengths.append(len(samples))
+                finally:
+                    if executor is not None:
+                        executor.shutdown()
+
+            lengths = np.array(lengths, dtype=np.int64)
+            np.savez(
+                os.path.join(tmp_path, INDEX_FILE_NAME),
+                file_paths=np.array(file_paths),
+                offsets=np.concatenate(([0], np.cumsum(lengths)[:-1])),
+                lengths=lengths,
+                sample_rate=np.array(sample_rate),
+                dtype=np.array(dtype),
+            )
+            replace_directory(tmp_path, str(path))
+        finally:
+            if os.path.isdir(tmp_path):
+                shutil.rmtree(tmp_path)
+
+        return cls(path)
+
+    def _load(self):
+        if self._samples is None or self._pid != os.getpid():
+            with np.load(os.path.join(self.path, INDEX_FILE_NAME)) as index:
+                self._index = {key: index[key] for key in index.files}
+            self._file_indices = {
+                str(file_path): i
+                for i, file_path in enumerate(self._index["file_paths"])
+            }
+            if self._index["lengths"].sum() == 0:
+                # An empty file can't be memory-mapped
+                self._samples = np.zeros(0, dtype=str(self._index["dtype"]))
+            else:
+                self._samples = np.memmap(
+                    os.path.join(self.path, SAMPLES_FILE_NAME),
+                    dtype=str(self._index["dtype"]),
+                    mode="r",
+                )
+            self._pid = os.getpid()
+
+    @property
+    def sample_rate(self) -> int:
+        self._load()
+        return int(self._index["sample_rate"])
+
+    @property
+    def dtype(self) -> str:
+        self._load()
+        return str(self._index["dtype"])
+
+    @property
+    def file_paths(self) -> List[str]:
+        self._load()
+        return list(self._file_indices)
+
+    def __len__(self):
+        self._load()
+        return len(self._index["lengths"])
+
+    def __contains__(self, file_path):
+        self._load()
+        return str(file_path) in self._file_indices
+
+    def get_num_frames(self, file_path) -> int:
+        """Return the length of the sound of the given file, at the sample rate of the bank"""
+        self._load()
+        return int(self._index["lengths"][self._file_indices[str(file_path)]])
+
+    def get_samples(
+        self, file_path, start_index: int = 0, end_index: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Return the samples [start_index, end_index) of the sound of the given file as a 1D
+        float32 array. If the bank stores float32, this is a read-only view of the memory
+        map, i.e. nothing gets copied. Otherwise only the window gets converted.
+        """
+        self._load()
+        i = self._file_indices[str(file_path)]
+        offset = int(self._index["offsets"][i])
+        length = int(self._index["lengths"][i])
+        end_index = length if end_index is None else min(end_index, length)
+        start_index = min(start_index, end_index)
+        samples = self._samples[offset + start_index : offset + end_index]
+        return expand_samples(samples.view(np.ndarray))
+
+    def __getstate__(self):
+        # The memory map is recreated in the unpickled object
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_state()
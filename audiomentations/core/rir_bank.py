@@ -0,0 +1,252 @@
+import json
+import math
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from audiomentations.core.utils import replace_directory
+
+RIRS_FILE_NAME = "rirs.npy"
+INDEX_FILE_NAME = "index.npz"
+
+
+class RIRBank:
+    """
+    A bank of precomputed room impulse responses (RIRs) with the parameters they were
+    generated with. Drawing a RIR from the bank is much faster than simulating a room.
+
+    On disk, a bank is a folder with two files:
+
+    * rirs.npy: The RIRs as a float32 array with shape (num_rirs, max_rir_length). Shorter
+        RIRs are zero-padded. The file is memory-mapped, so worker processes share the
+        pages and only the RIRs that are actually used get loaded.
+    * index.npz: One column per parameter (NaN stands for None), the length of each RIR,
+        the sample rate and some user-defined metadata (as JSON).
+
+    Optionally, a background thread keeps replacing a fraction of the RIRs (in memory, the
+    files are not changed) with newly generated ones, to increase the diversity.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        generate_entry: Optional[Callable[[int], Tuple[Dict, np.ndarray]]] = None,
+        refresh_fraction: float = 0.0,
+        refresh_interval: float = 1.0,
+    ):
+        """
+        :param path: The folder of the bank
+        :param generate_entry: A function that takes a random seed and returns the
+            parameters (a dict) and the RIR (a 1D float array) of a new entry. Only needed
+            for refreshing.
+        :param refresh_fraction: The maximum fraction of the entries that get replaced by
+            newly generated ones in the background. 0 disables refreshing.
+        :param refresh_interval: The pause in seconds between two refreshed entries, so the
+            refreshing does not occupy a whole CPU core
+        """
+        assert 0.0 <= refresh_fraction <= 1.0
+        assert refresh_fraction == 0.0 or generate_entry is not None
+        self.path = str(path)
+        self.generate_entry = generate_entry
+        self.refresh_fraction = refresh_fraction
+        self.refresh_interval = refresh_interval
+        self._init_state()
+
+    def _init_state(self):
+        self._rirs = None
+        self._index = None
+        self._lock = threading.Lock()
+        self._refreshed_entries = {}
+        self._refresh_thread = None
+        self._stop_refreshing = threading.Event()
+        self._pid = None
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        return os.path.isfile(os.path.join(path, RIRS_FILE_NAME)) and os.path.isfile(
+            os.path.join(path, INDEX_FILE_NAME)
+        )
+
+    @classmethod
+    def build(
+        cls,
+        path: str,
+        generate_entry: Callable[[int], Tuple[Dict, np.ndarray]],
+        num_rirs: int,
+        sample_rate: int,
+        metadata: Optional[Dict] = None,
+        num_workers: Optional[int] = None,
+        seed: int = 0,
+        **kwargs,
+    ) -> "RIRBank":
+        """
+        Generate a bank with num_rirs entries in parallel, store it in the given folder and
+        return it. The bank is written to a temporary folder first. An existing bank is
+        then renamed aside and deleted after the new one has been moved in (see
+        replace_directory), so readers never see a partially written bank.
+
+        :param path: The folder of the bank
+        :param generate_entry: A picklable function that takes a random seed and returns
+            the parameters (a dict) and the RIR (a 1D float array) of an entry
+        :param num_rirs: The number of entries
+        :param sample_rate: The sample rate of the RIRs
+        :param metadata: JSON-serializable metadata, e.g. the settings of the generator
+        :param num_workers: The number of worker processes. Defaults to the number of CPUs.
+            1 means that the entries are generated in the current process, which is also
+            what happens in daemonic processes (e.g. DataLoader workers), because they
+            can't start child processes.
+        :param seed: The seed of the first entry. Entry i is generated with seed + i.
+        :param kwargs: Passed on to the constructor of the returned bank
+        """
+        assert num_rirs >= 1
+        num_workers = num_workers or os.cpu_count() or 1
+        if multiprocessing.current_process().daemon:
+            num_workers = 1
+        seeds = range(seed, seed + num_rirs)
+        if num_workers == 1:
+            entries = [generate_entry(s) for s in seeds]
+        else:
+            chunksize = max(1, math.ceil(num_rirs / (4 * num_workers)))
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                entries = list(executor.map(generate_entry, seeds, chunksize=chunksize))
+
+        lengths = np.array([len(rir) for _, rir in entries], dtype=np.int64)
+        rirs = np.zeros((num_rirs, int(np.amax(lengths))), dtype=np.float32)
+        for i, (_, rir) in enumerate(entries):
+            rirs[i, : lengths[i]] = rir
+
+        columns = {}
+        for name in entries[0][0]:
+            columns["parameter_" + name] = np.array(
+                [np.nan if params[name] is None else params[name] for params, _ in entries],
+                dtype=np.float64,
+            )
+
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        tmp_path = tempfile.mkdtemp(prefix=".rir_bank_", dir=parent)
+        try:
+            np.save(os.path.join(tmp_path, RIRS_FILE_NAME), rirs)
+            np.savez(
+                os.path.join(tmp_path, INDEX_FILE_NAME),
+                lengths=lengths,
+                sample_rate=np.array(sample_rate),
+                metadata=np.array(json.dumps(metadata or {})),
+                **columns,
+            )
+            replace_directory(tmp_path, path)
+        finally:
+            if os.path.isdir(tmp_path):
+                shutil.rmtree(tmp_path)
+
+        return cls(path, generate_entry=generate_entry, **kwargs)
+
+    def _load(self):
+        if self._rirs is None or self._pid != os.getpid():
+            if self._pid is not None and self._pid != os.getpid():
+                # Forked process: the lock and the refresh thread belong to the parent
+                self._init_state()
+            with np.load(os.path.join(self.path, INDEX_FILE_NAME)) as index:
+                self._index = {key: index[key] for key in index.files}
+            self._rirs = np.load(os.path.join(self.path, RIRS_FILE_NAME), mmap_mode="r")
+            self._pid = os.getpid()
+
+    @property
+    def sample_rate(self) -> int:
+        self._load()
+        return int(self._index["sample_rate"])
+
+    @property
+    def metadata(self) -> Dict:
+        self._load()
+        return json.loads(str(self._index["metadata"]))
+
+    def __len__(self):
+        self._load()
+        return self._rirs.shape[0]
+
+    def get(self, index: int) -> Tuple[Dict, np.ndarray]:
+        """Return the parameters and the RIR of the entry with the given index"""
+        self._load()
+        with self._lock:
+            refreshed_entry = self._refreshed_entries.get(index)
+        if refreshed_entry is not None:
+            return dict(refreshed_entry[0]), refreshed_entry[1]
+
+        parameters = {}
+        for key, column in self._index.items():
+            if key.startswith("parameter_"):
+                value = float(column[index])
+                parameters[key[len("parameter_") :]] = None if math.isnan(value) else value
+        rir = np.array(self._rirs[index, : self._index["lengths"][index]])
+        return parameters, rir
+
+    def sample(self) -> Tuple[int, Dict, np.ndarray]:
+        """Draw a random entry and return its index, its parameters and its RIR"""
+        self._load()
+        if self.refresh_fraction > 0.0 and self._refresh_thread is None:
+            self._start_refreshing()
+        index = random.randrange(len(self))
+        parameters, rir = self.get(index)
+        return index, parameters, rir
+
+    def _start_refreshing(self):
+        with self._lock:
+            if self._refresh_thread is not None:
+                return
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_loop, name="RIRBankRefresh", daemon=True
+            )
+            self._refresh_thread.start()
+
+    def _refresh_loop(self):
+        max_refreshed_entries = max(1, int(self.refresh_fraction * len(self)))
+        rng = random.Random()
+        while not self._stop_refreshing.is_set():
+            index = rng.randrange(len(self))
+            entry = self.generate_entry(rng.randrange(2**31))
+            with self._lock:
+                if (
+                    index not in self._refreshed_entries
+                    and len(self._refreshed_entries) >= max_refreshed_entries
+                ):
+                    # Drop the oldest refreshed entry, so it falls back to the stored one
+                    del self._refreshed_entries[next(iter(self._refreshed_entries))]
+                self._refreshed_entries[index] = (
+                    entry[0],
+                    np.asarray(entry[1], dtype=np.float32),
+                )
+            self._stop_refreshing.wait(self.refresh_interval)
+
+    def stop_refreshing(self):
+        """Stop the background thread that refreshes entries, if it is running"""
+        self._stop_refreshing.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join()
+        self._refresh_thread = None
+        self._stop_refreshing = threading.Event()
+
+    @property
+    def num_refreshed_entries(self) -> int:
+        with self._lock:
+            return len(self._refreshed_entries)
+
+    def __getstate__(self):
+        # The memory maps, the lock and the thread are recreated in the unpickled object
+        return {
+            "path": self.path,
+            "generate_entry": self.generate_entry,
+            "refresh_fraction": self.refresh_fraction,
+            "refresh_interval": self.refresh_interval,
+        }
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_state()
@@ -0,0 +1,158 @@
+import hashlib
+import os
+import tempfile
+from typing import Callable, Hashable, Optional
+
+import numpy as np
+
+ENTRY_SUFFIX = ".npy"
+TMP_PREFIX = ".tmp_"
+
+
+def get_default_directory() -> str:
+    # /dev/shm is a RAM-backed file system on Linux, so the entries live in shared memory
+    root = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(root, "audiomentations_cache")
+
+
+class SharedAudioCache:
+    """
+    A cache of decoded audio that is shared by all processes on a machine, e.g. all
+    DataLoader workers, so each sound is decoded once and held in memory once, instead of
+    once per process. It has the same get/put/get_or_compute interface as LRUCache.
+    AudioCache(shared=True) stores its sounds in it.
+
+    Each entry is a .npy file in a directory (by default in /dev/shm, which is backed by
+    shared memory), that gets memory-mapped by the processes that read it. The file name is
+    a hash of the key. Entries are written to a temporary file first and renamed, so readers
+    never see a partially written entry. When the total size of the entries exceeds the
+    byte budget, the least recently used entries (by modification time, which is updated on
+    every hit) are deleted. An entry that is deleted while other processes have it mapped
+    stays valid for them: the operating system frees the memory when the last mapping is
+    closed, i.e. it counts the references.
+
+    The cache object only holds the directory and the budget, so it can be pickled, and
+    processes that are started with fork or spawn attach to the same entries. The hits,
+    misses and evictions are counted per process.
+    """
+
+    def __init__(self, max_bytes: int, directory: Optional[str] = None):
+        """
+        :param max_bytes: The maximum total size of the entries in bytes
+        :param directory: The directory of the entries. Caches with the same directory share
+            their entries. Defaults to /dev/shm/audiomentations_cache (or a folder in the
+            temporary directory if /dev/shm does not exist).
+        """
+        assert max_bytes >= 0
+        self.max_bytes = max_bytes
+        self.directory = directory or get_default_directory()
+        os.makedirs(self.directory, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _get_entry_path(self, key: Hashable) -> str:
+        file_name = hashlib.sha1(repr(key).encode("utf-8")).hexdigest() + ENTRY_SUFFIX
+        return os.path.join(self.directory, file_name)
+
+    def _list_entries(self):
+        entries = []
+        with os.scandir(self.directory) as directory_entries:
+            for entry in directory_entries:
+                if entry.name.endswith(ENTRY_SUFFIX) and not entry.name.startswith(
+                    TMP_PREFIX
+                ):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def get(self, key: Hashable, default=None):
+        """
+        Return the cached array for the key (read-only and memory-mapped, if it is not
+        empty), or default if there is none
+        """
+        entry_path = self._get_entry_path(key)
+        try:
+            value = np.load(entry_path, mmap_mode="r")
+        except FileNotFoundError:
+            self.misses += 1
+            return default
+        except ValueError:
+            # Empty arrays can't be memory-mapped
+            value = np.load(entry_path)
+        try:
+            # Mark the entry as recently used
+            os.utime(entry_path)
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: np.ndarray):
+        value = np.ascontiguousarray(value)
+        if value.nbytes > self.max_bytes:
+            return
+        file_descriptor, tmp_path = tempfile.mkstemp(
+            prefix=TMP_PREFIX, suffix=ENTRY_SUFFIX, dir=self.directory
+        )
+        try:
+            with os.fdopen(file_descriptor, "wb") as tmp_file:
+                np.save(tmp_file, value)
+            os.replace(tmp_path, self._get_entry_path(key))
+        except OSError:
+            # E.g. the file system is full. The value is just not cached then.
+            return
+        finally:
+            if os.path.isfile(tmp_path):
+                os.remove(tmp_path)
+        self._evict()
+
+    def _evict(self):
+        entries = self._list_entries()
+        current_bytes = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if current_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                # Another process has evicted it already
+                pass
+            except OSError:
+                # E.g. on Windows, a file that is memory-mapped can't be deleted
+                continue
+            current_bytes -= size
+            self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], np.ndarray]):
+        """
+        Return the cached array for the key. If there is none, compute it, cache it and
+        return it. Processes that miss the same key at the same time all compute it.
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Delete all entries, also for the other processes that share the directory"""
+        for _, _, entry_path in self._list_entries():
+            try:
+                os.remove(entry_path)
+            except OSError:
+                pass
+
+    @property
+    def current_bytes(self) -> int:
+        return sum(size for _, size, _ in self._list_entries())
+
+    def __len__(self):
+        return len(self._list_entries())
+
+    def __contains__(self, key: Hashable):
+        return os.path.isfile(self._get_entry_path(key))
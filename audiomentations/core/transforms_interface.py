@@ -46,9 +46,21 @@ class BaseTransform:
 
 
 class BaseWaveformTransform(BaseTransform):
+    # Set to True in transforms that implement apply_vectorized_batch, i.e. transforms that
+    # can process a whole batch in one go instead of one item at a time
+    supports_vectorized_batch = False
+    # Set to True in linear time-invariant IIR filter transforms whose apply() is equivalent
+    # to apply_sos_filter(self.get_sos(sample_rate), samples), and whose parameters don't
+    # depend on the samples. Compose fuses consecutive transforms like that into one filter
+    # cascade.
+    supports_sos_fusion = False
+
     def apply(self, samples, sample_rate):
         raise NotImplementedError
 
+    def apply_vectorized_batch(self, samples, sample_rate):
+        raise NotImplementedError
+
     def is_multichannel(self, samples):
         return is_waveform_multichannel(samples)
 
@@ -61,32 +73,120 @@ class BaseWaveformTransform(BaseTransform):
         if not self.are_parameters_frozen:
             self.randomize_parameters(samples, sample_rate)
         if self.parameters["should_apply"] and len(samples) > 0:
-            if self.is_multichannel(samples):
-                if samples.shape[0] > samples.shape[1]:
-                    warnings.warn(
-                        "Multichannel audio must have channels first, not channels last. In"
-                        " other words, the shape must be (channels, samples), not"
-                        " (samples, channels)"
-                    )
-                if not self.supports_multichannel:
-                    raise MultichannelAudioNotSupportedException(
-                        "{} only supports mono audio, not multichannel audio. In other words, a 1-dimensional input"
-                        " ndarray was expected, but the input had more than 1 dimension.".format(
-                            self.__class__.__name__
-                        )
-                    )
-            elif not self.supports_mono:
-                raise MonoAudioNotSupportedException(
-                    "{} only supports multichannel audio, not mono audio".format(
+            self._check_channel_support(samples)
+            return self.apply(samples, sample_rate)
+        return samples
+
+    def apply_batch(self, samples: np.ndarray, sample_rate: int) -> np.ndarray:
+        """
+        Apply the transform to a batch of sounds. The batch must have the shape
+        (batch_size, num_samples) for mono audio or (batch_size, num_channels, num_samples)
+        for multichannel audio, and all sounds in the batch must have the same length.
+
+        The parameters, including whether the transform should be applied at all, are
+        randomized independently for each item in the batch. If the parameters are frozen,
+        the same (frozen) parameters are used for all items. The parameters of each item
+        are available in `batch_parameters` afterwards.
+
+        Transforms that set `supports_vectorized_batch` process the whole batch at once. The
+        other transforms fall back to processing one item at a time.
+        """
+        if samples.dtype == np.float64:
+            warnings.warn(
+                "Warning: input samples dtype is np.float64. Converting to np.float32"
+            )
+            samples = np.float32(samples)
+        if samples.ndim not in (2, 3):
+            raise ValueError(
+                "A batch must have the shape (batch_size, num_samples) or (batch_size,"
+                " num_channels, num_samples), but the input had the shape {}".format(
+                    samples.shape
+                )
+            )
+        if samples.shape[0] == 0:
+            self.batch_parameters = []
+            return samples
+        if not self.supports_vectorized_batch:
+            processed_items = []
+            batch_parameters = []
+            for item in samples:
+                processed_items.append(self(item, sample_rate))
+                batch_parameters.append(self.parameters.copy())
+            self.batch_parameters = batch_parameters
+            if len({item.shape for item in processed_items}) > 1:
+                raise ValueError(
+                    "{} changed the length of some of the sounds in the batch, so they"
+                    " can't be stacked into a batch again".format(self.__class__.__name__)
+                )
+            return np.stack(processed_items)
+
+        if self.are_parameters_frozen:
+            self.batch_parameters = [self.parameters] * samples.shape[0]
+        else:
+            self.randomize_batch_parameters(samples, sample_rate)
+        if not self.get_batch_should_apply_mask().any() or samples.shape[-1] == 0:
+            return samples
+        self._check_channel_support(samples[0])
+        return self.apply_vectorized_batch(samples, sample_rate)
+
+    def _check_channel_support(self, samples):
+        if self.is_multichannel(samples):
+            if samples.shape[0] > samples.shape[1]:
+                warnings.warn(
+                    "Multichannel audio must have channels first, not channels last. In"
+                    " other words, the shape must be (channels, samples), not"
+                    " (samples, channels)"
+                )
+            if not self.supports_multichannel:
+                raise MultichannelAudioNotSupportedException(
+                    "{} only supports mono audio, not multichannel audio. In other words, a 1-dimensional input"
+                    " ndarray was expected, but the input had more than 1 dimension.".format(
                         self.__class__.__name__
                     )
                 )
-            return self.apply(samples, sample_rate)
-        return samples
+        elif not self.supports_mono:
+            raise MonoAudioNotSupportedException(
+                "{} only supports multichannel audio, not mono audio".format(
+                    self.__class__.__name__
+                )
+            )
 
     def randomize_parameters(self, samples, sample_rate):
         self.parameters["should_apply"] = random.random() < self.p
 
+    def randomize_batch_parameters(self, samples, sample_rate):
+        """
+        Randomize the parameters of each item in the batch and store them as a list of
+        parameter dicts in `batch_parameters`.
+        """
+        batch_parameters = []
+        for item in samples:
+            self.randomize_parameters(item, sample_rate)
+            batch_parameters.append(self.parameters.copy())
+        self.batch_parameters = batch_parameters
+
+    def get_batch_should_apply_mask(self) -> np.ndarray:
+        """Return a boolean array that tells which items in the batch should be transformed"""
+        return np.array(
+            [parameters["should_apply"] for parameters in self.batch_parameters],
+            dtype=bool,
+        )
+
+    def get_batch_parameter(self, name, fill_value, ndim=1, dtype=np.float32):
+        """
+        Gather a parameter from all items in the batch into an array with shape
+        (batch_size, 1, ...) that has `ndim` dimensions, so it broadcasts against the batch.
+        Items that the transform should not be applied to get `fill_value`.
+        """
+        values = np.array(
+            [
+                parameters[name] if parameters["should_apply"] else fill_value
+                for parameters in self.batch_parameters
+            ],
+            dtype=dtype,
+        )
+        return values.reshape((-1,) + (1,) * (ndim - 1))
+
 
 class BaseSpectrogramTransform(BaseTransform):
     def apply(self, magnitude_spectrogram):
@@ -1,8 +1,7 @@
-import imp
 import os
-import io
 import random
-from subprocess import Popen, PIPE
+import shutil
+import uuid
 from pathlib import Path
 from typing import List, Union
 
@@ -174,69 +173,99 @@ def convert_mel_to_frequency(m: Union[float, np.array]) -> Union[float, np.array
 
 def find_time_shift(a, b, max_shift=5000):
     """
-    Find time shift between two signals a and b.
+    Find time shift between two signals a and b, i.e. the number of samples by which a is
+    delayed with respect to b (negative if a is ahead of b). The cross-correlation is
+    computed with FFTs.
     :param a: numpy array. First signal. Must be mono.
     :param b: numpy array. Second signal. Must be mono.
-    :param max_shift: maximum possible shift. This will help to speed up the algorithm
+    :param max_shift: maximum possible shift (in both directions). Only the first
+        2 * max_shift samples of the signals are compared, which speeds up the algorithm.
+        None means no limit.
     """
     start_slice = min(a.shape[-1], b.shape[-1])
     if max_shift:
         start_slice = min(start_slice, 2 * max_shift)
 
-    a = a[:start_slice]
-    b = b[:start_slice]
-    
-    return np.argmax(np.abs(np.convolve(a, b[::-1]))) - a.shape[0]
+    a = np.asarray(a[:start_slice], dtype=np.float64)
+    b = np.asarray(b[:start_slice], dtype=np.float64)
+
+    # Zero-pad to avoid circular wrap-around, and to a power of two for speed
+    fft_size = 1 << int(2 * start_slice - 1).bit_length()
+    correlation = np.fft.irfft(
+        np.fft.rfft(a, fft_size) * np.conj(np.fft.rfft(b, fft_size)), fft_size
+    )
+    # correlation[k] holds the lag k for k >= 0 and the lag k - fft_size for k < 0
+    max_lag = start_slice - 1 if not max_shift else min(start_slice - 1, max_shift)
+    lags = np.concatenate(
+        (np.arange(max_lag + 1), np.arange(-max_lag, 0))
+    )
+    correlation = np.concatenate(
+        (correlation[: max_lag + 1], correlation[fft_size - max_lag :])
+    )
+    return int(lags[np.argmax(np.abs(correlation))])
 
 
 def apply_ffmpeg_commands(samples, sample_rate, commands):
     """
     Apply a list of ffmpeg commands to the given audio samples.
     Everything is done in memory avoiding the need to write to disk.
-    The input samples are assumed to be in the range [-1, 1].
-    Currently only 16 bit PCM WAV files are supported as input, 
-    othervise, the input samples are converted to 16 bit PCM WAV.
-    :param samples: numpy array. Audio samples.
+    The samples are streamed to and from ffmpeg as raw 32-bit float PCM (f32le), so there
+    is no WAV header to parse, no quantization to 16 bits and any number of channels is
+    supported. The ffmpeg commands must not change the sample rate or the channel count.
+    The ffmpeg processes are managed by the shared pool from get_ffmpeg_pool(), which
+    limits the number of concurrent processes and retries after timeouts and crashes.
+    :param samples: numpy array. Audio samples with shape (num_samples,) or
+        (num_channels, num_samples).
     :param sample_rate: int. Sampling rate of the audio samples.
     :param commands: list of strings. List of ffmpeg commands.
         For example to apply simple compressor with threshold 15dB: ["-af", "acompressor=threshold=-15dB"]
     :return: numpy array. Audio samples after applying the ffmpeg commands.
     """
-    import soundfile as sf
-    
-    if len(samples.shape) == 2:
-        samples = samples.T
+    from audiomentations.core.ffmpeg_pool import get_ffmpeg_pool
 
-    cmd = [
-        "ffmpeg", 
-        "-i", 'pipe:0',
-        *commands,
-        "-f", "wav",
-        "-"
-    ]
+    num_channels = 1 if samples.ndim == 1 else samples.shape[0]
+    raw_format = ["-f", "f32le", "-ar", str(sample_rate), "-ac", str(num_channels)]
+    args = [*raw_format, "-i", "pipe:0", *commands, *raw_format, "pipe:1"]
 
-    p = Popen(cmd, stdin=PIPE, stdout=PIPE, stderr=PIPE)
+    # ffmpeg expects interleaved samples, i.e. channels last
+    interleaved = np.ascontiguousarray(samples.T, dtype="<f4")
+    data = get_ffmpeg_pool().run(
+        args, interleaved, expected_output_size=interleaved.nbytes
+    )
 
-    b = io.BytesIO()
-    b.name = "toffmpeg.wav"
-    sf.write(b, samples, samplerate=sample_rate, format='WAV')
-    b.seek(0)
+    # The bytearray returned by the pool is wrapped without copying
+    reconstructed = np.frombuffer(data, dtype="<f4")
+    if samples.dtype != np.float32:
+        reconstructed = reconstructed.astype(samples.dtype)
 
-    data, out = p.communicate(b.read())
+    if samples.ndim == 2:
+        reconstructed = reconstructed.reshape((-1, num_channels)).T
 
-    if b"Error" in out:
-        raise Exception(out)
-
-    reconstructed = np.fromstring(data[data.find(b"data")+8:], np.int16)
-    reconstructed = reconstructed / 32767
-    
-    if samples.dtype == np.float32:
-        reconstructed = reconstructed.astype(np.float32)
+    return reconstructed
 
-    if len(samples.shape) == 2:
-        reconstructed = reconstructed.reshape((reconstructed.shape[0] // 2, 2)).T
 
-    return reconstructed
+def replace_directory(src: str, dst: str):
+    """
+    Move the directory src to dst, replacing the directory at dst if there is one. The old
+    directory is renamed aside first and only deleted after the new one is in place, so
+    dst is never a half-deleted or half-written directory. Between the two renames, dst
+    briefly does not exist. Processes that still have files of the old directory open or
+    memory-mapped can keep reading them.
+    """
+    if not os.path.isdir(dst):
+        os.replace(src, dst)
+        return
+
+    parent, name = os.path.split(os.path.abspath(dst))
+    old_dst = os.path.join(parent, ".{}.old_{}".format(name, uuid.uuid4().hex))
+    os.replace(dst, old_dst)
+    try:
+        os.replace(src, dst)
+    except OSError:
+        os.replace(old_dst, dst)
+        raise
+    # On Windows, files that are memory-mapped can't be deleted
+    shutil.rmtree(old_dst, ignore_errors=True)
 
 
 def random_log(a, b):
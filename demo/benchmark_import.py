@@ -0,0 +1,65 @@
+"""
+Measure how long it takes to import audiomentations and how much memory (max RSS) the
+process uses afterwards. Every scenario runs in a fresh interpreter, so earlier imports
+don't affect the results.
+
+Usage: python -m demo.benchmark_import [--repeats 5]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+import numpy as np
+
+HEAVY_MODULES = ("torch", "torchaudio", "librosa", "numba", "pyroomacoustics")
+
+SCENARIOS = {
+    "import numpy (reference)": "import numpy",
+    "import audiomentations": "import audiomentations",
+    "Gain + filters": "from audiomentations import Compose, Gain, LowPassFilter, HighPassFilter",
+    "universal_speech_enhancement": "from audiomentations.commons import universal_speech_enhancement",
+    "all transforms": "from audiomentations import *",
+}
+
+MEASURE_SCRIPT = """
+import json, resource, sys, time
+t0 = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - t0
+max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    max_rss /= 1024  # bytes on macOS, kilobytes on Linux
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_mb": max_rss / 1024,
+    "heavy_modules": [m for m in {heavy_modules!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure(statement):
+    script = MEASURE_SCRIPT.format(statement=statement, heavy_modules=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, statement in SCENARIOS.items():
+        results = [measure(statement) for _ in range(args.repeats)]
+        seconds = np.median([r["seconds"] for r in results])
+        max_rss_mb = np.median([r["max_rss_mb"] for r in results])
+        print(
+            "{:<32} {:8.3f} s {:8.1f} MB   heavy modules: {}".format(
+                name,
+                seconds,
+                max_rss_mb,
+                ", ".join(results[0]["heavy_modules"]) or "-",
+            )
+        )
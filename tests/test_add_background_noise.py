@@ -5,8 +5,12 @@ import random
 import warnings
 
 import numpy as np
+import soundfile
 
 from audiomentations import AddBackgroundNoise, Compose, Reverse
+from audiomentations.augmentations import add_background_noise
+from audiomentations.core.audio_cache import AudioCache
+from audiomentations.core.audio_loading_utils import load_sound_file
 from demo.demo import DEMO_DIR
 
 
@@ -24,6 +28,64 @@ class TestAddBackgroundNoise:
         assert not np.allclose(samples, samples_out)
         assert samples_out.dtype == np.float32
 
+    def test_long_noise_file_is_loaded_partially(self, tmp_path):
+        sample_rate = 44100
+        samples = np.sin(np.linspace(0, 440 * 2 * np.pi, 4000)).astype(np.float32)
+        # Seeks in WAV files are sample-accurate
+        noise_file_path = str(tmp_path / "hens.wav")
+        noise, _ = load_sound_file(
+            os.path.join(DEMO_DIR, "background_noises", "hens.ogg"), sample_rate
+        )
+        soundfile.write(noise_file_path, noise, sample_rate, subtype="FLOAT")
+        augmenter = AddBackgroundNoise(sounds_path=noise_file_path, p=1.0)
+        augmenter.randomize_parameters(samples, sample_rate)
+        samples_out = augmenter.apply(samples, sample_rate)
+        # Only the part of the noise file that gets mixed in was loaded, so nothing got cached
+        assert len(augmenter.sound_cache) == 0
+
+        cached_augmenter = AddBackgroundNoise(sounds_path=noise_file_path, p=1.0)
+        cached_augmenter.parameters = augmenter.parameters
+        cached_augmenter._load_sound(noise_file_path, sample_rate)
+        assert np.allclose(
+            cached_augmenter.apply(samples, sample_rate), samples_out, atol=1e-5
+        )
+
+    def test_long_vorbis_noise_is_decoded_once_and_cached(self, monkeypatch):
+        # Reading a part of a Vorbis file decodes the file from its start, so the whole
+        # file is decoded once and then served from the cache
+        load_calls = []
+        monkeypatch.setattr(
+            add_background_noise,
+            "load_sound_file",
+            lambda *args, **kwargs: load_calls.append(args),
+        )
+        sample_rate = 44100
+        samples = np.sin(np.linspace(0, 440 * 2 * np.pi, 4000)).astype(np.float32)
+        noise_file_path = os.path.join(DEMO_DIR, "background_noises", "hens.ogg")
+        augmenter = AddBackgroundNoise(sounds_path=noise_file_path, p=1.0)
+        for _ in range(3):
+            augmenter(samples, sample_rate)
+        assert load_calls == []
+        assert len(augmenter.sound_cache) == 1
+        assert augmenter.sound_cache.misses == 1
+
+    def test_long_vorbis_noise_that_does_not_fit_in_the_cache_is_loaded_partially(self):
+        sample_rate = 44100
+        samples = np.sin(np.linspace(0, 440 * 2 * np.pi, 4000)).astype(np.float32)
+        noise_file_path = os.path.join(DEMO_DIR, "background_noises", "hens.ogg")
+        augmenter = AddBackgroundNoise(
+            sounds_path=noise_file_path, cache=AudioCache(max_bytes=100000), p=1.0
+        )
+        augmenter.randomize_parameters(samples, sample_rate)
+        samples_out = augmenter.apply(samples, sample_rate)
+        assert len(augmenter.sound_cache) == 0
+
+        cached_augmenter = AddBackgroundNoise(sounds_path=noise_file_path, p=1.0)
+        cached_augmenter.parameters = augmenter.parameters
+        assert np.allclose(
+            cached_augmenter.apply(samples, sample_rate), samples_out, atol=1e-5
+        )
+
     def test_add_background_noise_when_noise_sound_is_too_short(self):
         sample_rate = 44100
         samples = np.sin(np.linspace(0, 440 * 2 * np.pi, 14 * sample_rate)).astype(
@@ -43,3 +43,70 @@ class TestAirAbsorptionTransform:
         processed_samples = augment(samples, sample_rate=sample_rate)
         assert processed_samples.shape == samples.shape
         assert processed_samples.dtype == np.float32
+
+    @pytest.mark.parametrize(
+        "humidity,expected_key",
+        [(30, "20C_30-50%"), (49, "20C_30-50%"), (50, "20C_50-70%"), (69, "20C_50-70%"),
+         (70, "20C_70-90%"), (90, "20C_70-90%")],
+    )
+    def test_humidity_bands(self, humidity, expected_key):
+        assert AirAbsorption.get_table_key(20, humidity) == expected_key
+
+    def test_higher_humidity_attenuates_less(self):
+        sample_rate = 16000
+        samples = get_chirp_test(sample_rate, 1)
+        outputs = []
+        for humidity in [40, 80]:
+            augment = AirAbsorption(
+                min_temperature=20,
+                max_temperature=20,
+                min_humidity=humidity,
+                max_humidity=humidity,
+                min_distance=50.0,
+                max_distance=50.0,
+                p=1.0,
+            )
+            outputs.append(augment(samples, sample_rate=sample_rate))
+        # At 20 °C, air absorbs the high frequencies less when the humidity is higher
+        assert np.sum(outputs[1] ** 2) > np.sum(outputs[0] ** 2)
+
+    def test_attenuation_response_is_cached(self):
+        sample_rate = 16000
+        samples = get_chirp_test(sample_rate, 1)
+        augment = AirAbsorption(min_distance=20.0, max_distance=20.0, p=1.0)
+        augment.freeze_parameters()
+        augment.randomize_parameters(samples, sample_rate)
+        first = augment(samples, sample_rate=sample_rate)
+        second = augment(samples, sample_rate=sample_rate)
+        assert np.array_equal(first, second)
+        assert augment.response_cache.misses == 1
+        assert augment.response_cache.hits == 1
+
+    def test_multichannel_same_as_mono(self):
+        sample_rate = 16000
+        samples = get_chirp_test(sample_rate, 1)
+        stereo_samples = np.stack([samples, samples[::-1]])
+        for method in ["stft", "fir"]:
+            augment = AirAbsorption(p=1.0, method=method)
+            augment.freeze_parameters()
+            augment.randomize_parameters(samples, sample_rate)
+            processed_stereo = augment(stereo_samples, sample_rate=sample_rate)
+            for channel in range(2):
+                processed_mono = augment(stereo_samples[channel], sample_rate=sample_rate)
+                assert np.allclose(processed_stereo[channel], processed_mono, atol=1e-6)
+
+    @pytest.mark.parametrize("sample_rate", [8000, 16000, 48000])
+    def test_fir_method(self, sample_rate):
+        np.random.seed(2)
+        samples = get_chirp_test(sample_rate, 2)
+        augment = AirAbsorption(p=1.0)
+        augment.freeze_parameters()
+        augment.randomize_parameters(samples, sample_rate)
+        expected = augment(samples, sample_rate=sample_rate)
+
+        augment.method = "fir"
+        processed_samples = augment(samples, sample_rate=sample_rate)
+        assert processed_samples.shape == samples.shape
+        assert processed_samples.dtype == np.float32
+        error = processed_samples[1000:-1000] - expected[1000:-1000]
+        assert np.sqrt(np.mean(error**2)) < 1e-3 * np.sqrt(np.mean(expected**2))
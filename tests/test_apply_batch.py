@@ -0,0 +1,221 @@
+import random
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal
+
+from audiomentations import (
+    AddGaussianNoise,
+    AddGaussianSNR,
+    BandPassFilter,
+    Clip,
+    Compose,
+    Gain,
+    HighShelfFilter,
+    LowPassFilter,
+    LowShelfFilter,
+    OneOf,
+    PeakingFilter,
+    PolarityInversion,
+    Reverse,
+    SomeOf,
+    TimeMask,
+)
+from audiomentations.core import filtering
+
+
+def get_batch(batch_size=8, num_channels=None, num_samples=4000):
+    shape = (batch_size, num_samples)
+    if num_channels is not None:
+        shape = (batch_size, num_channels, num_samples)
+    return np.random.uniform(low=-0.5, high=0.5, size=shape).astype(np.float32)
+
+
+class TestApplyBatch:
+    @pytest.mark.parametrize(
+        "transform",
+        [
+            Gain(p=0.5),
+            PolarityInversion(p=0.5),
+            TimeMask(fade=True, p=0.5),
+            Clip(a_min=-0.2, a_max=0.2, p=0.5),
+            LowPassFilter(p=0.5),
+            BandPassFilter(p=0.5),
+            LowShelfFilter(p=0.5),
+            HighShelfFilter(p=0.5),
+            PeakingFilter(p=0.5),
+        ],
+    )
+    @pytest.mark.parametrize("num_channels", [None, 2])
+    def test_vectorized_batch_matches_single_calls(self, transform, num_channels):
+        assert transform.supports_vectorized_batch
+        samples = get_batch(num_channels=num_channels)
+        sample_rate = 16000
+
+        processed_samples = transform.apply_batch(samples, sample_rate)
+        assert processed_samples.shape == samples.shape
+        assert processed_samples.dtype == np.float32
+        assert len(transform.batch_parameters) == samples.shape[0]
+
+        batch_parameters = transform.batch_parameters
+        transform.freeze_parameters()
+        try:
+            for i, parameters in enumerate(batch_parameters):
+                transform.parameters = parameters
+                expected = transform(samples[i], sample_rate)
+                assert_array_almost_equal(processed_samples[i], expected, decimal=5)
+        finally:
+            transform.unfreeze_parameters()
+
+    def test_gaussian_snr_batch(self):
+        samples = get_batch(batch_size=16, num_samples=20000)
+        transform = AddGaussianSNR(min_snr_in_db=10.0, max_snr_in_db=10.0, p=0.5)
+        processed_samples = transform.apply_batch(samples, 16000)
+
+        for i, parameters in enumerate(transform.batch_parameters):
+            if parameters["should_apply"]:
+                noise_rms = np.sqrt(np.mean((processed_samples[i] - samples[i]) ** 2))
+                assert noise_rms == pytest.approx(parameters["noise_std"], rel=0.05)
+            else:
+                assert np.array_equal(processed_samples[i], samples[i])
+
+    @pytest.mark.parametrize("num_channels", [None, 2])
+    def test_gaussian_noise_batch(self, num_channels):
+        random.seed(42)
+        samples = get_batch(batch_size=16, num_channels=num_channels, num_samples=20000)
+        transform = AddGaussianNoise(p=0.5)
+        processed_samples = transform.apply_batch(samples, 16000)
+        assert processed_samples.shape == samples.shape
+        assert processed_samples.dtype == np.float32
+
+        num_applied = 0
+        for i, parameters in enumerate(transform.batch_parameters):
+            if parameters["should_apply"]:
+                noise_std = np.std(processed_samples[i] - samples[i])
+                expected_noise_std = parameters["amplitude"] * np.amax(samples[i]) / 3
+                assert noise_std == pytest.approx(expected_noise_std, rel=0.05)
+                num_applied += 1
+            else:
+                assert np.array_equal(processed_samples[i], samples[i])
+        assert 0 < num_applied < samples.shape[0]
+
+    def test_filter_items_with_same_design_together(self, monkeypatch):
+        calls = []
+        original_apply_sos_filter = filtering.apply_sos_filter
+
+        def apply_sos_filter(sos, samples, zero_phase=False):
+            calls.append(samples.shape[0])
+            return original_apply_sos_filter(sos, samples, zero_phase)
+
+        monkeypatch.setattr(filtering, "apply_sos_filter", apply_sos_filter)
+        samples = get_batch(batch_size=32, num_channels=2)
+        transform = PeakingFilter(
+            min_center_freq=1000.0,
+            max_center_freq=1000.0,
+            min_gain_db=-6.0,
+            max_gain_db=6.0,
+            min_q=1.0,
+            max_q=1.0,
+            grid_steps_per_octave=1,
+            p=0.75,
+        )
+        processed_samples = transform.apply_batch(samples, 16000)
+
+        applied_parameters = [
+            parameters
+            for parameters in transform.batch_parameters
+            if parameters["should_apply"]
+        ]
+        num_designs = len({parameters["gain_db"] for parameters in applied_parameters})
+        assert len(calls) == num_designs < len(applied_parameters)
+        assert sum(calls) == len(applied_parameters)
+
+        transform.freeze_parameters()
+        for i, parameters in enumerate(transform.batch_parameters):
+            transform.parameters = parameters
+            assert_array_almost_equal(
+                processed_samples[i], transform(samples[i], 16000), decimal=5
+            )
+
+    def test_fallback_for_transform_without_vectorized_batch(self):
+        samples = get_batch()
+        transform = Reverse(p=1.0)
+        assert not transform.supports_vectorized_batch
+        processed_samples = transform.apply_batch(samples, 16000)
+        assert_array_almost_equal(processed_samples, samples[:, ::-1])
+        assert len(transform.batch_parameters) == samples.shape[0]
+
+    def test_frozen_parameters(self):
+        samples = get_batch()
+        transform = Gain(p=1.0)
+        transform.freeze_parameters()
+        transform.randomize_parameters(samples[0], 16000)
+        processed_samples = transform.apply_batch(samples, 16000)
+        assert_array_almost_equal(
+            processed_samples, samples * transform.parameters["amplitude_ratio"]
+        )
+
+    def test_wrong_number_of_dimensions(self):
+        with pytest.raises(ValueError):
+            Gain(p=1.0).apply_batch(np.zeros(100, dtype=np.float32), 16000)
+
+    def test_empty_batch(self):
+        samples = np.zeros((0, 100), dtype=np.float32)
+        processed_samples = Gain(p=1.0).apply_batch(samples, 16000)
+        assert processed_samples.shape == (0, 100)
+
+    def test_float64_input(self):
+        samples = get_batch().astype(np.float64)
+        with pytest.warns(UserWarning):
+            processed_samples = Gain(p=1.0).apply_batch(samples, 16000)
+        assert processed_samples.dtype == np.float32
+
+
+class TestComposeApplyBatch:
+    def test_compose(self):
+        random.seed(42)
+        samples = get_batch(batch_size=32)
+        augment = Compose(
+            [PolarityInversion(p=1.0), Clip(a_min=-0.1, a_max=0.1, p=1.0)], p=0.5
+        )
+        processed_samples = augment.apply_batch(samples, 16000)
+
+        clipped = -np.clip(samples, -0.1, 0.1)
+        num_applied = 0
+        for i in range(samples.shape[0]):
+            if np.array_equal(processed_samples[i], samples[i]):
+                continue
+            assert_array_almost_equal(processed_samples[i], clipped[i])
+            num_applied += 1
+        assert 0 < num_applied < samples.shape[0]
+
+    def test_one_of(self):
+        random.seed(42)
+        samples = get_batch(batch_size=32, num_channels=2)
+        augment = OneOf([PolarityInversion(p=1.0), Reverse(p=1.0)])
+        processed_samples = augment.apply_batch(samples, 16000)
+
+        num_inverted = 0
+        for i in range(samples.shape[0]):
+            if np.array_equal(processed_samples[i], -samples[i]):
+                num_inverted += 1
+            else:
+                assert np.array_equal(processed_samples[i], samples[i][..., ::-1])
+        assert 0 < num_inverted < samples.shape[0]
+
+    def test_some_of(self):
+        random.seed(42)
+        samples = get_batch(batch_size=32)
+        augment = SomeOf(
+            (1, 2),
+            [Gain(min_gain_in_db=-6, max_gain_in_db=-6, p=1.0), PolarityInversion(p=1.0)],
+        )
+        processed_samples = augment.apply_batch(samples, 16000)
+
+        gain = 10 ** (-6 / 20)
+        for i in range(samples.shape[0]):
+            ratio = processed_samples[i, 0] / samples[i, 0]
+            # The transforms are picked with replacement, so a transform may be
+            # applied twice
+            candidates = [gain, -1.0, -gain, gain**2, 1.0]
+            assert min(abs(ratio - c) for c in candidates) < 1e-4
@@ -1,10 +1,19 @@
 import os
 import pickle
+import shutil
 
 import numpy as np
+import pytest
+import soundfile
+from scipy.signal import convolve
 
 from audiomentations import ApplyImpulseResponse
+from audiomentations.core.audio_loading_utils import load_sound_file
 from audiomentations.core.composition import Compose
+from audiomentations.core.convolution import (
+    compute_filter_spectra,
+    convolve_with_spectra,
+)
 from demo.demo import DEMO_DIR
 
 
@@ -85,3 +94,67 @@ class TestImpulseResponse:
         pickled = pickle.dumps(add_ir_transform)
         unpickled = pickle.loads(pickled)
         assert add_ir_transform.ir_files == unpickled.ir_files
+
+    @pytest.mark.parametrize("leave_length_unchanged", [True, False])
+    @pytest.mark.parametrize("shape", [(1024,), (2, 40000)])
+    def test_matches_direct_convolution(self, leave_length_unchanged, shape):
+        samples_in = np.random.normal(0, 1, size=shape).astype(np.float32)
+        sample_rate = 16000
+        add_ir_transform = ApplyImpulseResponse(
+            ir_path=os.path.join(DEMO_DIR, "ir"),
+            p=1.0,
+            leave_length_unchanged=leave_length_unchanged,
+        )
+        samples_out = add_ir_transform(samples=samples_in, sample_rate=sample_rate)
+
+        ir, _ = load_sound_file(add_ir_transform.parameters["ir_file_path"], sample_rate)
+        expected = np.array(
+            [convolve(channel, ir) for channel in samples_in.reshape((-1, shape[-1]))]
+        ).reshape(shape[:-1] + (-1,))
+        if leave_length_unchanged:
+            expected = expected[..., : shape[-1]]
+        expected *= 0.5 / np.amax(np.abs(expected))
+        assert samples_out.shape == expected.shape
+        np.testing.assert_allclose(samples_out, expected, atol=1e-5)
+
+    def test_spectrum_cache(self):
+        samples_in = np.random.normal(0, 1, size=1024).astype(np.float32)
+        add_ir_transform = ApplyImpulseResponse(
+            ir_path=os.path.join(DEMO_DIR, "ir"), p=1.0
+        )
+        for _ in range(3):
+            add_ir_transform(samples=samples_in, sample_rate=16000)
+        assert add_ir_transform.spectrum_cache.misses == 1
+        assert add_ir_transform.spectrum_cache.hits == 2
+
+        add_ir_transform(samples=samples_in, sample_rate=22050)
+        assert len(add_ir_transform.spectrum_cache) == 2
+
+    def test_spectrum_of_changed_file_is_computed_again(self, tmp_path):
+        ir_path = str(tmp_path / "ir.wav")
+        shutil.copy(os.path.join(DEMO_DIR, "ir", "impulse_response_0.wav"), ir_path)
+        samples_in = np.random.normal(0, 1, size=1024).astype(np.float32)
+        add_ir_transform = ApplyImpulseResponse(ir_path=ir_path, p=1.0)
+        add_ir_transform(samples=samples_in, sample_rate=16000)
+
+        ir, sample_rate = load_sound_file(ir_path, sample_rate=None)
+        soundfile.write(ir_path, ir[::-1], sample_rate, subtype="FLOAT")
+        os.utime(ir_path, (1000, 1000))
+        samples_out = add_ir_transform(samples=samples_in, sample_rate=16000)
+        assert add_ir_transform.spectrum_cache.misses == 2
+
+        expected = convolve(samples_in, load_sound_file(ir_path, 16000)[0])[:1024]
+        expected *= 0.5 / np.amax(np.abs(expected))
+        np.testing.assert_allclose(samples_out, expected, atol=1e-4)
+
+    @pytest.mark.parametrize("block_size", [64, 256, 4096])
+    @pytest.mark.parametrize("output_length", [1, 999, 3000, 3999])
+    def test_partitioned_convolution(self, block_size, output_length):
+        samples = np.random.normal(0, 1, size=(2, 3000)).astype(np.float32)
+        ir = np.random.normal(0, 1, size=1000).astype(np.float32)
+        output = convolve_with_spectra(
+            samples, compute_filter_spectra(ir, block_size), block_size, output_length
+        )
+        expected = np.array([convolve(channel, ir) for channel in samples])
+        assert output.shape == (2, output_length)
+        np.testing.assert_allclose(output, expected[:, :output_length], atol=1e-3)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from audiomentations import ApplyMP3Codec
+from audiomentations.core import codecs
+from audiomentations.core.codecs import (
+    align_codec_output,
+    apply_mp3_codec,
+    clear_codec_delay_cache,
+    decode_mp3,
+    encode_mp3,
+    get_mp3_delay,
+)
+from audiomentations.core.utils import find_time_shift
+from .utils import get_test_signal
+
+
+class TestApplyMP3Codec:
+    @pytest.mark.parametrize("num_channels", [None, 1, 2])
+    def test_apply(self, num_channels):
+        samples = get_test_signal(num_channels, amplitude=0.5)
+        transform = ApplyMP3Codec(min_bitrate=64, max_bitrate=128, p=1.0)
+        processed_samples = transform(samples, 16000)
+        assert processed_samples.shape == samples.shape
+        assert processed_samples.dtype == np.float32
+        assert not np.array_equal(processed_samples, samples)
+
+    @pytest.mark.parametrize("sample_rate", [16000, 44100])
+    @pytest.mark.parametrize("bitrate", [8, 64])
+    def test_in_memory_round_trip(self, sample_rate, bitrate):
+        samples = get_test_signal(2, 8000, amplitude=0.5)
+        mp3_data = encode_mp3(samples, sample_rate, bitrate)
+        assert isinstance(mp3_data, bytes)
+        decoded_samples = decode_mp3(mp3_data, sample_rate)
+        assert decoded_samples.dtype == np.float32
+        assert decoded_samples.shape[0] == 2
+        # The encoder adds a delay and pads the end to a full frame
+        assert decoded_samples.shape[-1] >= samples.shape[-1]
+
+    def test_mono_keeps_number_of_dimensions(self):
+        samples = get_test_signal(num_samples=8000, amplitude=0.5)
+        processed_samples = apply_mp3_codec(samples, 16000, 32)
+        assert processed_samples.ndim == 1
+
+    def test_too_many_channels(self):
+        with pytest.raises(ValueError):
+            encode_mp3(get_test_signal(3, 8000, amplitude=0.5), 16000, 64)
+
+    @pytest.mark.parametrize("sample_rate", [16000, 44100])
+    @pytest.mark.parametrize("bitrate", [8, 32, 128])
+    @pytest.mark.parametrize("num_channels", [1, 2])
+    def test_output_is_aligned(self, sample_rate, bitrate, num_channels):
+        samples = get_test_signal(num_channels, 2 * sample_rate, amplitude=0.5)
+        transform = ApplyMP3Codec(p=1.0)
+        transform.parameters = {"should_apply": True, "bitrate": bitrate}
+        transform.freeze_parameters()
+        processed_samples = transform(samples, sample_rate)
+        assert processed_samples.shape == samples.shape
+        for c in range(num_channels):
+            shift = find_time_shift(processed_samples[c], samples[c], max_shift=None)
+            assert shift == 0
+
+    def test_delay_cache(self, monkeypatch):
+        clear_codec_delay_cache()
+        delay = get_mp3_delay(64, 16000)
+        assert delay > 0
+
+        def fail(*args, **kwargs):
+            raise AssertionError("The delay should have been cached")
+
+        monkeypatch.setattr(codecs, "find_time_shift", fail)
+        assert get_mp3_delay(64, 16000) == delay
+
+    def test_align_codec_output(self):
+        decoded_samples = np.arange(10, dtype=np.float32).reshape((1, 10))
+        assert align_codec_output(decoded_samples, 3, 4).tolist() == [[3, 4, 5, 6]]
+        assert align_codec_output(decoded_samples, 8, 4).tolist() == [[8, 9, 0, 0]]
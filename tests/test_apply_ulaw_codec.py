@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from audiomentations import ApplyULawCodec
+from audiomentations.core.g711 import (
+    apply_g711_codec,
+    decode,
+    encode,
+    get_decoding_table,
+    get_encoding_table,
+)
+from .utils import get_test_signal
+
+
+class TestApplyULawCodec:
+    @pytest.mark.parametrize("encoding", ["ULAW", "ALAW"])
+    def test_matches_reference_implementation(self, encoding):
+        audioop = pytest.importorskip("audioop")
+        int16_values = np.arange(-32768, 32768, dtype=np.int16)
+        if encoding == "ULAW":
+            lin2code, code2lin = audioop.lin2ulaw, audioop.ulaw2lin
+        else:
+            lin2code, code2lin = audioop.lin2alaw, audioop.alaw2lin
+
+        expected_codes = np.frombuffer(lin2code(int16_values.tobytes(), 2), np.uint8)
+        assert np.array_equal(get_encoding_table(encoding), expected_codes)
+        assert np.array_equal(encode(int16_values / 32768, encoding), expected_codes)
+
+        expected_values = np.frombuffer(code2lin(bytes(range(256)), 2), np.int16)
+        assert np.array_equal(
+            decode(np.arange(256, dtype=np.uint8), encoding), expected_values / 32768
+        )
+
+    @pytest.mark.parametrize("encoding", ["ULAW", "ALAW"])
+    def test_round_trip(self, encoding):
+        samples = get_test_signal(amplitude=1.0)
+        processed_samples = apply_g711_codec(samples, encoding)
+        assert processed_samples.dtype == np.float32
+        # 8-bit companding keeps a signal-to-quantization-noise ratio of about 38 dB
+        noise = processed_samples - samples
+        snr = 10 * np.log10(np.sum(samples**2) / np.sum(noise**2))
+        assert 30 < snr < 45
+        # Decoded values are code points, so encoding them again is lossless
+        assert np.array_equal(apply_g711_codec(processed_samples, encoding), processed_samples)
+
+    def test_tables_are_read_only(self):
+        assert not get_encoding_table("ULAW").flags.writeable
+        assert not get_decoding_table("ALAW").flags.writeable
+
+    def test_clipping(self):
+        samples = np.array([-2.0, -1.0, 1.0, 2.0], dtype=np.float32)
+        processed_samples = apply_g711_codec(samples, "ULAW")
+        assert processed_samples[0] == processed_samples[1] < -0.95
+        assert processed_samples[3] == processed_samples[2] > 0.95
+
+    @pytest.mark.parametrize("encoding", ["ULAW", "ALAW"])
+    @pytest.mark.parametrize("num_channels", [None, 2])
+    @pytest.mark.parametrize("resample_to_telephony_rate", [False, True])
+    def test_apply(self, encoding, num_channels, resample_to_telephony_rate):
+        samples = get_test_signal(num_channels, amplitude=1.0) * 0.5
+        transform = ApplyULawCodec(
+            encoding=encoding,
+            resample_to_telephony_rate=resample_to_telephony_rate,
+            p=1.0,
+        )
+        processed_samples = transform(samples, 16000)
+        assert processed_samples.shape == samples.shape
+        assert processed_samples.dtype == np.float32
+        assert not np.array_equal(processed_samples, samples)
+
+    def test_invalid_encoding(self):
+        with pytest.raises(AssertionError):
+            ApplyULawCodec(encoding="GSM")
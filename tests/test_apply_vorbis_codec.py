@@ -0,0 +1,55 @@
+import threading
+
+import numpy as np
+import pytest
+
+from audiomentations import ApplyVorbisCodec
+from audiomentations.core.codecs import apply_soundfile_codec
+from .utils import get_test_signal
+
+
+class TestApplyVorbisCodec:
+    @pytest.mark.parametrize("codec", ["vorbis", "opus"])
+    @pytest.mark.parametrize("num_channels", [None, 1, 2, 3])
+    @pytest.mark.parametrize("sample_rate", [16000, 44100])
+    def test_apply(self, codec, num_channels, sample_rate):
+        samples = get_test_signal(
+            num_channels, sample_rate, sample_rate, amplitude=0.5, frequency=440
+        )
+        transform = ApplyVorbisCodec(codec=codec, p=1.0)
+        processed_samples = transform(samples, sample_rate)
+        assert processed_samples.shape == samples.shape
+        assert processed_samples.dtype == np.float32
+        assert not np.array_equal(processed_samples, samples)
+        # A pure tone survives lossy compression fairly well
+        correlation = np.corrcoef(processed_samples.ravel(), samples.ravel())[0, 1]
+        assert correlation > 0.9
+
+    def test_compression_level(self):
+        samples = get_test_signal(amplitude=0.5, frequency=440)
+        transform = ApplyVorbisCodec(min_compression=-1, max_compression=10, p=1.0)
+        transform.freeze_parameters()
+        for compression, expected_level in [(-1, 1.0), (0, 1.0), (5, 0.5), (10, 0.0)]:
+            transform.parameters = {"should_apply": True, "compression": compression}
+            assert transform.get_compression_level() == pytest.approx(expected_level)
+            transform(samples, 16000)
+
+    def test_threads_use_separate_buffers(self):
+        samples = get_test_signal(2, amplitude=0.5, frequency=440)
+        expected = apply_soundfile_codec(samples, 16000, "OGG", "VORBIS", 0.5)
+        results = [None] * 4
+
+        def encode(i):
+            results[i] = apply_soundfile_codec(samples, 16000, "OGG", "VORBIS", 0.5)
+
+        threads = [threading.Thread(target=encode, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for result in results:
+            assert np.array_equal(result, expected)
+
+    def test_opus_requires_native_backend(self):
+        with pytest.raises(AssertionError):
+            ApplyVorbisCodec(codec="opus", backend="torchaudio")
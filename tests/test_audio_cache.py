@@ -0,0 +1,140 @@
+import os
+import pickle
+import random
+import warnings
+
+import numpy as np
+import pytest
+
+from audiomentations import AddBackgroundNoise, AddShortNoises, ApplyImpulseResponse
+from audiomentations.core.audio_cache import AudioCache
+from audiomentations.core.audio_loading_utils import load_sound_file
+from audiomentations.core.utils import find_audio_files_in_paths
+from demo.demo import DEMO_DIR
+
+SHORT_NOISES_PATH = os.path.join(DEMO_DIR, "short_noises")
+
+
+def get_short_noise_file_paths():
+    return [str(p) for p in find_audio_files_in_paths(SHORT_NOISES_PATH)]
+
+
+class TestAudioCache:
+    def test_load(self):
+        cache = AudioCache()
+        file_path = get_short_noise_file_paths()[0]
+        sample_rate = 48000
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            expected_samples, _ = load_sound_file(file_path, sample_rate)
+        assert not cache.contains(file_path, sample_rate)
+        for _ in range(2):
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                samples = cache.load(file_path, sample_rate)
+            assert samples.dtype == np.float32
+            assert np.array_equal(samples, expected_samples)
+        assert cache.contains(file_path, sample_rate)
+        assert cache.stats == {
+            "hits": 1,
+            "misses": 1,
+            "evictions": 0,
+            "num_entries": 1,
+            "current_bytes": expected_samples.nbytes,
+            "max_bytes": 256 * 1024**2,
+        }
+
+    def test_byte_budget(self):
+        file_paths = get_short_noise_file_paths()
+        sizes = [load_sound_file(p, sample_rate=None)[0].nbytes for p in file_paths]
+        cache = AudioCache(max_bytes=sizes[0] + sizes[1])
+        for file_path in file_paths[:3]:
+            cache.load(file_path, 48000)
+        assert cache.current_bytes <= cache.max_bytes
+        assert cache.evictions >= 1
+        assert not cache.contains(file_paths[0], 48000)
+        assert cache.contains(file_paths[2], 48000)
+
+        cache = AudioCache(max_bytes=min(sizes) - 1)
+        cache.load(file_paths[0], 48000)
+        assert len(cache) == 0
+
+    @pytest.mark.parametrize("dtype,atol", [("float16", 1e-3), ("int16", 1e-4)])
+    def test_dtype_compaction(self, dtype, atol):
+        file_path = get_short_noise_file_paths()[0]
+        expected_samples, sample_rate = load_sound_file(file_path, sample_rate=None)
+        cache = AudioCache(dtype=dtype)
+        cache.load(file_path, sample_rate)
+        samples = cache.load(file_path, sample_rate)
+        assert samples.dtype == np.float32
+        assert np.amax(np.abs(samples - expected_samples)) <= atol
+        assert cache.current_bytes == expected_samples.nbytes // 2
+
+    @pytest.mark.parametrize("dtype", ["float32", "int16"])
+    def test_load_part(self, dtype):
+        file_path = get_short_noise_file_paths()[0]
+        cache = AudioCache(dtype=dtype)
+        samples = cache.load(file_path, 16000)
+        part = cache.load(file_path, 16000, start_index=100, end_index=300)
+        assert part.dtype == np.float32
+        assert np.array_equal(part, samples[100:300])
+        part = cache.load(file_path, 16000, start_index=100)
+        assert np.array_equal(part, samples[100:])
+
+    def test_invalid_dtype(self):
+        with pytest.raises(ValueError):
+            AudioCache(dtype="int8")
+
+    @pytest.mark.parametrize("shared", [False, True])
+    def test_warm_and_clear(self, tmp_path, shared):
+        file_paths = get_short_noise_file_paths()
+        cache = AudioCache(shared=shared, directory=str(tmp_path) if shared else None)
+        cache.warm(file_paths, 48000, num_workers=2)
+        assert len(cache) == len(file_paths)
+        assert cache.misses == len(file_paths)
+        for file_path in file_paths:
+            cache.load(file_path, 48000)
+        assert cache.hits == len(file_paths)
+
+        cache.clear()
+        assert len(cache) == 0
+        assert not cache.contains(file_paths[0], 48000)
+
+    def test_picklability(self):
+        cache = AudioCache(max_bytes=1000, dtype="int16", max_entries=3)
+        cache.load(get_short_noise_file_paths()[0], 48000)
+        unpickled_cache = pickle.loads(pickle.dumps(cache))
+        assert unpickled_cache.dtype == "int16"
+        assert unpickled_cache.max_bytes == 1000
+        assert unpickled_cache.storage.max_entries == 3
+        assert len(unpickled_cache) == 0
+
+    def test_cache_shared_by_transforms(self):
+        cache = AudioCache()
+        samples = np.sin(np.linspace(0, 440 * 2 * np.pi, 48000)).astype(np.float32)
+        random.seed(3)
+        expected_samples_out = AddShortNoises(
+            sounds_path=SHORT_NOISES_PATH,
+            min_time_between_sounds=0.1,
+            max_time_between_sounds=0.3,
+            p=1.0,
+        )(samples, 48000)
+        random.seed(3)
+        transform = AddShortNoises(
+            sounds_path=SHORT_NOISES_PATH,
+            min_time_between_sounds=0.1,
+            max_time_between_sounds=0.3,
+            cache=cache,
+            p=1.0,
+        )
+        assert np.array_equal(transform(samples, 48000), expected_samples_out)
+        assert transform.sound_cache is cache
+        num_entries = len(cache)
+        assert num_entries > 0
+
+        for transform in [
+            AddBackgroundNoise(sounds_path=SHORT_NOISES_PATH, cache=cache, p=1.0),
+            ApplyImpulseResponse(ir_path=os.path.join(DEMO_DIR, "ir"), cache=cache, p=1.0),
+        ]:
+            assert transform(samples, 48000).shape == samples.shape
+        assert len(cache) > num_entries
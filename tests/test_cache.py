@@ -0,0 +1,83 @@
+import pickle
+import threading
+
+import numpy as np
+
+from audiomentations.core.cache import LRUCache
+
+
+class TestLRUCache:
+    def test_eviction_by_bytes(self):
+        cache = LRUCache(max_bytes=3000)
+        for key in range(3):
+            cache.put(key, np.zeros(1000, dtype=np.uint8))
+        assert len(cache) == 3
+        assert cache.get(0) is not None  # 0 is now the most recently used entry
+        cache.put(3, np.zeros(1000, dtype=np.uint8))
+        assert 1 not in cache
+        assert 0 in cache and 2 in cache and 3 in cache
+        assert cache.current_bytes == 3000
+
+    def test_too_large_value_is_not_cached(self):
+        cache = LRUCache(max_bytes=100)
+        cache.put("a", np.zeros(101, dtype=np.uint8))
+        assert len(cache) == 0
+        assert cache.current_bytes == 0
+
+    def test_tuple_values(self):
+        cache = LRUCache(max_bytes=1000)
+        cache.put("a", (np.zeros(10, dtype=np.float32), np.zeros(5, dtype=np.float64), 7))
+        assert cache.current_bytes == 80
+
+    def test_get_or_compute_counts_hits_and_misses(self):
+        cache = LRUCache(max_bytes=1000)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return np.ones(3)
+
+        for _ in range(4):
+            assert np.array_equal(cache.get_or_compute("key", compute), np.ones(3))
+        assert len(calls) == 1
+        assert cache.misses == 1
+        assert cache.hits == 3
+
+    def test_threads(self):
+        cache = LRUCache(max_bytes=50 * 8)
+
+        def work(offset):
+            for i in range(200):
+                cache.put((offset + i) % 100, np.zeros(8, dtype=np.uint8))
+                cache.get(i % 100)
+
+        threads = [threading.Thread(target=work, args=(i * 10,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert cache.current_bytes == 8 * len(cache) <= 50 * 8
+
+    def test_eviction_by_number_of_entries(self):
+        cache = LRUCache(max_bytes=1000, max_entries=2)
+        cache.put("a", np.zeros(1))
+        cache.put("b", np.zeros(1))
+        cache.get("a")
+        cache.put("c", np.zeros(1))
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert len(cache) == 2
+        assert cache.evictions == 1
+
+        cache = LRUCache(max_bytes=1000, max_entries=0)
+        cache.put("a", np.zeros(1))
+        assert len(cache) == 0
+
+    def test_pickle_drops_entries(self):
+        cache = LRUCache(max_bytes=1000, max_entries=5)
+        cache.put("a", np.zeros(10))
+        unpickled = pickle.loads(pickle.dumps(cache))
+        assert unpickled.max_bytes == 1000
+        assert unpickled.max_entries == 5
+        assert len(unpickled) == 0
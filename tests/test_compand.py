@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from audiomentations import NoiseGate, SimpleExpansor
+from audiomentations.core.dynamics import compand
+from .utils import get_test_signal
+
+
+class TestCompand:
+    @pytest.mark.parametrize("num_channels", [None, 2])
+    def test_gate_silences_quiet_parts(self, num_channels):
+        samples = get_test_signal(
+            num_channels,
+            frequency=220,
+            quiet_amplitude=0.002,
+            noise_std=0.0005,
+        )
+        processed_samples = compand(
+            samples,
+            16000,
+            points=[(-900, -900), (-40, -900), (-39.9, -39.9)],
+            attack=0.01,
+            decay=0.01,
+        )
+        assert processed_samples.shape == samples.shape
+        assert processed_samples.dtype == np.float32
+        quiet_part = slice(3000, 3900)
+        assert np.amax(np.abs(processed_samples[..., quiet_part])) < 1e-4
+        loud_part = slice(500, 1500)
+        assert np.allclose(
+            processed_samples[..., loud_part], samples[..., loud_part], atol=0.01
+        )
+
+    def test_unsorted_points(self):
+        with pytest.raises(ValueError):
+            compand(np.zeros(100, dtype=np.float32), 16000, points=[(0, 0), (-10, -10)])
+
+    @pytest.mark.parametrize("num_channels", [None, 2])
+    def test_transforms(self, num_channels):
+        samples = get_test_signal(
+            num_channels,
+            frequency=220,
+            quiet_amplitude=0.002,
+            noise_std=0.0005,
+        )
+        for transform in [NoiseGate(p=1.0), SimpleExpansor(p=1.0)]:
+            processed_samples = transform(samples, 16000)
+            assert processed_samples.shape == samples.shape
+            assert processed_samples.dtype == np.float32
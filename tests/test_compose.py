@@ -1,6 +1,8 @@
 import os
+import random
 
 import numpy as np
+import pytest
 from numpy.testing import assert_array_equal
 
 from audiomentations import (
@@ -9,6 +11,12 @@ from audiomentations import (
     TimeMask,
     Shift,
     Compose,
+    Gain,
+    HighPassFilter,
+    HighShelfFilter,
+    LowPassFilter,
+    LowShelfFilter,
+    PeakingFilter,
 )
 from demo.demo import DEMO_DIR
 
@@ -72,3 +80,79 @@ class TestCompose:
         for transform_parameters, transform in zip(parameters, augmenter.transforms):
             assert transform_parameters == transform.parameters
             assert not transform.are_parameters_frozen
+
+    @staticmethod
+    def create_filter_chain(fuse_filters):
+        return Compose(
+            [
+                LowShelfFilter(p=0.8),
+                PeakingFilter(p=0.8),
+                HighPassFilter(min_cutoff_freq=20.0, max_cutoff_freq=200.0, p=0.8),
+                Gain(p=0.5),
+                HighShelfFilter(p=0.8),
+                LowPassFilter(p=0.8),
+                LowPassFilter(zero_phase=True, p=0.8),
+            ],
+            fuse_filters=fuse_filters,
+        )
+
+    def test_group_transforms(self):
+        augmenter = self.create_filter_chain(fuse_filters=True)
+        groups = augmenter.group_transforms(augmenter.transforms)
+        assert [len(group) for group in groups] == [3, 1, 2, 1]
+
+        augmenter = self.create_filter_chain(fuse_filters=False)
+        groups = augmenter.group_transforms(augmenter.transforms)
+        assert [len(group) for group in groups] == [1] * 7
+
+    @pytest.mark.parametrize("shape", [(8000,), (2, 8000)])
+    def test_fused_filters_same_as_sequential(self, shape):
+        samples = np.random.normal(0.0, 0.3, size=shape).astype(np.float32)
+        fused_augmenter = self.create_filter_chain(fuse_filters=True)
+        sequential_augmenter = self.create_filter_chain(fuse_filters=False)
+        for seed in range(10):
+            random.seed(seed)
+            np.random.seed(seed)
+            fused_samples = fused_augmenter(samples, 16000)
+            random.seed(seed)
+            np.random.seed(seed)
+            sequential_samples = sequential_augmenter(samples, 16000)
+
+            for fused_transform, sequential_transform in zip(
+                fused_augmenter.transforms, sequential_augmenter.transforms
+            ):
+                assert fused_transform.parameters == sequential_transform.parameters
+            assert fused_samples.dtype == np.float32
+            assert fused_samples.shape == shape
+            assert np.allclose(fused_samples, sequential_samples, atol=1e-4)
+
+    @pytest.mark.parametrize("shape", [(5, 8000), (5, 2, 8000)])
+    def test_fused_filters_batch_same_as_sequential(self, shape):
+        samples = np.random.normal(0.0, 0.3, size=shape).astype(np.float32)
+        fused_augmenter = self.create_filter_chain(fuse_filters=True)
+        sequential_augmenter = self.create_filter_chain(fuse_filters=False)
+        for seed in range(5):
+            random.seed(seed)
+            np.random.seed(seed)
+            fused_samples = fused_augmenter.apply_batch(samples, 16000)
+            random.seed(seed)
+            np.random.seed(seed)
+            sequential_samples = sequential_augmenter.apply_batch(samples, 16000)
+
+            for fused_transform, sequential_transform in zip(
+                fused_augmenter.transforms, sequential_augmenter.transforms
+            ):
+                assert (
+                    fused_transform.batch_parameters
+                    == sequential_transform.batch_parameters
+                )
+            assert fused_samples.dtype == np.float32
+            assert fused_samples.shape == shape
+            assert np.allclose(fused_samples, sequential_samples, atol=1e-4)
+
+    def test_fused_filters_with_frozen_parameters(self):
+        samples = np.random.normal(0.0, 0.3, size=(8000,)).astype(np.float32)
+        augmenter = self.create_filter_chain(fuse_filters=True)
+        augmenter.freeze_parameters()
+        augmenter.randomize_parameters(samples=samples, sample_rate=16000)
+        assert_array_equal(augmenter(samples, 16000), augmenter(samples, 16000))
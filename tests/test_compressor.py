@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from audiomentations import Compressor, SimpleCompressor
+from audiomentations.core.dynamics import compress
+from .utils import get_test_signal
+
+
+class TestCompressor:
+    @pytest.mark.parametrize("num_channels", [None, 2])
+    def test_compress_reduces_loud_parts(self, num_channels):
+        samples = get_test_signal(
+            num_channels, amplitude=0.9, frequency=220, quiet_amplitude=0.05
+        )
+        processed_samples = compress(
+            samples, 16000, threshold_db=-20, ratio=10, attack=1, release=50
+        )
+        assert processed_samples.shape == samples.shape
+        assert processed_samples.dtype == np.float32
+        assert np.amax(np.abs(processed_samples)) < 0.5 * np.amax(np.abs(samples))
+
+    def test_empty_input(self):
+        samples = np.zeros((2, 0), dtype=np.float32)
+        assert compress(samples, 16000).shape == (2, 0)
+
+    @pytest.mark.parametrize("num_channels", [None, 2])
+    def test_transforms(self, num_channels):
+        samples = get_test_signal(
+            num_channels, amplitude=0.9, frequency=220, quiet_amplitude=0.05
+        )
+        for transform in [Compressor(p=1.0), SimpleCompressor(p=1.0)]:
+            processed_samples = transform(samples, 16000)
+            assert processed_samples.shape == samples.shape
+            assert processed_samples.dtype == np.float32
@@ -0,0 +1,120 @@
+import os
+import pickle
+import shutil
+
+import numpy as np
+import pytest
+
+from audiomentations import AddBackgroundNoise, AddShortNoises, ApplyImpulseResponse
+from audiomentations.core.audio_loading_utils import load_sound_file
+from audiomentations.core.corpus_manifest import CorpusManifest
+from audiomentations.core.utils import (
+    calculate_rms,
+    calculate_rms_without_silence,
+    find_audio_files_in_paths,
+)
+from demo.demo import DEMO_DIR
+
+
+class TestCorpusManifest:
+    @pytest.mark.parametrize("num_workers", [1, 2])
+    def test_build(self, tmp_path, num_workers):
+        sounds_path = os.path.join(DEMO_DIR, "short_noises")
+        manifest_path = tmp_path / "manifest.npz"
+        manifest = CorpusManifest.build(
+            sounds_path, manifest_path, num_workers=num_workers
+        )
+        file_paths = [str(p) for p in find_audio_files_in_paths(sounds_path)]
+        assert manifest.file_paths == file_paths
+        assert len(manifest) == len(file_paths)
+
+        for file_path in file_paths:
+            samples, sample_rate = load_sound_file(file_path, sample_rate=None)
+            entry = manifest.get_entry(file_path)
+            assert entry["num_frames"] == len(samples)
+            assert entry["sample_rate"] == sample_rate
+            assert entry["num_channels"] == 1
+            assert entry["peak"] == pytest.approx(np.amax(np.abs(samples)))
+            assert entry["rms"] == pytest.approx(calculate_rms(samples), rel=1e-5)
+            assert entry["active_rms"] == pytest.approx(
+                calculate_rms_without_silence(samples, sample_rate), rel=1e-5
+            )
+            assert manifest.get_num_frames(file_path, 16000) == len(
+                load_sound_file(file_path, sample_rate=16000)[0]
+            )
+
+        loaded_manifest = CorpusManifest(manifest_path)
+        assert loaded_manifest.file_paths == file_paths
+        assert pickle.loads(pickle.dumps(loaded_manifest)).get_entry(
+            file_paths[0]
+        ) == manifest.get_entry(file_paths[0])
+
+    def test_stale_entries(self, tmp_path):
+        sounds_path = tmp_path / "sounds"
+        sounds_path.mkdir()
+        for file_name in ["friction0.wav", "friction1.wav"]:
+            shutil.copy(
+                os.path.join(DEMO_DIR, "short_noises", file_name),
+                sounds_path / file_name,
+            )
+        manifest_path = tmp_path / "manifest.npz"
+        manifest = CorpusManifest.build(sounds_path, manifest_path, num_workers=1)
+        changed_file_path = str(sounds_path / "friction0.wav")
+        assert manifest.is_up_to_date(changed_file_path)
+
+        # Replace the file with a shorter one
+        shutil.copy(
+            os.path.join(
+                DEMO_DIR,
+                "short_noises",
+                "130921_laptopmic-dell_tap_channel0_chunk200_aug0.wav",
+            ),
+            changed_file_path,
+        )
+        assert not manifest.is_up_to_date(changed_file_path)
+        assert manifest.get_entry(changed_file_path) is None
+        assert manifest.get_num_frames(changed_file_path) is None
+        assert manifest.get_entry(str(sounds_path / "friction1.wav")) is not None
+
+        rebuilt_manifest = CorpusManifest.build(
+            sounds_path, manifest_path, num_workers=1
+        )
+        samples, _ = load_sound_file(changed_file_path, sample_rate=None)
+        assert rebuilt_manifest.get_num_frames(changed_file_path) == len(samples)
+
+    def test_transforms_with_manifest(self, tmp_path):
+        noises_manifest = CorpusManifest.build(
+            os.path.join(DEMO_DIR, "background_noises"),
+            tmp_path / "background_noises.npz",
+            num_workers=1,
+        )
+        short_noises_manifest_path = tmp_path / "short_noises.npz"
+        CorpusManifest.build(
+            os.path.join(DEMO_DIR, "short_noises"),
+            short_noises_manifest_path,
+            num_workers=1,
+        )
+        ir_manifest = CorpusManifest.build(
+            os.path.join(DEMO_DIR, "ir"), tmp_path / "ir.npz", num_workers=1
+        )
+
+        samples = np.sin(np.linspace(0, 440 * 2 * np.pi, 44100)).astype(np.float32)
+        sample_rate = 44100
+        for transform in [
+            AddBackgroundNoise(manifest=noises_manifest, p=1.0),
+            AddShortNoises(
+                manifest=short_noises_manifest_path,
+                min_time_between_sounds=0.1,
+                max_time_between_sounds=0.5,
+                p=1.0,
+            ),
+            ApplyImpulseResponse(manifest=ir_manifest, p=1.0),
+        ]:
+            samples_out = transform(samples, sample_rate)
+            assert samples_out.dtype == np.float32
+            assert samples_out.shape == samples.shape
+            assert not np.allclose(samples, samples_out)
+
+    def test_no_sounds_path_and_no_manifest(self):
+        with pytest.raises(AssertionError):
+            AddBackgroundNoise(p=1.0)
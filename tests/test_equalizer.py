@@ -21,3 +21,16 @@ class TestSevenBandParametricEQ:
 
         with np.testing.assert_raises(AssertionError):
             assert_array_almost_equal(samples_out, samples_in)
+
+    @pytest.mark.parametrize("shape", [(8000,), (2, 8000)])
+    def test_same_as_sequential_bands(self, shape):
+        samples_in = np.random.normal(0.0, 0.5, size=shape).astype(np.float32)
+        augmenter = SevenBandParametricEQ(p=1.0)
+        samples_out = augmenter(samples=samples_in, sample_rate=16000)
+        assert augmenter.get_sos(16000).shape == (7, 6)
+
+        expected_samples_out = augmenter.low_shelf_filter(samples_in, 16000)
+        for peaking_filter in augmenter.peaking_filters:
+            expected_samples_out = peaking_filter(expected_samples_out, 16000)
+        expected_samples_out = augmenter.high_shelf_filter(expected_samples_out, 16000)
+        assert np.allclose(samples_out, expected_samples_out, atol=1e-4)
@@ -0,0 +1,69 @@
+import shutil
+import threading
+
+import numpy as np
+import pytest
+
+from audiomentations.core.ffmpeg_pool import (
+    FFmpegError,
+    FFmpegProcessPool,
+    configure_ffmpeg_pool,
+    get_ffmpeg_pool,
+)
+from audiomentations.core.utils import apply_ffmpeg_commands
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None, reason="ffmpeg is not installed"
+)
+
+
+class TestFFmpegProcessPool:
+    def test_apply_ffmpeg_commands(self):
+        samples = np.random.uniform(-0.5, 0.5, size=(2, 8000)).astype(np.float32)
+        processed_samples = apply_ffmpeg_commands(samples, 16000, ["-af", "volume=0.5"])
+        assert processed_samples.shape == samples.shape
+        assert processed_samples.dtype == np.float32
+        assert np.allclose(processed_samples, samples * 0.5)
+
+    @pytest.mark.parametrize("num_channels", [1, 3, 6])
+    def test_float_precision_and_channel_count(self, num_channels):
+        samples = np.random.uniform(-0.5, 0.5, size=(num_channels, 4000)).astype(
+            np.float32
+        )
+        processed_samples = apply_ffmpeg_commands(samples, 44100, ["-af", "anull"])
+        # Raw float32 goes through unchanged, without quantization to 16 bits
+        assert np.array_equal(processed_samples, samples)
+        assert processed_samples.flags.writeable
+
+    def test_invalid_filter(self):
+        samples = np.zeros(1000, dtype=np.float32)
+        with pytest.raises(FFmpegError):
+            apply_ffmpeg_commands(samples, 16000, ["-af", "nonexistingfilter"])
+
+    def test_timeout(self):
+        pool = FFmpegProcessPool(timeout=0.2, max_retries=1)
+        # -re makes ffmpeg read the input in real time, so this takes ~5 seconds
+        args = ["-re", "-f", "lavfi", "-i", "sine=duration=5", "-f", "null", "-"]
+        with pytest.raises(FFmpegError, match="did not finish"):
+            pool.run(args, b"")
+        assert len(pool._running_processes) == 0
+
+    def test_concurrent_requests(self):
+        pool = configure_ffmpeg_pool(max_workers=2)
+        try:
+            assert get_ffmpeg_pool() is pool
+            samples = np.random.uniform(-0.5, 0.5, size=8000).astype(np.float32)
+            results = [None] * 6
+
+            def worker(i):
+                results[i] = apply_ffmpeg_commands(samples, 16000, ["-af", "volume=2"])
+
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            for result in results:
+                assert np.allclose(result, samples * 2)
+        finally:
+            configure_ffmpeg_pool()
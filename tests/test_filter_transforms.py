@@ -1,3 +1,5 @@
+import threading
+
 import numpy as np
 import pytest
 import scipy
@@ -12,6 +14,7 @@ from audiomentations import (
     LowShelfFilter,
     HighShelfFilter,
 )
+from audiomentations.core.filtering import SOS_DESIGN_CACHE
 
 DEBUG = False
 
@@ -1161,3 +1164,151 @@ class TestBandStopFilterTransform:
                 plt.legend(["1D", "2D"])
                 plt.show()
             assert np.allclose(channel, processed_samples)
+
+
+class TestSOSDesignCache:
+    def test_cached_design_is_same_as_direct_design(self):
+        SOS_DESIGN_CACHE.clear()
+        transform = LowPassFilter(min_rolloff=24, max_rolloff=24, p=1.0)
+        transform.randomize_parameters(np.zeros(100, dtype=np.float32), 16000)
+        hits, misses = SOS_DESIGN_CACHE.hits, SOS_DESIGN_CACHE.misses
+
+        sos = transform.get_sos(16000)
+        expected_sos = scipy.signal.butter(
+            4, transform.parameters["cutoff_freq"], fs=16000, output="sos"
+        )
+        assert np.allclose(sos, expected_sos, rtol=1e-8, atol=1e-12)
+        assert SOS_DESIGN_CACHE.misses == misses + 1
+
+        sos[0, 0] = 123.0  # Modifying the returned array must not affect the cache
+        assert np.allclose(transform.get_sos(16000), expected_sos, rtol=1e-8, atol=1e-12)
+        assert SOS_DESIGN_CACHE.hits == hits + 1
+        assert SOS_DESIGN_CACHE.misses == misses + 1
+
+        # Another sample rate gives another design
+        transform.get_sos(44100)
+        assert SOS_DESIGN_CACHE.misses == misses + 2
+
+    def test_design_keys_include_filter_type(self):
+        SOS_DESIGN_CACHE.clear()
+        parameters = {"center_freq": 1000.0, "gain_db": 6.0, "q_factor": 0.7}
+        peaking_sos = PeakingFilter().get_sos(16000, parameters)
+        low_shelf_sos = LowShelfFilter().get_sos(16000, parameters)
+        high_shelf_sos = HighShelfFilter().get_sos(16000, parameters)
+        assert len(SOS_DESIGN_CACHE) == 3
+        assert not np.allclose(peaking_sos, low_shelf_sos)
+        assert not np.allclose(low_shelf_sos, high_shelf_sos)
+
+    @pytest.mark.parametrize(
+        "transform",
+        [
+            LowPassFilter(grid_steps_per_octave=48, p=1.0),
+            HighPassFilter(grid_steps_per_octave=48, p=1.0),
+            BandPassFilter(grid_steps_per_octave=48, p=1.0),
+            BandStopFilter(grid_steps_per_octave=48, p=1.0),
+        ],
+    )
+    def test_butterworth_grid(self, transform):
+        samples = get_randn_test(16000, 0.1)
+        is_one_sided = hasattr(transform, "min_cutoff_freq")
+        for _ in range(50):
+            transform.randomize_parameters(samples, 16000)
+            if is_one_sided:
+                frequency = transform.parameters["cutoff_freq"]
+                bounds = (transform.min_cutoff_freq, transform.max_cutoff_freq)
+            else:
+                frequency = transform.parameters["center_freq"]
+                bounds = (transform.min_center_freq, transform.max_center_freq)
+            steps = np.log2(frequency) * 48
+            assert abs(steps - round(steps)) < 1e-6 or frequency in bounds
+            assert bounds[0] <= frequency <= bounds[1]
+            transform(samples, 16000)
+
+    def test_biquad_grid_gives_cache_hits(self):
+        SOS_DESIGN_CACHE.clear()
+        transform = PeakingFilter(
+            min_center_freq=1000.0,
+            max_center_freq=1100.0,
+            min_gain_db=-1.0,
+            max_gain_db=1.0,
+            min_q=1.0,
+            max_q=1.05,
+            grid_steps_per_octave=12,
+            p=1.0,
+        )
+        samples = get_randn_test(16000, 0.1)
+        gain_step = 20 * np.log10(2) / 12
+        for _ in range(100):
+            processed_samples = transform(samples, 16000)
+            assert processed_samples.dtype == np.float32
+            gain_steps = transform.parameters["gain_db"] / gain_step
+            assert abs(gain_steps - round(gain_steps)) < 1e-6 or abs(
+                transform.parameters["gain_db"]
+            ) == pytest.approx(1.0)
+            assert 1000.0 <= transform.parameters["center_freq"] <= 1100.0
+        # The grid has 2 center frequencies, 5 gains (including the clipped bounds) and 2
+        # Q factors (1.0 and the clipped upper bound)
+        assert len(SOS_DESIGN_CACHE) <= 2 * 5 * 2
+        assert SOS_DESIGN_CACHE.hits >= 100 - 2 * 5 * 2
+
+    def test_grid_is_disabled_by_default(self):
+        transform = HighShelfFilter(p=1.0)
+        transform.randomize_parameters(get_randn_test(16000, 0.1), 16000)
+        steps = np.log2(transform.parameters["center_freq"]) * 48
+        assert abs(steps - round(steps)) > 1e-9
+
+    def test_concurrent_designs(self):
+        SOS_DESIGN_CACHE.clear()
+        transform = BandPassFilter(p=1.0)
+        parameters_list = []
+        for _ in range(20):
+            transform.randomize_parameters(np.zeros(10, dtype=np.float32), 16000)
+            parameters_list.append(dict(transform.parameters))
+        expected = [transform.get_sos(16000, params) for params in parameters_list]
+
+        errors = []
+
+        def design_all():
+            for params, expected_sos in zip(parameters_list, expected):
+                if not np.array_equal(transform.get_sos(16000, params), expected_sos):
+                    errors.append(params)
+
+        threads = [threading.Thread(target=design_all) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors
+
+
+class TestMultichannelFiltering:
+    @pytest.mark.parametrize(
+        "transform",
+        [
+            LowPassFilter(p=1.0),
+            HighPassFilter(zero_phase=True, min_rolloff=12, max_rolloff=24, p=1.0),
+            BandPassFilter(p=1.0),
+            BandStopFilter(zero_phase=True, min_rolloff=12, max_rolloff=24, p=1.0),
+            PeakingFilter(p=1.0),
+            LowShelfFilter(p=1.0),
+            HighShelfFilter(p=1.0),
+        ],
+    )
+    def test_multichannel_same_as_each_channel(self, transform):
+        samples = np.random.normal(0.0, 0.3, size=(16, 4000)).astype(np.float32)
+        processed_samples = transform(samples, 16000)
+        assert processed_samples.dtype == np.float32
+        assert processed_samples.shape == samples.shape
+
+        transform.freeze_parameters()
+        for i in range(samples.shape[0]):
+            assert np.allclose(
+                processed_samples[i], transform(samples[i], 16000), atol=1e-6
+            )
+
+        # With frozen parameters, the whole batch is filtered in one call
+        batch = np.stack([samples, samples[::-1]])
+        processed_batch = transform.apply_batch(batch, 16000)
+        assert np.allclose(processed_batch[0], processed_samples, atol=1e-6)
+        assert np.allclose(processed_batch[1], processed_samples[::-1], atol=1e-6)
+        transform.unfreeze_parameters()
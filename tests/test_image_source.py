@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+from audiomentations.core.image_source import (
+    compute_image_sources,
+    generate_shoebox_rirs,
+    get_image_source_indices,
+    get_octave_band_responses,
+    inverse_sabine,
+)
+
+
+def create_pyroomacoustics_rir(
+    room_size, source_position, mic_position, absorption, max_order, sample_rate
+):
+    pra = pytest.importorskip("pyroomacoustics")
+    room = pra.Room.from_corners(
+        np.array(
+            [[0, 0], [0, room_size[1]], [room_size[0], room_size[1]], [room_size[0], 0]]
+        ).T,
+        fs=sample_rate,
+        max_order=max_order,
+        materials=pra.Material(absorption),
+        ray_tracing=False,
+        air_absorption=True,
+    )
+    room.extrude(height=room_size[2], materials=pra.Material(absorption))
+    room.add_source(source_position)
+    room.add_microphone_array(pra.MicrophoneArray(np.array([mic_position]).T, sample_rate))
+    room.compute_rir()
+    return room.rir[0][0]
+
+
+class TestImageSource:
+    @pytest.mark.parametrize("max_order", [0, 1, 2, 7])
+    def test_image_source_indices(self, max_order):
+        indices = get_image_source_indices(max_order)
+        k = max_order
+        assert len(indices) == (2 * k + 1) * (2 * k**2 + 2 * k + 3) // 3
+        assert np.amax(np.sum(np.abs(indices), axis=-1)) == max_order
+        assert len(np.unique(indices, axis=0)) == len(indices)
+
+    def test_first_order_image_sources(self):
+        distances, amplitudes = compute_image_sources(
+            room_sizes=[[4.0, 5.0, 3.0]],
+            source_positions=[[1.0, 2.0, 1.5]],
+            mic_positions=[[1.0, 2.0, 2.5]],
+            absorption_coefficients=[0.36],
+            max_order=1,
+        )
+        # The direct path, and the reflections on the ceiling, on the wall at x=0 and on
+        # the floor
+        assert len(distances[0]) == 7
+        assert sorted(distances[0])[:4] == pytest.approx([1.0, 2.0, np.sqrt(5), 4.0])
+        assert np.amax(amplitudes) == pytest.approx(1.0)
+        assert amplitudes[0, np.argmin(np.abs(distances[0] - 2.0))] == pytest.approx(
+            0.8 / 2.0
+        )
+
+    @pytest.mark.parametrize("sample_rate", [8000, 16000, 44100])
+    def test_octave_bands_sum_to_one(self, sample_rate):
+        responses = get_octave_band_responses(2048, sample_rate)
+        assert np.allclose(np.sum(responses, axis=0), 1.0)
+
+    def test_inverse_sabine(self):
+        pra = pytest.importorskip("pyroomacoustics")
+        for rt60, room_size in [(0.3, [4.6, 3.8, 2.7]), (0.8, [5.5, 3.6, 2.4])]:
+            absorption, max_order = inverse_sabine(rt60, room_size)
+            expected_absorption, expected_max_order = pra.inverse_sabine(rt60, room_size)
+            assert absorption == pytest.approx(expected_absorption)
+            assert max_order == expected_max_order
+
+        with pytest.raises(ValueError):
+            inverse_sabine(0.01, [10.0, 10.0, 10.0])
+
+    @pytest.mark.parametrize("sample_rate", [16000, 44100])
+    @pytest.mark.parametrize("max_order", [0, 1, 4])
+    def test_same_as_pyroomacoustics(self, sample_rate, max_order):
+        rng = np.random.default_rng(max_order)
+        num_rooms = 3
+        room_sizes = rng.uniform([3.6, 3.6, 2.4], [5.6, 3.9, 3.0], (num_rooms, 3))
+        source_positions = rng.uniform(0.1, 0.9, (num_rooms, 3)) * room_sizes
+        mic_positions = rng.uniform(0.1, 0.9, (num_rooms, 3)) * room_sizes
+        absorptions = rng.uniform(0.075, 0.4, num_rooms)
+
+        rirs = generate_shoebox_rirs(
+            room_sizes,
+            source_positions,
+            mic_positions,
+            absorptions,
+            max_order,
+            sample_rate,
+        )
+        assert len(rirs) == num_rooms
+        for i in range(num_rooms):
+            expected_rir = create_pyroomacoustics_rir(
+                room_sizes[i],
+                source_positions[i],
+                mic_positions[i],
+                absorptions[i],
+                max_order,
+                sample_rate,
+            )
+            assert rirs[i].dtype == np.float32
+            assert rirs[i].shape == expected_rir.shape
+            assert np.amax(np.abs(rirs[i] - expected_rir)) < 1e-3 * np.amax(
+                np.abs(expected_rir)
+            )
+
+    def test_batch_same_as_single_rooms(self):
+        room_sizes = np.array([[4.0, 5.0, 3.0], [6.0, 4.0, 2.5], [3.0, 3.0, 3.0]])
+        source_positions = np.array([[1.0, 2.0, 1.5], [5.0, 1.0, 1.0], [1.5, 1.5, 1.5]])
+        mic_positions = np.array([[3.0, 4.0, 1.2], [1.0, 3.0, 2.0], [2.0, 2.5, 1.0]])
+        absorptions = np.array([0.1, 0.3, 0.5])
+        rirs = generate_shoebox_rirs(
+            room_sizes, source_positions, mic_positions, absorptions, 6, 16000
+        )
+        for i in range(len(rirs)):
+            rir = generate_shoebox_rirs(
+                room_sizes[i : i + 1],
+                source_positions[i : i + 1],
+                mic_positions[i : i + 1],
+                absorptions[i : i + 1],
+                6,
+                16000,
+            )[0]
+            assert np.allclose(rir, rirs[i], atol=1e-7)
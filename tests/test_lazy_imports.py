@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+import pytest
+
+import audiomentations
+
+
+class TestLazyImports:
+    def test_light_transforms_do_not_import_heavy_dependencies(self):
+        script = (
+            "import sys\n"
+            "from audiomentations import Compose, Gain, LowPassFilter, PeakingFilter\n"
+            "heavy = ('torch', 'torchaudio', 'librosa', 'numba', 'pyroomacoustics')\n"
+            "print(','.join(m for m in heavy if m in sys.modules))\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script], check=True, capture_output=True, text=True
+        ).stdout
+        assert output.strip() == ""
+
+    def test_all_public_names_can_be_imported(self):
+        for name in audiomentations.__all__:
+            assert getattr(audiomentations, name).__name__ == name
+            assert name in dir(audiomentations)
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError):
+            audiomentations.NonExistingTransform
@@ -32,3 +32,23 @@ class TestLimiter:
         samples = np.random.normal(0, 1, size=1024).astype(np.float32)
         transform.randomize_parameters(samples, sample_rate=16000)
         json.dumps(transform.serialize_parameters())
+
+    @pytest.mark.parametrize("shape", [(4000,), (1, 4000), (8, 4000)])
+    def test_native_backend_same_as_cylimiter(self, shape):
+        pytest.importorskip("cylimiter")
+        samples_in = np.random.normal(0, 0.3, size=shape).astype(np.float32)
+        native_augmenter = Limiter(p=1.0, backend="native")
+        native_samples_out = native_augmenter(samples=samples_in, sample_rate=16000)
+        cylimiter_augmenter = Limiter(p=1.0, backend="cylimiter")
+        cylimiter_augmenter.parameters = native_augmenter.parameters
+        cylimiter_augmenter.freeze_parameters()
+        cylimiter_samples_out = cylimiter_augmenter(
+            samples=samples_in, sample_rate=16000
+        )
+        assert native_samples_out.dtype == np.float32
+        assert native_samples_out.shape == shape
+        assert np.allclose(native_samples_out, cylimiter_samples_out, atol=1e-6)
+
+    def test_invalid_backend(self):
+        with pytest.raises(AssertionError):
+            Limiter(backend="sox")
@@ -6,6 +6,7 @@ import warnings
 import numpy as np
 
 from audiomentations.core.audio_loading_utils import (
+    get_num_frames,
     load_sound_file,
 )
 from demo.demo import DEMO_DIR
@@ -193,4 +194,57 @@ class TestLoadSoundFiles:
         max_value = np.amax(samples)
         assert max_value > 0.3
         assert max_value < 1.0
-        
\ No newline at end of file
+        
+    @pytest.mark.parametrize(
+        "file_name",
+        [
+            os.path.join("background_noises", "hens.ogg"),
+            "bus.opus",
+            "stereo_24bit.WAV",
+            "ms_adpcm.wav",
+        ],
+    )
+    @pytest.mark.parametrize("sample_rate", [None, 16000, 44100])
+    @pytest.mark.parametrize("mono", [True, False])
+    def test_load_part_same_as_slicing(self, file_name, sample_rate, mono):
+        file_path = os.path.join(DEMO_DIR, file_name)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            samples, _ = load_sound_file(file_path, sample_rate, mono=mono)
+            num_frames = samples.shape[-1]
+            assert get_num_frames(file_path, sample_rate) == num_frames
+
+            for offset, part_num_frames in [
+                (0, 1000),
+                (num_frames // 3, 5000),
+                (num_frames - 700, 700),
+                (num_frames - 300, None),
+            ]:
+                part, actual_sample_rate = load_sound_file(
+                    file_path,
+                    sample_rate,
+                    mono=mono,
+                    offset=offset,
+                    num_frames=part_num_frames,
+                )
+                expected_part = samples[
+                    ...,
+                    offset : None
+                    if part_num_frames is None
+                    else offset + part_num_frames,
+                ]
+                assert part.dtype == np.float32
+                assert part.shape == expected_part.shape
+                assert np.amax(np.abs(part - expected_part)) < 1e-4
+                if sample_rate is not None:
+                    assert actual_sample_rate == sample_rate
+
+    def test_load_part_with_audioread(self):
+        file_path = os.path.join(DEMO_DIR, "testing.m4a")
+        assert get_num_frames(file_path) is None
+        samples, sample_rate = load_sound_file(file_path, sample_rate=None)
+        part, _ = load_sound_file(
+            file_path, sample_rate=None, offset=sample_rate, num_frames=2000
+        )
+        assert part.shape == (2000,)
+        assert np.amax(np.abs(part - samples[sample_rate : sample_rate + 2000])) < 1e-4
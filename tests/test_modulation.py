@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from audiomentations import Phaser, Tremolo
+from audiomentations.core.modulation import generate_wave_table, tremolo
+from .utils import get_test_signal
+
+
+class TestModulation:
+    @pytest.mark.parametrize("wave_type", ["sinusoidal", "triangular"])
+    def test_wave_table(self, wave_type):
+        table = generate_wave_table(wave_type, 1000, 1.0, 5.0, np.pi / 2)
+        assert table.shape == (1000,)
+        assert np.amin(table) == pytest.approx(1.0, abs=0.01)
+        assert np.amax(table) == pytest.approx(5.0, abs=0.01)
+
+    def test_tremolo_gain_range(self):
+        samples = np.ones(16000, dtype=np.float32)
+        processed_samples = tremolo(samples, 16000, frequency=4.0, depth=0.6)
+        assert processed_samples.dtype == np.float32
+        assert np.amax(processed_samples) == pytest.approx(1.0, abs=1e-6)
+        assert np.amin(processed_samples) == pytest.approx(0.4, abs=1e-6)
+
+    def test_tremolo_minimum_frequency(self):
+        transform = Tremolo(min_f=-1.0, max_f=0.0, p=1.0)
+        transform(get_test_signal(), 16000)
+        assert transform.parameters["f"] == Tremolo.MIN_FREQUENCY
+
+    def test_tremolo_batch(self):
+        samples = np.stack([get_test_signal(2) for _ in range(4)])
+        transform = Tremolo(p=0.5)
+        processed_samples = transform.apply_batch(samples, 16000)
+        transform.freeze_parameters()
+        for i, parameters in enumerate(transform.batch_parameters):
+            transform.parameters = parameters
+            assert np.array_equal(processed_samples[i], transform(samples[i], 16000))
+
+    @pytest.mark.parametrize("num_channels", [None, 2])
+    def test_transforms(self, num_channels):
+        samples = get_test_signal(num_channels)
+        for transform in [Tremolo(p=1.0), Phaser(p=1.0)]:
+            processed_samples = transform(samples, 16000)
+            assert processed_samples.shape == samples.shape
+            assert processed_samples.dtype == np.float32
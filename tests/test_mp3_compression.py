@@ -1,7 +1,11 @@
+import os
+import tempfile
+
 import numpy as np
 import pytest
 
 from audiomentations import Mp3Compression
+from audiomentations.core.utils import find_time_shift
 
 
 class TestMp3Compression:
@@ -58,3 +62,29 @@ class TestMp3Compression:
 
         with pytest.raises(AssertionError):
             _ = Mp3Compression(min_bitrate=64, max_bitrate=8)
+
+    @pytest.mark.parametrize(
+        "backend",
+        ["pydub", "lameenc"],
+    )
+    def test_no_temporary_mp3_files(self, backend: str, monkeypatch, tmp_path):
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+        samples_in = np.random.normal(0, 0.1, size=(2, 8000)).astype(np.float32)
+        augmenter = Mp3Compression(p=1.0, backend=backend)
+        augmenter(samples=samples_in, sample_rate=16000)
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".mp3")]
+
+    @pytest.mark.parametrize(
+        "shape",
+        [(16000,), (1, 12049), (2, 5000)],
+    )
+    def test_lameenc_keeps_length_and_alignment(self, shape: tuple):
+        samples_in = np.random.normal(0, 0.1, size=shape).astype(np.float32)
+        augmenter = Mp3Compression(
+            p=1.0, min_bitrate=64, max_bitrate=64, backend="lameenc"
+        )
+        samples_out = augmenter(samples=samples_in, sample_rate=16000)
+        assert samples_out.shape == samples_in.shape
+        assert find_time_shift(
+            samples_out.reshape(-1), samples_in.reshape(-1), max_shift=None
+        ) == 0
@@ -0,0 +1,80 @@
+import shutil
+from functools import partial
+
+import numpy as np
+import pytest
+
+from audiomentations import (
+    Compressor,
+    NoiseGate,
+    Overdrive,
+    Phaser,
+    SimpleCompressor,
+    SimpleExpansor,
+    Tremolo,
+    TwoPoleAllPassFilter,
+)
+from .utils import get_test_signal
+
+# Loud and quiet parts, so the envelope followers of the dynamics transforms get used
+COMPRESSOR_SIGNAL = dict(amplitude=0.9, frequency=220, quiet_amplitude=0.05)
+COMPAND_SIGNAL = dict(frequency=220, quiet_amplitude=0.002, noise_std=0.0005)
+
+
+class TestNativeBackends:
+    @pytest.mark.parametrize("num_channels", [None, 2])
+    @pytest.mark.parametrize(
+        "transform_class,reference_backend,signal_kwargs,atol",
+        [
+            pytest.param(
+                Compressor, "ffmpeg", COMPRESSOR_SIGNAL, 1e-6, id="Compressor"
+            ),
+            pytest.param(
+                SimpleCompressor,
+                "ffmpeg",
+                COMPRESSOR_SIGNAL,
+                1e-6,
+                id="SimpleCompressor",
+            ),
+            pytest.param(NoiseGate, "ffmpeg", COMPAND_SIGNAL, 1e-6, id="NoiseGate"),
+            pytest.param(
+                SimpleExpansor, "ffmpeg", COMPAND_SIGNAL, 1e-6, id="SimpleExpansor"
+            ),
+            pytest.param(Tremolo, "ffmpeg", {}, 1e-6, id="Tremolo"),
+            pytest.param(Phaser, "ffmpeg", {}, 1e-6, id="Phaser"),
+            # ffmpeg filters float32 input in single precision by default, while the
+            # native all-pass filter computes in double precision. The difference grows
+            # towards very low frequencies, where the poles are near the unit circle.
+            pytest.param(
+                partial(TwoPoleAllPassFilter, min_frequency=100),
+                "ffmpeg",
+                {},
+                1e-4,
+                id="TwoPoleAllPassFilter",
+            ),
+            pytest.param(
+                Overdrive, "torchaudio", dict(amplitude=0.9), 1e-6, id="Overdrive"
+            ),
+        ],
+    )
+    def test_native_backend_matches_reference_backend(
+        self, transform_class, reference_backend, signal_kwargs, atol, num_channels
+    ):
+        if reference_backend == "ffmpeg" and shutil.which("ffmpeg") is None:
+            pytest.skip("ffmpeg is not installed")
+        if reference_backend == "torchaudio":
+            pytest.importorskip("torchaudio")
+
+        samples = get_test_signal(num_channels, **signal_kwargs)
+        for _ in range(5):
+            native = transform_class(backend="native", p=1.0)
+            native_output = native(samples, 16000)
+
+            reference = transform_class(backend=reference_backend, p=1.0)
+            reference.parameters = native.parameters
+            reference.freeze_parameters()
+            reference_output = reference(samples, 16000)
+
+            np.testing.assert_allclose(
+                native_output, reference_output, atol=atol, rtol=1e-5
+            )
@@ -0,0 +1,132 @@
+import os
+import pickle
+import random
+import warnings
+
+import numpy as np
+import pytest
+
+from audiomentations import AddBackgroundNoise, AddShortNoises
+from audiomentations.core.audio_loading_utils import load_sound_file
+from audiomentations.core.noise_bank import NoiseBank
+from audiomentations.core.utils import find_audio_files_in_paths
+from demo.demo import DEMO_DIR
+
+
+class TestNoiseBank:
+    @pytest.mark.parametrize(
+        "dtype,atol", [("float32", 0.0), ("float16", 1e-3), ("int16", 1e-4)]
+    )
+    @pytest.mark.parametrize("num_workers", [1, 2])
+    def test_build(self, tmp_path, dtype, atol, num_workers):
+        sounds_path = os.path.join(DEMO_DIR, "short_noises")
+        bank_path = tmp_path / "bank"
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            bank = NoiseBank.build(
+                sounds_path, bank_path, 16000, dtype=dtype, num_workers=num_workers
+            )
+        assert NoiseBank.exists(bank_path)
+        assert bank.sample_rate == 16000
+        assert bank.dtype == dtype
+
+        file_paths = [str(p) for p in find_audio_files_in_paths(sounds_path)]
+        assert bank.file_paths == file_paths
+        assert len(bank) == len(file_paths)
+        for file_path in file_paths:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                samples, _ = load_sound_file(file_path, 16000)
+            assert bank.get_num_frames(file_path) == len(samples)
+            bank_samples = bank.get_samples(file_path)
+            assert bank_samples.dtype == np.float32
+            assert bank_samples.shape == samples.shape
+            assert np.amax(np.abs(bank_samples - samples)) <= atol
+            assert np.array_equal(
+                bank.get_samples(file_path, 100, 300), bank_samples[100:300]
+            )
+            assert len(bank.get_samples(file_path, 100, len(samples) + 50)) == (
+                len(samples) - 100
+            )
+
+        unpickled_bank = pickle.loads(pickle.dumps(bank))
+        assert np.array_equal(
+            unpickled_bank.get_samples(file_paths[0]), bank.get_samples(file_paths[0])
+        )
+
+    def test_float32_samples_are_not_copied(self, tmp_path):
+        bank = NoiseBank.build(
+            os.path.join(DEMO_DIR, "short_noises", "friction0.wav"),
+            tmp_path / "bank",
+            44100,
+            num_workers=1,
+        )
+        samples = bank.get_samples(bank.file_paths[0], 10, 20)
+        assert not samples.flags.owndata
+        assert not samples.flags.writeable
+
+    def test_rebuild_replaces_bank(self, tmp_path):
+        bank_path = tmp_path / "bank"
+        NoiseBank.build(os.path.join(DEMO_DIR, "short_noises"), bank_path, 16000)
+        sounds_path = os.path.join(DEMO_DIR, "short_noises", "friction0.wav")
+        bank = NoiseBank.build(sounds_path, bank_path, 8000, num_workers=1)
+        assert bank.file_paths == [sounds_path]
+        assert bank.sample_rate == 8000
+        assert os.listdir(tmp_path) == ["bank"]
+
+    def test_invalid_dtype(self, tmp_path):
+        with pytest.raises(ValueError):
+            NoiseBank.build(DEMO_DIR, tmp_path / "bank", 16000, dtype="int8")
+
+    def test_add_background_noise_with_noise_bank(self, tmp_path):
+        sounds_path = os.path.join(DEMO_DIR, "background_noises")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            bank = NoiseBank.build(sounds_path, tmp_path / "bank", 16000, num_workers=1)
+        samples = np.sin(np.linspace(0, 440 * 2 * np.pi, 16000)).astype(np.float32)
+
+        augmenter = AddBackgroundNoise(sounds_path=sounds_path, p=1.0)
+        bank_augmenter = AddBackgroundNoise(noise_bank=tmp_path / "bank", p=1.0)
+        for _ in range(3):
+            random.seed(42)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                samples_out = augmenter(samples, 16000)
+            random.seed(42)
+            bank_samples_out = bank_augmenter(samples, 16000)
+            assert bank_augmenter.parameters == augmenter.parameters
+            assert np.allclose(bank_samples_out, samples_out, atol=1e-6)
+
+        with pytest.raises(ValueError):
+            bank_augmenter(samples, 22050)
+
+        with pytest.raises(AssertionError):
+            AddBackgroundNoise(sounds_path=sounds_path, noise_bank=bank)
+
+    def test_add_short_noises_with_noise_bank(self, tmp_path):
+        sounds_path = os.path.join(DEMO_DIR, "short_noises")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            bank = NoiseBank.build(sounds_path, tmp_path / "bank", 16000, num_workers=1)
+        samples = np.sin(np.linspace(0, 440 * 2 * np.pi, 3 * 16000)).astype(np.float32)
+
+        augmenter = AddShortNoises(
+            sounds_path=sounds_path,
+            min_time_between_sounds=0.1,
+            max_time_between_sounds=0.5,
+            p=1.0,
+        )
+        bank_augmenter = AddShortNoises(
+            noise_bank=bank,
+            min_time_between_sounds=0.1,
+            max_time_between_sounds=0.5,
+            p=1.0,
+        )
+        random.seed(7)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            samples_out = augmenter(samples, 16000)
+        random.seed(7)
+        bank_samples_out = bank_augmenter(samples, 16000)
+        assert bank_augmenter.parameters == augmenter.parameters
+        assert np.allclose(bank_samples_out, samples_out, atol=1e-6)
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from audiomentations import Overdrive
+from audiomentations.core.distortion import overdrive
+from .utils import get_test_signal
+
+
+class TestOverdrive:
+    @pytest.mark.parametrize("num_channels", [None, 1, 3])
+    def test_apply(self, num_channels):
+        samples = get_test_signal(num_channels, amplitude=0.9)
+        processed_samples = Overdrive(p=1.0)(samples, 16000)
+        assert processed_samples.shape == samples.shape
+        assert processed_samples.dtype == np.float32
+        assert np.amax(np.abs(processed_samples)) <= 1.0
+
+    def test_channels_are_independent(self):
+        samples = get_test_signal(2, amplitude=0.9)
+        processed_samples = overdrive(samples, gain=30, colour=40)
+        for c in range(2):
+            assert np.array_equal(
+                processed_samples[c], overdrive(samples[c], gain=30, colour=40)
+            )
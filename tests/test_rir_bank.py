@@ -0,0 +1,101 @@
+import multiprocessing
+import os
+import pickle
+import time
+
+import numpy as np
+import pytest
+
+from audiomentations.core.rir_bank import RIRBank
+
+
+def generate_entry(seed):
+    rng = np.random.default_rng(seed)
+    length = 100 + seed % 7
+    parameters = {"seed": seed, "size_x": rng.uniform(3, 5), "max_order": None}
+    return parameters, rng.standard_normal(length).astype(np.float32)
+
+
+def build_bank(path):
+    RIRBank.build(path, generate_entry, num_rirs=4, sample_rate=16000, num_workers=2)
+
+
+class TestRIRBank:
+    def test_build_and_load(self, tmp_path):
+        path = os.path.join(tmp_path, "bank")
+        assert not RIRBank.exists(path)
+        RIRBank.build(
+            path, generate_entry, num_rirs=10, sample_rate=16000, metadata={"a": 1}, num_workers=2
+        )
+        assert RIRBank.exists(path)
+
+        bank = RIRBank(path)
+        assert len(bank) == 10
+        assert bank.sample_rate == 16000
+        assert bank.metadata == {"a": 1}
+        for i in range(10):
+            parameters, rir = bank.get(i)
+            expected_parameters, expected_rir = generate_entry(i)
+            assert parameters["seed"] == i
+            assert parameters["size_x"] == expected_parameters["size_x"]
+            assert parameters["max_order"] is None
+            assert np.array_equal(rir, expected_rir)
+
+        index, parameters, rir = bank.sample()
+        assert parameters["seed"] == index
+
+    def test_rebuild_replaces_bank(self, tmp_path):
+        path = os.path.join(tmp_path, "bank")
+        RIRBank.build(path, generate_entry, num_rirs=10, sample_rate=16000, num_workers=1)
+        bank = RIRBank.build(
+            path, generate_entry, num_rirs=3, sample_rate=8000, num_workers=1, seed=100
+        )
+        assert len(bank) == 3
+        assert bank.sample_rate == 8000
+        assert bank.get(0)[0]["seed"] == 100
+        assert os.listdir(tmp_path) == ["bank"]
+
+    def test_build_in_daemonic_process(self, tmp_path):
+        # Daemonic processes (e.g. DataLoader workers) can't have children, so the bank is
+        # built serially there
+        if "fork" not in multiprocessing.get_all_start_methods():
+            pytest.skip("fork is not supported")
+        path = os.path.join(tmp_path, "bank")
+        process = multiprocessing.get_context("fork").Process(
+            target=build_bank, args=(path,), daemon=True
+        )
+        process.start()
+        process.join()
+        assert process.exitcode == 0
+        assert len(RIRBank(path)) == 4
+
+    def test_refresh(self, tmp_path):
+        path = os.path.join(tmp_path, "bank")
+        RIRBank.build(path, generate_entry, num_rirs=10, sample_rate=16000, num_workers=1)
+        bank = RIRBank(
+            path, generate_entry=generate_entry, refresh_fraction=0.3, refresh_interval=0.0
+        )
+        bank.sample()
+        deadline = time.time() + 5
+        while bank.num_refreshed_entries < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        bank.stop_refreshing()
+        assert bank.num_refreshed_entries == 3
+
+        num_replaced_entries = 0
+        for i in range(10):
+            parameters, rir = bank.get(i)
+            if parameters["seed"] != i:
+                num_replaced_entries += 1
+                assert np.array_equal(rir, generate_entry(parameters["seed"])[1])
+        assert num_replaced_entries == 3
+
+    def test_pickle(self, tmp_path):
+        path = os.path.join(tmp_path, "bank")
+        bank = RIRBank.build(
+            path, generate_entry, num_rirs=4, sample_rate=16000, num_workers=1
+        )
+        bank.sample()
+        unpickled = pickle.loads(pickle.dumps(bank))
+        assert np.array_equal(unpickled.get(2)[1], bank.get(2)[1])
@@ -1,4 +1,7 @@
+import os
 import random
+import sys
+import time
 
 import numpy as np
 import pytest
@@ -138,3 +141,126 @@ class TestRoomSimulatorTransform:
         assert processed_samples.dtype == samples.dtype
         assert not np.allclose(processed_samples[: len(samples)], samples)
         assert len(processed_samples.shape) == 1
+
+    def test_skip_simulation_when_not_applied(self):
+        augment = RoomSimulator(p=0.0)
+        augment.randomize_parameters(get_sinc_impulse(16000, 1), 16000)
+        assert augment.room is None
+
+    def test_rir_bank(self, tmp_path):
+        random.seed(1)
+        sample_rate = 16000
+        samples = get_sinc_impulse(sample_rate, 1)
+        path = os.path.join(tmp_path, "rir_bank")
+        augment = RoomSimulator(
+            p=1.0,
+            use_ray_tracing=False,
+            max_order=3,
+            leave_length_unchanged=True,
+            rir_bank_path=path,
+            rir_bank_size=6,
+            rir_bank_num_workers=2,
+        )
+        with pytest.raises(FileNotFoundError):
+            augment(samples=samples, sample_rate=sample_rate)
+        augment.build_rir_bank(sample_rate)
+        processed_samples = augment(samples=samples, sample_rate=sample_rate)
+        assert processed_samples.shape == samples.shape
+        assert augment.room is None
+        assert len(augment.rir_bank) == 6
+
+        # The RIR of the bank is the same as the one of a simulated room with the same
+        # parameters
+        index = augment.parameters["rir_bank_index"]
+        parameters, rir = augment.rir_bank.get(index)
+        room = augment.create_room(parameters, sample_rate)
+        room.compute_rir()
+        assert np.allclose(rir, room.rir[0][0], atol=1e-6)
+
+        # A new transform with the same settings uses the stored bank
+        start_time = time.time()
+        augment2 = RoomSimulator(
+            p=1.0,
+            use_ray_tracing=False,
+            max_order=3,
+            rir_bank_path=path,
+        )
+        for _ in range(20):
+            augment2(samples=samples, sample_rate=sample_rate)
+            assert 0 <= augment2.parameters["rir_bank_index"] < 6
+        assert time.time() - start_time < 5
+
+        with pytest.raises(ValueError):
+            augment2(samples=samples, sample_rate=22050)
+
+    @pytest.mark.parametrize("calculation_mode", ["absorption", "rt60"])
+    def test_native_backend(self, calculation_mode):
+        random.seed(2)
+        sample_rate = 16000
+        samples = get_sinc_impulse(sample_rate, 1)
+        augment = RoomSimulator(
+            p=1.0,
+            backend="native",
+            use_ray_tracing=False,
+            max_order=4,
+            calculation_mode=calculation_mode,
+        )
+        processed_samples = augment(samples=samples, sample_rate=sample_rate)
+        assert augment.room is None
+        assert processed_samples.dtype == np.float32
+        assert len(processed_samples) == len(samples) + len(augment.rir) - 1
+
+        # The RIR is the same as the one of the pyroomacoustics room
+        room = augment.create_room(augment.parameters, sample_rate)
+        room.compute_rir()
+        expected_rir = room.rir[0][0]
+        assert augment.rir.shape == expected_rir.shape
+        assert np.amax(np.abs(augment.rir - expected_rir)) < 1e-3 * np.amax(
+            np.abs(expected_rir)
+        )
+
+    def test_native_backend_without_pyroomacoustics(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "pyroomacoustics", None)
+        augment = RoomSimulator(
+            p=1.0,
+            backend="native",
+            use_ray_tracing=False,
+            calculation_mode="rt60",
+        )
+        samples = get_sinc_impulse(16000, 1)
+        processed_samples = augment(samples=samples, sample_rate=16000)
+        assert not np.allclose(processed_samples[: len(samples)], samples)
+
+        with pytest.raises(ImportError):
+            RoomSimulator(p=1.0, use_ray_tracing=False)(samples, sample_rate=16000)
+
+    def test_native_backend_generate_rirs(self):
+        augment = RoomSimulator(backend="native", use_ray_tracing=False, max_order=3)
+        entries = augment.generate_rirs(16000, 5)
+        assert len(entries) == 5
+        for parameters, rir in entries:
+            assert "size_x" in parameters
+            assert rir.dtype == np.float32 and rir.ndim == 1
+
+    def test_native_backend_requires_no_ray_tracing(self):
+        with pytest.raises(AssertionError):
+            RoomSimulator(backend="native")
+
+    @pytest.mark.parametrize("leave_length_unchanged", [True, False])
+    def test_multichannel_same_as_each_channel(self, leave_length_unchanged):
+        random.seed(3)
+        sample_rate = 16000
+        samples = np.random.normal(0.0, 0.1, size=(8, 4000)).astype(np.float32)
+        augment = RoomSimulator(
+            p=1.0,
+            backend="native",
+            use_ray_tracing=False,
+            leave_length_unchanged=leave_length_unchanged,
+        )
+        processed_samples = augment(samples=samples, sample_rate=sample_rate)
+        assert processed_samples.dtype == np.float32
+
+        augment.freeze_parameters()
+        for i in range(samples.shape[0]):
+            processed_channel = augment(samples=samples[i], sample_rate=sample_rate)
+            assert np.allclose(processed_samples[i], processed_channel, atol=1e-6)
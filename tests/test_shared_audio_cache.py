@@ -0,0 +1,114 @@
+import multiprocessing
+import os
+import pickle
+import random
+import shutil
+
+import numpy as np
+import pytest
+
+from audiomentations import AddBackgroundNoise, ApplyImpulseResponse
+from audiomentations.core.audio_cache import AudioCache
+from audiomentations.core.cache import get_sound_file_cache_key
+from audiomentations.core.shared_audio_cache import SharedAudioCache
+from demo.demo import DEMO_DIR
+
+
+def put_in_cache(cache, key):
+    cache.put(key, np.full(100, 0.5, dtype=np.float32))
+
+
+class TestSharedAudioCache:
+    def test_put_and_get(self, tmp_path):
+        cache = SharedAudioCache(max_bytes=10000, directory=str(tmp_path))
+        assert cache.get("a") is None
+        value = np.arange(100, dtype=np.float32)
+        cache.put("a", value)
+        assert "a" in cache
+        assert len(cache) == 1
+        cached_value = cache.get("a")
+        assert np.array_equal(cached_value, value)
+        assert cached_value.dtype == np.float32
+        assert not cached_value.flags.writeable
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+        cache.put("empty", np.zeros(0, dtype=np.float32))
+        assert cache.get("empty").shape == (0,)
+
+    def test_eviction_of_least_recently_used_entries(self, tmp_path):
+        cache = SharedAudioCache(max_bytes=2000, directory=str(tmp_path))
+        cache.put("a", np.zeros(200, dtype=np.float32))
+        cache.put("b", np.zeros(200, dtype=np.float32))
+        os.utime(cache._get_entry_path("a"), (1000, 1000))
+        os.utime(cache._get_entry_path("b"), (2000, 2000))
+        assert cache.get("a") is not None
+        cache.put("c", np.zeros(200, dtype=np.float32))
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.current_bytes <= 2000
+
+        cache.put("too large", np.zeros(1000, dtype=np.float32))
+        assert "too large" not in cache
+
+    def test_evicted_entry_stays_valid_for_readers(self, tmp_path):
+        cache = SharedAudioCache(max_bytes=10000, directory=str(tmp_path))
+        cache.put("a", np.arange(100, dtype=np.float32))
+        value = cache.get("a")
+        cache.clear()
+        assert len(cache) == 0
+        assert np.array_equal(value, np.arange(100, dtype=np.float32))
+
+    @pytest.mark.parametrize("start_method", ["fork", "spawn"])
+    def test_shared_across_processes(self, tmp_path, start_method):
+        if start_method not in multiprocessing.get_all_start_methods():
+            pytest.skip("{} is not supported".format(start_method))
+        cache = SharedAudioCache(max_bytes=10000, directory=str(tmp_path))
+        context = multiprocessing.get_context(start_method)
+        process = context.Process(target=put_in_cache, args=(cache, "a"))
+        process.start()
+        process.join()
+        assert process.exitcode == 0
+        assert np.array_equal(cache.get("a"), np.full(100, 0.5, dtype=np.float32))
+
+        unpickled_cache = pickle.loads(pickle.dumps(cache))
+        assert "a" in unpickled_cache
+
+    def test_changed_file_gets_a_new_key(self, tmp_path):
+        file_path = str(tmp_path / "noise.wav")
+        shutil.copy(os.path.join(DEMO_DIR, "short_noises", "friction0.wav"), file_path)
+        key = get_sound_file_cache_key(file_path, 16000)
+        assert key[:3] == (file_path, 16000, "mono")
+        assert get_sound_file_cache_key(file_path, 16000) == key
+        os.utime(file_path, (1000, 1000))
+        assert get_sound_file_cache_key(file_path, 16000) != key
+        assert get_sound_file_cache_key(file_path, 16000, mono=False)[2] == (
+            "multichannel"
+        )
+
+    def test_transforms_share_the_cache(self, tmp_path):
+        cache = AudioCache(
+            max_bytes=100 * 1024**2, shared=True, directory=str(tmp_path)
+        )
+        # Long enough for the noise file to be loaded as a whole and cached
+        samples = np.sin(np.linspace(0, 440 * 2 * np.pi, 3 * 44100)).astype(np.float32)
+        sounds_path = os.path.join(DEMO_DIR, "background_noises", "hens.ogg")
+        for _ in range(2):
+            transform = AddBackgroundNoise(sounds_path=sounds_path, cache=cache, p=1.0)
+            unpickled_transform = pickle.loads(pickle.dumps(transform))
+            assert unpickled_transform.sound_cache.storage.directory == str(tmp_path)
+            unpickled_transform(samples, 44100)
+        assert len(cache) == 1
+
+        ir_path = os.path.join(DEMO_DIR, "ir")
+        random.seed(1)
+        expected_samples_out = ApplyImpulseResponse(ir_path=ir_path, p=1.0)(
+            samples, 44100
+        )
+        random.seed(1)
+        samples_out = ApplyImpulseResponse(ir_path=ir_path, cache=cache, p=1.0)(
+            samples, 44100
+        )
+        assert np.array_equal(samples_out, expected_samples_out)
+        assert len(cache) == 2
@@ -74,3 +74,11 @@ class TestTimeMask:
         std_in = np.mean(np.abs(samples_in))
         std_out = np.mean(np.abs(samples_out))
         assert std_out < std_in
+
+    def test_apply_time_mask_with_fade_short_silent_part(self):
+        sample_len = 100
+        samples_in = np.random.normal(0, 1, size=sample_len).astype(np.float32)
+        augmenter = TimeMask(min_band_part=0.05, max_band_part=0.05, fade=True, p=1.0)
+        samples_out = augmenter(samples=samples_in, sample_rate=16000)
+        assert samples_out.shape == samples_in.shape
+        assert np.count_nonzero(samples_out == 0.0) == 5
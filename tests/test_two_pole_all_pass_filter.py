@@ -0,0 +1,67 @@
+import shutil
+
+import numpy as np
+import pytest
+
+from audiomentations import TwoPoleAllPassFilter
+from audiomentations.core.utils import apply_ffmpeg_commands
+from .utils import get_test_signal
+
+
+def get_transform(frequency, blend, backend="native"):
+    transform = TwoPoleAllPassFilter(backend=backend, p=1.0)
+    transform.parameters = {
+        "should_apply": True,
+        "frequency": frequency,
+        "blend": blend,
+    }
+    transform.freeze_parameters()
+    return transform
+
+
+class TestTwoPoleAllPassFilter:
+    @pytest.mark.parametrize("num_channels", [None, 2])
+    def test_apply(self, num_channels):
+        samples = get_test_signal(num_channels)
+        processed_samples = TwoPoleAllPassFilter(p=1.0)(samples, 16000)
+        assert processed_samples.shape == samples.shape
+        assert processed_samples.dtype == np.float32
+        assert not np.allclose(processed_samples, samples)
+
+    def test_all_pass_preserves_energy(self):
+        samples = get_test_signal()
+        processed_samples = get_transform(1000, 1.0)(samples, 16000)
+        assert np.sum(processed_samples**2) == pytest.approx(
+            np.sum(samples**2), rel=0.01
+        )
+
+    def test_zero_blend(self):
+        samples = get_test_signal(2)
+        processed_samples = get_transform(1000, 0.0)(samples, 16000)
+        assert np.array_equal(processed_samples, samples)
+
+    # With a single frequency, all items share a design and get filtered together
+    @pytest.mark.parametrize("min_frequency,max_frequency", [(1, 8000), (440, 440)])
+    def test_batch(self, min_frequency, max_frequency):
+        samples = np.stack([get_test_signal(2) for _ in range(4)])
+        transform = TwoPoleAllPassFilter(
+            min_frequency=min_frequency, max_frequency=max_frequency, p=0.5
+        )
+        processed_samples = transform.apply_batch(samples, 16000)
+        transform.freeze_parameters()
+        for i, parameters in enumerate(transform.batch_parameters):
+            transform.parameters = parameters
+            np.testing.assert_allclose(
+                processed_samples[i], transform(samples[i], 16000), atol=1e-6
+            )
+
+    @pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+    @pytest.mark.parametrize("num_channels", [None, 2])
+    @pytest.mark.parametrize("frequency", [1, 50, 440, 3000, 7999])
+    def test_native_backend_matches_ffmpeg_f64(self, frequency, num_channels):
+        samples = get_test_signal(num_channels)
+        processed_samples = get_transform(frequency, 1.0)(samples, 16000)
+        expected = apply_ffmpeg_commands(
+            samples, 16000, ["-af", f"allpass=frequency={frequency}:precision=f64"]
+        )
+        np.testing.assert_allclose(processed_samples, expected, atol=1e-6)
@@ -9,6 +9,7 @@ from audiomentations.core.utils import (
     find_audio_files_in_paths,
     calculate_rms,
     calculate_rms_without_silence,
+    find_time_shift,
 )
 from demo.demo import DEMO_DIR
 
@@ -80,3 +81,10 @@ class TestUtils:
             samples_in[0 : int(0.015 * sample_rate)], sample_rate
         )
         assert rms_short == pytest.approx(0.4)
+
+    @pytest.mark.parametrize("shift", [-300, -1, 0, 1, 37, 1105, 4999])
+    def test_find_time_shift(self, shift):
+        b = np.random.normal(0, 1, size=20000)
+        a = np.roll(b, shift)
+        assert find_time_shift(a, b) == shift
+        assert find_time_shift(a, b, max_shift=None) == shift
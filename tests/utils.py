@@ -1,3 +1,47 @@
+import numpy as np
+
+
+def get_test_signal(
+    num_channels=None,
+    num_samples=16000,
+    sample_rate=16000,
+    amplitude=0.8,
+    frequency=None,
+    quiet_amplitude=None,
+    noise_std=None,
+):
+    """
+    Return a reproducible float32 test signal with shape (num_samples,) or
+    (num_channels, num_samples)
+
+    :param amplitude: By default, the signal is uniform white noise in
+        [-amplitude, amplitude], with independent channels
+    :param frequency: If given, the signal is a sine wave with this frequency and
+        amplitude instead, and channel i is scaled by (i + 1) / num_channels
+    :param quiet_amplitude: If given, the sine wave alternates between amplitude and
+        quiet_amplitude every 125 ms, which exercises envelope followers
+    :param noise_std: If given, Gaussian noise with this standard deviation is added to
+        the sine wave
+    """
+    rng = np.random.default_rng(42)
+    if frequency is None:
+        shape = (num_samples,) if num_channels is None else (num_channels, num_samples)
+        return rng.uniform(-amplitude, amplitude, size=shape).astype(np.float32)
+
+    t = np.arange(num_samples) / sample_rate
+    samples = amplitude * np.sin(2 * np.pi * frequency * t)
+    if quiet_amplitude is not None:
+        quiet_gain = quiet_amplitude / amplitude
+        samples = samples * np.where((t % 0.25) < 0.125, 1.0, quiet_gain)
+    if noise_std is not None:
+        samples = samples + rng.normal(0, noise_std, size=samples.shape)
+    if num_channels is not None:
+        samples = np.stack(
+            [samples * (i + 1) / num_channels for i in range(num_channels)]
+        )
+    return samples.astype(np.float32)
+
+
 def plot_matrix(matrix, output_image_path=None, vmin=None, vmax=None, title=None):
     """
     Plot a 2D matrix with viridis color map